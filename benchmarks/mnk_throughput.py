@@ -0,0 +1,81 @@
+"""
+Search throughput of GameTree on MNKBoards of several sizes.
+
+Each board size gets the same number of late-game positions with the same
+number of blank squares, so the searches are comparable in size and the
+difference in nodes per second comes from the board: its line tables, win
+detection and copy cost.
+
+    $ python -m benchmarks.mnk_throughput [--empty 8] [--positions 5]
+
+The suite in benchmarks/suite.py tracks a sample of these sizes alongside
+the 3 x 3 benchmarks.
+"""
+
+import argparse
+import random
+import time
+
+from tic_tac_toe.mnk_board import MNKBoard
+from tic_tac_toe.game_tree import GameTree
+
+SIZES = ((3, 3, 3), (4, 4, 4), (5, 5, 4), (6, 6, 5), (15, 15, 5))
+
+def late_game_positions(m, n, k, empty, count, rng):
+    """Return count positions on an m x n board with empty blank squares,
+    no winner yet, and a legal number of marks for the player to move.
+
+    The marks follow a pattern with no more than two of the same mark in a
+    row in any direction, so no k >= 3 line is complete; then randomly
+    chosen squares are blanked out.
+    """
+    pattern = [[1 if (col + 2 * row) % 4 < 2 else 2 for col in range(n)]
+               for row in range(m)]
+    squares = [(row, col) for row in range(m) for col in range(n)]
+    positions = []
+    while len(positions) < count:
+        grid = [row[:] for row in pattern]
+        for row, col in rng.sample(squares, empty):
+            grid[row][col] = 0
+        x = sum(row.count(1) for row in grid)
+        o = sum(row.count(2) for row in grid)
+        if x - o in (0, 1): # X moves first, so X has as many marks or one more
+            positions.append(MNKBoard(m, n, k, grid=grid,
+                                      player=1 if x == o else 2))
+    return positions
+
+def measure(positions, search):
+    """Search every position with a fresh GameTree and return (nodes, seconds)
+    totals."""
+    nodes = 0
+    seconds = 0.0
+    for board in positions:
+        tree = GameTree()
+        start = time.perf_counter()
+        tree.optimal_move(board.copy(), search=search)
+        seconds += time.perf_counter() - start
+        nodes += tree.nodes_visited()
+    return nodes, seconds
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure GameTree search throughput per board size.')
+    parser.add_argument('--empty', type=int, default=8,
+                        help='blank squares in each position (default 8)')
+    parser.add_argument('--positions', type=int, default=5,
+                        help='positions per board size (default 5)')
+    parser.add_argument('--search', choices=('minimax', 'alphabeta'),
+                        default='alphabeta')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'board':>10} {'nodes':>9} {'seconds':>9} {'nodes/sec':>11}")
+    for m, n, k in SIZES:
+        positions = late_game_positions(m, n, k, args.empty, args.positions,
+                                        rng)
+        nodes, seconds = measure(positions, args.search)
+        print(f"{f'{m},{n},{k}':>10} {nodes:>9} {seconds:>9.3f} "
+              f"{nodes / seconds:>11.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark suite for the board and search hot paths.
+
+Every benchmark runs over a fixed corpus of positions, with three positions at
+each depth from 0 (blank board) to 8 marks, and reports wall time, nodes per
+second and peak memory. Results can be saved as JSON and compared with an
+earlier run. The exit status is 1 if any benchmark regressed past the
+threshold, so the suite can gate a change:
+
+    $ python -m benchmarks.suite --output before.json
+    $ python -m benchmarks.suite --baseline before.json [--threshold 0.2]
+
+Wall time is the fastest of --repeat runs. Peak memory comes from one extra
+run under tracemalloc, kept apart from the timed runs because tracing slows
+allocation down.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.game_tree import GameTree
+from benchmarks.mnk_throughput import late_game_positions, measure
+
+CORPUS_SEED = 2024 # changing this changes the corpus, so old results no
+                   #   longer compare
+PER_DEPTH = 3
+MNK_SIZES = ((4, 4, 4), (5, 5, 4)) # a sample of mnk_throughput's sizes
+METRICS = ('wall_time', 'peak_memory') # lower is better for both
+MARK_PASSES = 100 # passes over the corpus, so board timings aren't all noise
+
+def corpus(per_depth=PER_DEPTH, seed=CORPUS_SEED):
+    """Return a list of grids, per_depth of them for each number of marks
+    from 0 to 8, from random games that haven't been won yet. Only one blank
+    board exists, so depth 0 repeats it."""
+    rng = random.Random(seed)
+    grids = []
+    for depth in range(9):
+        found = []
+        while len(found) < per_depth:
+            board = TicTacToeBoard()
+            for i in range(depth):
+                moves = [(row, col) for row in range(3) for col in range(3)
+                         if board.board()[row][col] == 0]
+                board.mark(*rng.choice(moves))
+                if board.winner() is not None:
+                    break
+            if board.winner() is None:
+                found.append(board.board())
+        grids.extend(found)
+    return grids
+
+def _board(grid):
+    """Return a TicTacToeBoard for grid, with the player to move worked out
+    from the number of marks."""
+    marks = sum(mark != 0 for row in grid for mark in row)
+    return TicTacToeBoard([row[:] for row in grid],
+                          player=1 if marks % 2 == 0 else 2)
+
+def bench_mark_winner(grids):
+    """Play every corpus position out to the end with TicTacToeBoard.mark()
+    and winner(), filling squares in row-major order, MARK_PASSES times.
+    Nodes are marks."""
+    nodes = 0
+    for i in range(MARK_PASSES):
+        for grid in grids:
+            board = _board(grid)
+            for row in range(3):
+                for col in range(3):
+                    if board.winner() is not None:
+                        break
+                    if board.board()[row][col] == 0:
+                        board.mark(row, col)
+                        nodes += 1
+    return nodes
+
+def bench_build_tree(grids):
+    """Build the full tree below every corpus position. Nodes are tree
+    nodes."""
+    nodes = 0
+    for grid in grids:
+        tree = GameTree()
+        tree._build_tree(tree._add_root(_board(grid)))
+        nodes += len(tree)
+    return nodes
+
+def _built_trees(grids):
+    """Return a fully built tree for every corpus position, for timing
+    _score_subtree() without the build."""
+    trees = []
+    for grid in grids:
+        tree = GameTree()
+        tree._build_tree(tree._add_root(_board(grid)))
+        trees.append(tree)
+    return trees
+
+def bench_score_subtree(trees):
+    """Score every tree from _built_trees(). Nodes are nodes scored."""
+    nodes = 0
+    for tree in trees:
+        tree._score_subtree(tree.root())
+        nodes += tree.nodes_scored()
+    return nodes
+
+def bench_optimal_move(grids, search):
+    """Call optimal_move() on every corpus position with a fresh tree. Nodes
+    are nodes visited."""
+    nodes = 0
+    for grid in grids:
+        tree = GameTree()
+        tree.optimal_move(_board(grid), search=search)
+        nodes += tree.nodes_visited()
+    return nodes
+
+def benchmarks(grids):
+    """Return a dict of benchmark name -> (setup, run), where setup() returns
+    run's argument untimed and run(argument) returns the nodes processed."""
+    mnk = late_game_positions(*MNK_SIZES[0], 8, PER_DEPTH,
+                              random.Random(CORPUS_SEED)) + \
+        late_game_positions(*MNK_SIZES[1], 8, PER_DEPTH,
+                            random.Random(CORPUS_SEED))
+    return {
+        'board.mark_winner': (lambda: grids, bench_mark_winner),
+        'game_tree._build_tree': (lambda: grids, bench_build_tree),
+        'game_tree._score_subtree': (lambda: _built_trees(grids),
+                                     bench_score_subtree),
+        'optimal_move.minimax': (lambda: grids,
+                                 lambda g: bench_optimal_move(g, 'minimax')),
+        'optimal_move.alphabeta': (lambda: grids,
+                                   lambda g: bench_optimal_move(g,
+                                                                'alphabeta')),
+        'mnk.alphabeta': (lambda: mnk,
+                          lambda positions: measure(positions,
+                                                    'alphabeta')[0]),
+    }
+
+def run_one(setup, run, repeat):
+    """Return a result dict for one benchmark: fastest wall time of repeat
+    runs, nodes per run, nodes per second, and peak traced memory."""
+    best = None
+    for i in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        nodes = run(argument)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    argument = setup()
+    tracemalloc.start()
+    try:
+        run(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'wall_time': best,
+        'nodes': nodes,
+        'nodes_per_sec': nodes / best if best > 0 else 0.0,
+        'peak_memory': peak,
+    }
+
+def run_suite(repeat=3, names=None):
+    """Run the benchmarks (all, or just those in names) and return a dict of
+    name -> result dict."""
+    results = {}
+    for name, (setup, run) in benchmarks(corpus()).items():
+        if names is None or name in names:
+            results[name] = run_one(setup, run, repeat)
+    return results
+
+def compare(results, baseline, threshold):
+    """Return a list of messages, one per metric in METRICS that got worse
+    than in baseline by more than threshold (0.2 = 20%). Benchmarks missing
+    from either side are skipped."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric in METRICS:
+            if old[metric] > 0 and \
+                    result[metric] > old[metric] * (1 + threshold):
+                regressions.append(
+                    f'{name} {metric}: {old[metric]:.6g} -> '
+                    f'{result[metric]:.6g} '
+                    f'(+{result[metric] / old[metric] - 1:.0%})')
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the board and search hot paths.')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--baseline',
+                        help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown or memory growth before a '
+                             'result counts as a regression (default 0.2)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per benchmark (default 3)')
+    parser.add_argument('--only', action='append',
+                        help='run just this benchmark (can be repeated)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be positive')
+    results = run_suite(args.repeat, args.only)
+    print(f"{'benchmark':<26} {'seconds':>9} {'nodes':>8} {'nodes/sec':>11} "
+          f"{'peak KiB':>9}")
+    for name, result in results.items():
+        print(f"{name:<26} {result['wall_time']:>9.4f} {result['nodes']:>8} "
+              f"{result['nodes_per_sec']:>11.0f} "
+              f"{result['peak_memory'] / 1024:>9.0f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print(f'REGRESSION {message}')
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
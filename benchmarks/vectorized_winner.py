@@ -0,0 +1,47 @@
+"""
+Winner detection throughput: TicTacToeBoard.winner() one board at a time
+against vectorized.winners() over the same boards at once. Needs NumPy.
+
+    $ python -m benchmarks.vectorized_winner [--boards 100000]
+"""
+
+import argparse
+import random
+import time
+
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.vectorized import np, winners
+
+def random_grids(count, rng):
+    """Return count random grids, each a flat list of 9 marks."""
+    return [[rng.randrange(3) for square in range(9)] for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare per-board and vectorized winner detection.')
+    parser.add_argument('--boards', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if np is None:
+        parser.error('numpy is not installed')
+    grids = random_grids(args.boards, random.Random(args.seed))
+    # Boards are built outside the timed loop, which is just winner() calls
+    #   on fresh boards, so each one counts its lines once.
+    boards = [TicTacToeBoard([grid[0:3], grid[3:6], grid[6:9]])
+              for grid in grids]
+    start = time.perf_counter()
+    loop_results = [board.winner() for board in boards]
+    loop_seconds = time.perf_counter() - start
+    array = np.array(grids, dtype=np.int8)
+    start = time.perf_counter()
+    vector_results = winners(array)
+    vector_seconds = time.perf_counter() - start
+    assert [result or 0 for result in loop_results] == vector_results.tolist()
+    print(f"{'method':>12} {'seconds':>9} {'boards/sec':>12}")
+    for name, seconds in (('winner()', loop_seconds),
+                          ('winners()', vector_seconds)):
+        print(f"{name:>12} {seconds:>9.4f} {args.boards / seconds:>12.0f}")
+    print(f"speedup: {loop_seconds / vector_seconds:.1f}x")
+
+if __name__ == '__main__':
+    main()
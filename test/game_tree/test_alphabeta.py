@@ -0,0 +1,57 @@
+"""Tests for the alpha-beta search mode of GameTree.optimal_move()."""
+
+import unittest
+
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.board import TicTacToeBoard
+
+class TestAlphaBetaMatchesMinimax(unittest.TestCase):
+    """Does alpha-beta return the same move as full-tree minimax while
+    visiting fewer nodes?"""
+
+    def setUp(self):
+        self.grids = [
+            [[1, 2, 1], [0, 2, 2], [0, 1, 0]],
+            [[0, 2, 1], [0, 2, 2], [0, 1, 1]],
+            [[1, 0, 0], [0, 2, 0], [0, 0, 1]],
+            [[1, 2, 0], [0, 1, 0], [0, 0, 0]],
+            [[0, 1, 0], [0, 2, 0], [0, 1, 0]],
+            [[2, 0, 1], [0, 1, 0], [0, 0, 0]],
+        ]
+
+    def test_same_move(self):
+        for grid in self.grids:
+            players = [1, 2]
+            for player in players:
+                minimax_move = GameTree().optimal_move(
+                    TicTacToeBoard([row[:] for row in grid], player))
+                alphabeta_move = GameTree().optimal_move(
+                    TicTacToeBoard([row[:] for row in grid], player),
+                    search='alphabeta')
+                self.assertEqual(minimax_move, alphabeta_move,
+                                 f"grid {grid}, player {player}")
+
+    def test_prunes(self):
+        """Does alpha-beta visit fewer nodes than the full tree holds?"""
+        grid = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+        minimax_tree = GameTree()
+        minimax_tree.optimal_move(TicTacToeBoard([row[:] for row in grid]))
+        alphabeta_tree = GameTree()
+        alphabeta_tree.optimal_move(TicTacToeBoard([row[:] for row in grid]),
+                                    search='alphabeta')
+        self.assertEqual(len(minimax_tree), minimax_tree.nodes_visited())
+        self.assertLess(alphabeta_tree.nodes_visited(),
+                        minimax_tree.nodes_visited())
+
+    def test_does_not_build_tree(self):
+        tree = GameTree()
+        tree.optimal_move(TicTacToeBoard([[1, 2, 0], [0, 1, 0], [0, 0, 0]],
+                                         player=2), search='alphabeta')
+        self.assertTrue(tree.is_empty())
+
+    def test_unknown_search_mode(self):
+        with self.assertRaises(ValueError):
+            GameTree().optimal_move(TicTacToeBoard(), search='bogus')
+
+if __name__ == '__main__':
+    unittest.main()
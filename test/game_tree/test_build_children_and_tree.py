@@ -3,7 +3,7 @@ complex-setUp test cases."""
 
 import unittest
 
-from tic_tac_toe.general_tree import LinkedQueue
+from tic_tac_toe.general_tree import ArrayQueue
 from tic_tac_toe.game_tree import GameTree
 from tic_tac_toe.board import TicTacToeBoard
 
@@ -85,7 +85,7 @@ class TestBuildForBlankRoot(unittest.TestCase):
     def test_build_for_blank_root(self):
         """For a blank board root node, does the method build and enqueue the
         correct children?"""
-        children_queue = LinkedQueue()
+        children_queue = ArrayQueue()
         self.tree._build_children(self.tree.root(), children_queue)
 
         self.assertEqual(9, len(children_queue))
@@ -146,7 +146,7 @@ class TestBuildLateGameSubtree(unittest.TestCase):
 
     def test_build_first_layer_children(self):
         """Does the method correctly build the two possible children?"""
-        children_queue = LinkedQueue()
+        children_queue = ArrayQueue()
         self.expected_children_grids = [self.child00.board(),
                                         self.child01.board()]
         self.tree._build_children(self.tree.root(), children_queue)
@@ -175,7 +175,9 @@ class BuildForLateGameSubtreeOneMovePrior(unittest.TestCase):
 
     def test_build_full_tree(self):
         self.tree._build_tree(self.tree.root())
-        self.assertEqual(14, len(self.tree)) # should be 15 nodes
+        # 14 nodes, less the 4 other moves from positions where the mover
+        #   can win immediately, which aren't expanded.
+        self.assertEqual(10, len(self.tree))
 
 class BuildForGameoverBoard(unittest.TestCase):
 
@@ -192,7 +194,7 @@ class BuildForGameoverBoard(unittest.TestCase):
     def test_build_children_for_gameover(self):
         """Does the method return without enqueuing any children when called
         on a full-board?"""
-        children_queue = LinkedQueue()
+        children_queue = ArrayQueue()
         self.tree._build_children(self.tree.root(), children_queue)
         self.assertTrue(children_queue.is_empty())
 
@@ -185,7 +185,7 @@ class TestHeight4Subtree(unittest.TestCase):
          minimax value of zero, after the full subtree is constructed?"""
         self.tree._add_root(TicTacToeBoard(self.grid))
         self.tree._build_tree(self.tree.root())
-        assert len(self.tree) == 14 # should be 14 total positions now
+        assert len(self.tree) == 10 # should be 10 total positions now
         assert self.tree.root().element().player() == 1
         score = self.tree._score_subtree(self.tree.root())
         self.assertEqual(0, score)
@@ -230,7 +230,33 @@ class TestHeight4Subtree(unittest.TestCase):
         self.assertEqual(expected_move, move)
         board.mark(move[0], move[1])
 
+class TestScoreEachNodeOnce(unittest.TestCase):
+    """Does _score_subtree score each node exactly once, so its work is
+    linear in the size of the tree?"""
 
+    def test_nodes_scored_equals_tree_size(self):
+        grids_and_players = [
+            ([[1, 2, 1], [0, 2, 2], [0, 1, 0]], 1),
+            ([[1, 0, 0], [0, 2, 0], [0, 0, 0]], 1),
+            ([[0, 0, 0], [0, 1, 0], [0, 0, 0]], 2),
+        ]
+        for grid, player in grids_and_players:
+            tree = GameTree()
+            tree._add_root(TicTacToeBoard(grid, player))
+            tree._build_tree(tree.root())
+            tree._score_subtree(tree.root())
+            self.assertEqual(len(tree), tree.nodes_scored())
+            for position in tree.positions():
+                self.assertIsNotNone(position.score())
+
+    def test_rescoring_scored_tree(self):
+        """Scoring an already-scored tree again only recomputes its root."""
+        tree = GameTree()
+        tree._add_root(TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]]))
+        tree._build_tree(tree.root())
+        score = tree._score_subtree(tree.root())
+        self.assertEqual(score, tree._score_subtree(tree.root()))
+        self.assertEqual(1, tree.nodes_scored())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""Tests for budgeted, iterative deepening GameTree.optimal_move() calls."""
+
+import time
+import unittest
+
+from tic_tac_toe.game_tree import GameTree, heuristic_limit
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.mnk_board import MNKBoard
+
+class TestDeepeningMatchesFullSearch(unittest.TestCase):
+    """With a budget big enough to reach the end of the game, does iterative
+    deepening find moves as good as a full alpha-beta search?"""
+
+    def test_unique_best_moves(self):
+        boards = [
+            TicTacToeBoard([[1, 2, 1], [0, 2, 2], [0, 1, 0]]),
+            TicTacToeBoard([[1, 2, 0], [0, 1, 0], [0, 0, 0]], player=2),
+            TicTacToeBoard([[1, 2, 2], [0, 0, 0], [0, 1, 0]]),
+            MNKBoard(4, 4, 4, grid=[[1, 1, 0, 0],
+                                    [0, 0, 1, 2],
+                                    [2, 0, 0, 2],
+                                    [1, 0, 0, 2]]),
+        ]
+        for board in boards:
+            expected = GameTree().optimal_move(board.copy(), search='alphabeta')
+            move = GameTree().optimal_move(board.copy(), node_budget=10 ** 6)
+            if board.board()[0] == [1, 2, 2]: # two equally fast wins
+                self.assertIn(move, [(2, 0), (2, 2)])
+            else:
+                self.assertEqual(expected, move)
+
+    def test_heuristic_scores_not_stored(self):
+        tree = GameTree()
+        tree.optimal_move(MNKBoard(4, 4, 4, grid=[[1, 0, 0, 0],
+                                                  [0, 2, 0, 0],
+                                                  [0, 0, 0, 0],
+                                                  [0, 0, 0, 0]]),
+                          node_budget=2000)
+        self.assertEqual(0, len(tree.table()))
+
+class TestBudgets(unittest.TestCase):
+    """Does the search stop within its budget with a legal move?"""
+
+    def assert_legal(self, board, move):
+        self.assertIsNotNone(move)
+        self.assertEqual(0, board.board()[move[0]][move[1]])
+
+    def test_node_budget(self):
+        board = MNKBoard(5, 5, 4)
+        board.mark(2, 2)
+        for budget in (1, 50, 5000):
+            tree = GameTree()
+            move = tree.optimal_move(board.copy(), node_budget=budget)
+            self.assert_legal(board, move)
+            self.assertLessEqual(tree.nodes_visited(), budget + 1)
+
+    def test_time_budget(self):
+        board = MNKBoard(15, 15, 5) # far too big to search to the end
+        board.mark(7, 7)
+        start = time.perf_counter()
+        move = GameTree().optimal_move(board.copy(), time_budget=0.05)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assert_legal(board, move)
+
+    def test_bad_budgets(self):
+        for budgets in ({'time_budget': 0}, {'node_budget': 0}):
+            with self.assertRaises(ValueError):
+                GameTree().optimal_move(TicTacToeBoard([[1, 0, 0],
+                                                        [0, 0, 0],
+                                                        [0, 0, 2]]),
+                                        **budgets)
+
+class TestEvaluate(unittest.TestCase):
+    """Tests for the heuristic used at the depth limit."""
+
+    def test_symmetric_position_is_even(self):
+        board = MNKBoard(4, 4, 4)
+        self.assertEqual(0, GameTree()._evaluate(board, 1))
+
+    def test_favors_open_lines(self):
+        board = MNKBoard(4, 4, 4, grid=[[1, 1, 0, 0],
+                                        [0, 0, 0, 0],
+                                        [0, 0, 0, 2],
+                                        [0, 0, 0, 0]])
+        score = GameTree()._evaluate(board, 1)
+        self.assertGreater(score, 0)
+        self.assertLess(score, heuristic_limit(16))
+        self.assertEqual(-score, GameTree()._evaluate(board, 2))
+
+    def test_deep_wins_outrank_heuristics(self):
+        """On boards of up to 225 squares, does a win found as deep as the
+        board allows still score above any heuristic score, so deepening
+        treats it as proven?"""
+        for m, n, k in ((3, 3, 3), (8, 8, 5), (11, 11, 5), (15, 15, 5)):
+            board = MNKBoard(m, n, k)
+            for col in range(k - 1):
+                board.mark(0, col)
+                board.mark(m - 1, col)
+            board.mark(0, k - 1) # X wins
+            tree = GameTree()
+            tree._set_scale(board)
+            limit = heuristic_limit(m * n)
+            self.assertGreater(limit, 0)
+            beta = tree._win_score + 1
+            score = tree._alphabeta(board, -beta, beta, False, 1,
+                                    depth=m * n)
+            self.assertGreater(score, limit)
+            grid = [[0] * n for row in range(m)]
+            grid[0][:k - 1] = [1] * (k - 1)
+            lopsided = MNKBoard(m, n, k, grid=grid, player=2)
+            self.assertLess(abs(tree._evaluate(lopsided, 1)), limit)
+
+if __name__ == '__main__':
+    unittest.main()
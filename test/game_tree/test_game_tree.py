@@ -3,7 +3,8 @@ import unittest
 import copy
 
 from tic_tac_toe.game_tree import GameTree
-from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.board import TicTacToeBoard, WIN_SCORE, shift_score
+from tic_tac_toe.tablebase import solve
 
 class TestGameTreeNode(unittest.TestCase):
     """
@@ -131,7 +132,7 @@ class TestAddRoot(unittest.TestCase):
         self.tree._add_root(board, move)
         score = self.tree._score_subtree(self.tree.root())
         self.tree.root()._node._score = score
-        self.assertEqual(-1, self.tree.root().score()) # minimax will return the flipped score,
+        self.assertEqual(-WIN_SCORE, self.tree.root().score()) # minimax will return the flipped score,
                                                         # because there's no child.
                                                         # mark() call flipped the active player without adding a child.
 
@@ -140,6 +141,14 @@ class TestMiscSimpleMethods(unittest.TestCase):
     def setUp(self):
         self.tree = GameTree()
 
+    def test_seeded_random_corner(self):
+        corners = [GameTree(seed=seed)._random_corner() for seed in range(20)]
+        self.assertEqual(corners,
+                         [GameTree(seed=seed)._random_corner()
+                          for seed in range(20)])
+        self.assertLessEqual(set(corners), {(0, 0), (0, 2), (2, 0), (2, 2)})
+        self.assertGreater(len(set(corners)), 1)
+
 class TestAddUnmarkedChild(unittest.TestCase):
     """Tests for the method that adds a copy of the parent's board as a
     child."""
@@ -227,8 +236,8 @@ class TestScoreLeaf(unittest.TestCase):
         self.tree = GameTree()
 
     def test_correct_score_win(self):
-        """Does the method return 1 when position's element is a board where
-        player won?"""
+        """Does the method return WIN_SCORE when position's element is a board
+        where player won, at depth 0?"""
         grid = [
             [1, 2, 1],
             [0, 2, 2],
@@ -237,13 +246,13 @@ class TestScoreLeaf(unittest.TestCase):
         self.tree._add_root(TicTacToeBoard(grid))
         self.tree.root()._node._move = (2,0) # Value of move if X had just won.
         score = self.tree._score_leaf(self.tree.root())
-        expected_score = 1
+        expected_score = WIN_SCORE
         self.assertEqual(expected_score, score)
         self.assertEqual(expected_score, self.tree.root().score())
 
     def test_correct_score_loss(self):
-        """Does the method return -1 when position's element is a board where
-        player lost?"""
+        """Does the method return -WIN_SCORE when position's element is a
+        board where player lost, at depth 0?"""
         grid = [
             [1, 2, 1],
             [2, 2, 2],
@@ -252,7 +261,7 @@ class TestScoreLeaf(unittest.TestCase):
         self.tree._add_root(TicTacToeBoard(grid))
         self.tree.root()._node._move = (1, 0)  # Value of move if O had just won (moving illegally on X's turn)
         score = self.tree._score_leaf(self.tree.root())
-        expected_score = -1
+        expected_score = -WIN_SCORE
         self.assertEqual(expected_score, score)
         self.assertEqual(expected_score, self.tree.root().score())
 
@@ -296,7 +305,8 @@ class TestScoreLeaf(unittest.TestCase):
         assert child.element().winner() == 1
         child._node._score = None # cancel whatever _add_marked_child did
         assert child.score() is None, f"child.score() = {child.score()}"
-        expected_score = 1 # X win should count as a +1 since top level player is X
+        expected_score = WIN_SCORE - 1 # X win should count as positive since
+                                        #   top level player is X, one move down
         score = self.tree._score_leaf(child)
         self.assertEqual(expected_score, score)
         self.assertEqual(expected_score, child.score())
@@ -344,7 +354,7 @@ class TestScoreSubtree(unittest.TestCase):
         assert len(self.tree) == 4
 
         score = self.tree._score_subtree(self.tree.root())
-        self.assertEqual(1, score) # should take the X win child's score
+        self.assertEqual(WIN_SCORE - 1, score) # should take the X win child's score
 
 class TestSubtreeOptimalMove(unittest.TestCase):
     """Simple setUp tests for internal method that returns the optimal move
@@ -429,6 +439,104 @@ class TestOptimalMove(unittest.TestCase):
         move = tree.optimal_move(board)
         self.assertIn(move, expected_moves)
 
+class TestFasterWins(unittest.TestCase):
+    """Do scores count the moves to the result, so the engine takes the
+    quickest win?"""
+
+    def setUp(self):
+        # X wins in 3 moves with (2, 0) or (2, 2), but only in 5 with (1, 0),
+        #   which -1/0/1 scoring couldn't tell apart and took for being first.
+        self.board = TicTacToeBoard([[1, 2, 2],
+                                     [0, 0, 0],
+                                     [0, 1, 0]])
+
+    def test_prefers_faster_win(self):
+        for search in ('minimax', 'alphabeta'):
+            move = GameTree().optimal_move(self.board.copy(), search=search)
+            self.assertIn(move, [(2, 0), (2, 2)], search)
+
+    def test_root_score_counts_moves(self):
+        tree = GameTree()
+        tree.optimal_move(self.board.copy())
+        self.assertEqual(WIN_SCORE - 3, tree.root().score())
+
+    def test_immediate_win_skips_search(self):
+        tree = GameTree()
+        move = tree.optimal_move(TicTacToeBoard([[1, 2, 0],
+                                                 [0, 1, 2],
+                                                 [0, 0, 0]]))
+        self.assertEqual((2, 2), move)
+        self.assertEqual(0, tree.nodes_visited())
+        self.assertTrue(tree.is_empty())
+
+class TestOptimalMoveSymmetry(unittest.TestCase):
+    """Is the move found on the canonical board mapped back onto the caller's
+    orientation?"""
+
+    def test_rotated_obvious_win(self):
+        """X can win at exactly one square in each rotation of the same
+        position."""
+        grids_and_wins = [
+            ([[0, 2, 1], [0, 2, 2], [0, 1, 1]], (2, 0)),
+            ([[0, 0, 0], [1, 2, 2], [1, 2, 1]], (0, 0)),
+            ([[1, 1, 0], [2, 2, 0], [1, 2, 0]], (0, 2)),
+            ([[1, 2, 1], [2, 2, 1], [0, 0, 0]], (2, 2)),
+        ]
+        for grid, expected_move in grids_and_wins:
+            for search in ('minimax', 'alphabeta'):
+                move = GameTree().optimal_move(TicTacToeBoard(grid),
+                                               search=search)
+                self.assertEqual(expected_move, move)
+
+class TestReuseAcrossMoves(unittest.TestCase):
+    """Does one GameTree reused for a whole game re-root onto the subtree it
+    already built, instead of rebuilding?"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solutions = solve() # exact scores to check moves against
+
+    def assert_optimal(self, board, move):
+        """Assert that move scores as well as the best move on board."""
+        child = board.copy()
+        child.mark(move[0], move[1])
+        best = self.solutions[board.packed()][1]
+        if child.winner() is None:
+            score = shift_score(-self.solutions[child.packed()][1], -1)
+        else:
+            score = 0 if child.winner() == 3 else WIN_SCORE - 1
+        self.assertEqual(best, score, f"{move} on {board.board()}")
+
+    def test_reroot_after_reply(self):
+        tree = GameTree()
+        board = TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        move = tree.optimal_move(board)
+        self.assert_optimal(board, move)
+        first_size = len(tree)
+        old_root = tree.root()
+        board.mark(*move)
+        reply = [(r, c) for r in range(3) for c in range(3)
+                 if board.board()[r][c] == 0][0]
+        board.mark(*reply)
+        move = tree.optimal_move(board)
+        self.assert_optimal(board, move)
+        self.assertEqual(0, tree.nodes_visited()) # nothing new was built
+        self.assertLess(len(tree), first_size) # siblings were released
+        self.assertEqual(len(tree), len(list(tree.positions())))
+        with self.assertRaises(ValueError): # old root is deprecated
+            tree._validate(old_root)
+
+    def test_computer_v_computer(self):
+        """Playing both sides with one tree (re-rooting one move at a time)
+        should give optimal moves all the way to a draw."""
+        tree = GameTree()
+        board = TicTacToeBoard([[0, 0, 2], [0, 1, 0], [0, 0, 0]])
+        while board.winner() is None:
+            move = tree.optimal_move(board)
+            self.assert_optimal(board, move)
+            board.mark(*move)
+        self.assertEqual(3, board.winner())
+
 class TestOptimalMoveShortcuts(unittest.TestCase):
     """Tests for the methods that shortcut overly large tree generation by
     diagnosing common early-game patterns."""
@@ -471,6 +579,13 @@ class TestOptimalMoveShortcuts(unittest.TestCase):
         ]
         bait_grids.append(bait_grid_4)
 
+        bait_grid_5 = [ # no corner marked at all
+            [0, 0, 0],
+            [0, 1, 0],
+            [0, 0, 0]
+        ]
+        bait_grids.append(bait_grid_5)
+
         for grid in bait_grids:
             self.assertFalse(self.tree._first_move_in_corner(grid))
 
@@ -0,0 +1,99 @@
+"""Tests for SearchStats and search hooks on GameTree."""
+
+import unittest
+
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.instrumentation import SearchStats, SearchHook, ProfileHook
+
+class RecordingHook(SearchHook):
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def start(self, board):
+        self.log.append(('start', self.name))
+
+    def stop(self, board, move):
+        self.log.append(('stop', self.name, move))
+
+class TestSearchStats(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+
+    def test_minimax(self):
+        stats = SearchStats()
+        tree = GameTree(stats=stats)
+        tree.optimal_move(TicTacToeBoard(self.grid))
+        self.assertEqual(len(tree) - 1, stats.nodes_created)
+        self.assertEqual(len(tree), stats.nodes_scored)
+        self.assertEqual(tree.nodes_visited(), stats.nodes_visited)
+        self.assertEqual(7, stats.max_depth) # 7 blank squares left
+        self.assertGreater(stats.cache_misses, 0)
+        self.assertGreater(stats.prunes, 0)
+        self.assertGreater(stats.build_time, 0)
+        self.assertGreater(stats.score_time, 0)
+
+    def test_alphabeta(self):
+        stats = SearchStats()
+        tree = GameTree(stats=stats)
+        tree.optimal_move(TicTacToeBoard(self.grid), search='alphabeta')
+        self.assertEqual(0, stats.nodes_created)
+        self.assertEqual(tree.nodes_visited(), stats.nodes_visited)
+        self.assertGreater(stats.prunes, 0)
+        self.assertGreater(stats.cache_hits + stats.cache_misses, 0)
+        self.assertEqual(0.0, stats.build_time)
+
+    def test_reset_each_call(self):
+        stats = SearchStats()
+        tree = GameTree(stats=stats)
+        tree.optimal_move(TicTacToeBoard(self.grid))
+        tree.optimal_move(TicTacToeBoard([[1, 1, 0], [2, 2, 0], [0, 0, 0]]))
+        self.assertEqual({'nodes_created': 0, 'nodes_visited': 0,
+                          'nodes_scored': 0, 'max_depth': 0,
+                          'cache_hits': 0, 'cache_misses': 0, 'prunes': 0},
+                         {name: value
+                          for name, value in stats.as_dict().items()
+                          if not name.endswith('_time')})
+
+    def test_off_by_default(self):
+        self.assertIsNone(GameTree().stats())
+
+class TestHooks(unittest.TestCase):
+
+    def test_order(self):
+        log = []
+        tree = GameTree()
+        tree.add_hook(RecordingHook(log, 'outer'))
+        tree.add_hook(RecordingHook(log, 'inner'))
+        move = tree.optimal_move(TicTacToeBoard([[1, 1, 0], [2, 2, 0],
+                                                 [0, 0, 0]]))
+        self.assertEqual([('start', 'outer'), ('start', 'inner'),
+                          ('stop', 'inner', move), ('stop', 'outer', move)],
+                         log)
+
+    def test_stop_after_error(self):
+        log = []
+        tree = GameTree()
+        hook = RecordingHook(log, 'hook')
+        tree.add_hook(hook)
+        with self.assertRaises(ValueError):
+            tree.optimal_move(TicTacToeBoard(), search='bogus')
+        self.assertEqual(('stop', 'hook', None), log[-1])
+        tree.remove_hook(hook)
+        tree.optimal_move(TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]]))
+        self.assertEqual(2, len(log))
+
+    def test_profile_hook(self):
+        hook = ProfileHook()
+        tree = GameTree()
+        tree.add_hook(hook)
+        tree.optimal_move(TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]]))
+        hook.profile().create_stats()
+        self.assertTrue(any(function[2] == '_build_tree'
+                            for function in hook.profile().stats))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for batch position analysis."""
+
+import itertools
+import unittest
+
+from tic_tac_toe.analysis import analyze, to_packed
+from tic_tac_toe.board import TicTacToeBoard, WIN_SCORE
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.mnk_board import MNKBoard
+
+class TestToPacked(unittest.TestCase):
+
+    def test_grid_player(self):
+        grid = [[1, 0, 0], [0, 0, 0], [0, 0, 0]]
+        self.assertEqual(TicTacToeBoard(grid, player=2).packed(),
+                         to_packed(grid))
+        self.assertEqual(12345, to_packed(12345))
+
+class TestAnalyze(unittest.TestCase):
+
+    def setUp(self):
+        self.grids = [
+            [[1, 1, 0], [2, 2, 0], [0, 0, 0]], # X wins now
+            [[1, 0, 0], [0, 2, 0], [0, 0, 0]],
+            [[1, 2, 1], [0, 2, 2], [0, 1, 0]],
+            [[1, 1, 1], [2, 2, 0], [0, 0, 0]], # game over
+        ]
+
+    def test_records(self):
+        records = list(analyze(self.grids))
+        self.assertEqual(self.grids, [record[0] for record in records])
+        self.assertEqual(((0, 2), WIN_SCORE - 1), records[0][1:])
+        self.assertEqual((None, None), records[3][1:])
+        for grid, move, score in records[1:3]:
+            board = TicTacToeBoard([row[:] for row in grid])
+            self.assertEqual(GameTree().optimal_move(board, search='alphabeta'),
+                             move)
+
+    def test_packed_input(self):
+        packed = [to_packed(grid) for grid in self.grids]
+        self.assertEqual([record[1:] for record in analyze(self.grids)],
+                         [record[1:] for record in analyze(packed)])
+
+    def test_workers_agree(self):
+        positions = [to_packed(grid) for grid in self.grids] * 5
+        self.assertEqual(list(analyze(positions)),
+                         list(analyze(positions, workers=2, chunk_size=3)))
+
+    def test_streams_lazily(self):
+        """Can an endless input be consumed a record at a time?"""
+        records = analyze(itertools.cycle(self.grids[:2]), workers=2,
+                          chunk_size=2)
+        self.assertEqual(5, len(list(itertools.islice(records, 5))))
+        records.close()
+
+    def test_mnk_positions(self):
+        grid = [[1, 1, 0, 0], [0, 0, 1, 2], [2, 0, 0, 2], [1, 0, 0, 2]]
+        (position, move, score), = analyze([grid], dimensions=(4, 4, 4))
+        self.assertEqual((0, 3), move)
+        self.assertEqual(WIN_SCORE - 3, score)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            next(analyze(self.grids, workers=0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Tests for the ArrayQueue ring-buffer queue used by tree traversals."""
+
+import unittest
+
+from tic_tac_toe.general_tree import ArrayQueue, Empty
+
+class TestArrayQueue(unittest.TestCase):
+    """Tests for FIFO order across growth and wraparound."""
+
+    def test_fifo_order(self):
+        queue = ArrayQueue()
+        for i in range(10):
+            queue.enqueue(i)
+        self.assertEqual(10, len(queue))
+        self.assertEqual(0, queue.first())
+        self.assertEqual(list(range(10)), [queue.dequeue() for i in range(10)])
+        self.assertTrue(queue.is_empty())
+
+    def test_empty_queue(self):
+        queue = ArrayQueue()
+        with self.assertRaises(Empty):
+            queue.dequeue()
+        with self.assertRaises(Empty):
+            queue.first()
+
+    def test_grows_while_wrapped(self):
+        """Does the queue keep its order when it grows with its front partway
+        through the underlying list?"""
+        queue = ArrayQueue(4)
+        expected = []
+        for i in range(3):
+            queue.enqueue(i)
+        queue.dequeue()
+        queue.dequeue()
+        expected.append(2)
+        for i in range(3, 12): # wraps around, then has to grow
+            queue.enqueue(i)
+            expected.append(i)
+        self.assertEqual(expected, [queue.dequeue() for i in range(len(queue))])
+
+    def test_enqueue_many(self):
+        queue = ArrayQueue(4)
+        queue.enqueue('a')
+        queue.enqueue('b')
+        queue.dequeue()
+        queue.enqueue_many(['c', 'd', 'e']) # wraps around the end of storage
+        queue.enqueue_many([])
+        queue.enqueue_many(['f', 'g', 'h', 'i', 'j']) # has to grow
+        self.assertEqual(list('bcdefghij'),
+                         [queue.dequeue() for i in range(len(queue))])
+
+if __name__ == '__main__':
+    unittest.main()
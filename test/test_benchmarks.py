@@ -0,0 +1,44 @@
+"""Tests for the benchmark suite's corpus and regression check."""
+
+import unittest
+
+from benchmarks.suite import corpus, compare, run_one, PER_DEPTH
+
+class TestCorpus(unittest.TestCase):
+
+    def test_every_depth(self):
+        grids = corpus()
+        depths = [sum(mark != 0 for row in grid for mark in row)
+                  for grid in grids]
+        self.assertEqual([depth for depth in range(9)
+                          for i in range(PER_DEPTH)], depths)
+
+    def test_fixed(self):
+        self.assertEqual(corpus(), corpus())
+
+class TestCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = {'a': {'wall_time': 1.0, 'peak_memory': 1000}}
+
+    def test_within_threshold(self):
+        results = {'a': {'wall_time': 1.1, 'peak_memory': 900}}
+        self.assertEqual([], compare(results, self.baseline, 0.2))
+
+    def test_regressions(self):
+        results = {'a': {'wall_time': 1.5, 'peak_memory': 1300},
+                   'new': {'wall_time': 9.0, 'peak_memory': 9}}
+        regressions = compare(results, self.baseline, 0.2)
+        self.assertEqual(2, len(regressions))
+        self.assertTrue(regressions[0].startswith('a wall_time'))
+
+class TestRunOne(unittest.TestCase):
+
+    def test_result_fields(self):
+        result = run_one(lambda: 10, lambda n: len(list(range(n))), 2)
+        self.assertEqual(10, result['nodes'])
+        self.assertEqual({'wall_time', 'nodes', 'nodes_per_sec',
+                          'peak_memory'}, set(result))
+
+if __name__ == '__main__':
+    unittest.main()
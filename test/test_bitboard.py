@@ -0,0 +1,125 @@
+"""Tests for the BitBoard alternative board backend."""
+
+import random
+import unittest
+
+from tic_tac_toe.bitboard import BitBoard
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.game_tree import GameTree
+
+class TestInit(unittest.TestCase):
+    """Tests for constructing a BitBoard from nothing or from a 3 x 3 grid."""
+
+    def test_init_blank(self):
+        board = BitBoard()
+        self.assertEqual([[0, 0, 0], [0, 0, 0], [0, 0, 0]], board.board())
+        self.assertEqual(1, board.player())
+
+    def test_init_existing_grid(self):
+        """Does board() hand back the same grid the board was built from?"""
+        grid = [
+            [1, 2, 0],
+            [0, 1, 0],
+            [0, 2, 1]
+        ]
+        board = BitBoard(grid, player=2)
+        self.assertEqual(grid, board.board())
+        self.assertEqual(2, board.player())
+
+class TestMark(unittest.TestCase):
+    """Tests for the BitBoard.mark() method."""
+
+    def setUp(self):
+        self.board = BitBoard()
+
+    def test_mark_flips_player(self):
+        self.board.mark(1, 1)
+        self.board.mark(0, 0)
+        self.assertEqual([[2, 0, 0], [0, 1, 0], [0, 0, 0]], self.board.board())
+        self.assertEqual(1, self.board.player())
+
+    def test_invalid_board_position(self):
+        with self.assertRaises(ValueError):
+            self.board.mark(3, 3)
+
+    def test_board_position_occupied(self):
+        self.board.mark(1, 1)
+        with self.assertRaises(ValueError):
+            self.board.mark(1, 1)
+
+    def test_game_already_complete(self):
+        board = BitBoard([[1, 0, 0], [0, 1, 0], [0, 0, 1]], player=2)
+        with self.assertRaises(ValueError):
+            board.mark(1, 2)
+
+class TestWinner(unittest.TestCase):
+    """Does BitBoard.winner() agree with TicTacToeBoard.winner()?"""
+
+    def test_agrees_with_list_board(self):
+        grids = [
+            [[1, 2, 1], [1, 2, 2], [2, 1, 1]], # draw
+            [[0, 2, 1], [0, 2, 2], [0, 1, 1]], # in progress
+            [[1, 2, 1], [2, 2, 2], [0, 1, 1]], # O wins middle row
+            [[0, 0, 1], [0, 1, 2], [1, 2, 0]], # X wins reverse diagonal
+            [[2, 1, 1], [2, 1, 0], [2, 0, 0]], # O wins column 0
+        ]
+        for grid in grids:
+            self.assertEqual(TicTacToeBoard(grid).winner(),
+                             BitBoard(grid).winner())
+
+    def test_winning_move_agrees_with_list_board(self):
+        """Over many random games, does BitBoard.winning_move() find the same
+        square as TicTacToeBoard.winning_move() after every move?"""
+        random.seed(11)
+        for game in range(100):
+            board = TicTacToeBoard(player=random.choice([1, 2]))
+            while board.winner() is None:
+                bits = BitBoard(board.board(), board.player())
+                self.assertEqual(board.winning_move(), bits.winning_move())
+                moves = [(r, c) for r in range(3) for c in range(3)
+                         if board.board()[r][c] == 0]
+                board.mark(*random.choice(moves))
+            self.assertIsNone(BitBoard(board.board()).winning_move())
+
+class TestCopyAndPacking(unittest.TestCase):
+    """Tests for copy(), packed() and from_packed()."""
+
+    def test_copy_is_independent(self):
+        board = BitBoard()
+        board.mark(0, 0)
+        copied = board.copy()
+        copied.mark(1, 1)
+        self.assertEqual([[1, 0, 0], [0, 0, 0], [0, 0, 0]], board.board())
+        self.assertEqual(2, board.player())
+
+    def test_packed_round_trip(self):
+        board = BitBoard([[1, 2, 0], [0, 1, 0], [0, 2, 0]], player=1)
+        unpacked = BitBoard.from_packed(board.packed())
+        self.assertEqual(board.board(), unpacked.board())
+        self.assertEqual(board.player(), unpacked.player())
+
+    def test_packed_matches_list_board(self):
+        """Do both board classes produce the same key for the same state?"""
+        grid = [[1, 2, 0], [0, 1, 0], [0, 2, 0]]
+        self.assertEqual(TicTacToeBoard(grid, player=2).packed(),
+                         BitBoard(grid, player=2).packed())
+
+    def test_str_matches_list_board(self):
+        grid = [[1, 2, 0], [0, 1, 0], [0, 2, 1]]
+        self.assertEqual(str(TicTacToeBoard(grid)), str(BitBoard(grid)))
+
+class TestGameTreeWithBitBoard(unittest.TestCase):
+    """Can GameTree search a BitBoard the same way it searches a
+    TicTacToeBoard?"""
+
+    def test_optimal_move(self):
+        grid = [
+            [1, 2, 1],
+            [0, 2, 2],
+            [0, 1, 0]
+        ]
+        self.assertEqual(GameTree().optimal_move(TicTacToeBoard(grid)),
+                         GameTree().optimal_move(BitBoard(grid)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
+import random
 
-from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.board import TicTacToeBoard, transform_move, inverse_transform
 
 class TestBoardInit(unittest.TestCase):
     """Tests to confirm correct initialization of a Board object."""
@@ -139,6 +140,126 @@ class TestWinner(unittest.TestCase):
         board = TicTacToeBoard(grid=grid)
         self.assertEqual(3, board.winner())
 
+class TestIncrementalWinner(unittest.TestCase):
+    """Tests for the per-line counts that mark() keeps up to date so winner()
+    doesn't rescan the grid."""
+
+    def test_agrees_with_full_rescan(self):
+        """Over many random games, does the incrementally maintained winner
+        match a from-scratch count of the same grid after every move?"""
+        random.seed(7)
+        for game in range(200):
+            board = TicTacToeBoard()
+            while board.winner() is None:
+                moves = [(r, c) for r in range(3) for c in range(3)
+                         if board.board()[r][c] == 0]
+                board.mark(*random.choice(moves))
+                rescanned = TicTacToeBoard([row[:] for row in board.board()])
+                self.assertEqual(rescanned.winner(), board.winner())
+
+    def test_assigning_grid_resets_counts(self):
+        """Does assigning a new grid to _grid make winner() reflect the new
+        grid rather than the stale counts?"""
+        board = TicTacToeBoard()
+        self.assertIsNone(board.winner())
+        board._grid = [[2, 2, 2],
+                       [1, 1, 0],
+                       [1, 0, 0]]
+        self.assertEqual(2, board.winner())
+
+    def test_copy_keeps_counts_independent(self):
+        """Does marking a copy leave the original's counts unchanged?"""
+        board = TicTacToeBoard([[1, 1, 0],
+                                [2, 2, 0],
+                                [0, 0, 0]])
+        assert board.winner() is None
+        child = board.copy()
+        child.mark(0, 2)
+        self.assertEqual(1, child.winner())
+        self.assertIsNone(board.winner())
+
+class TestWinningMove(unittest.TestCase):
+    """Tests for finding a square that wins on the spot."""
+
+    def test_finds_winning_square(self):
+        board = TicTacToeBoard([[1, 2, 0],
+                                [0, 1, 2],
+                                [0, 0, 0]])
+        self.assertEqual((2, 2), board.winning_move())
+
+    def test_first_of_several(self):
+        """With two winning squares, is the first in row-major order
+        returned?"""
+        board = TicTacToeBoard([[1, 1, 0],
+                                [2, 2, 0],
+                                [1, 2, 0]], player=1)
+        self.assertEqual((0, 2), board.winning_move())
+
+    def test_blocked_line(self):
+        """Does a line the opponent has blocked, or that belongs to the
+        opponent, not count?"""
+        board = TicTacToeBoard([[1, 1, 2],
+                                [2, 2, 0],
+                                [1, 0, 0]], player=1)
+        self.assertIsNone(board.winning_move())
+        board = TicTacToeBoard([[1, 1, 2],
+                                [2, 2, 0],
+                                [1, 0, 0]], player=2)
+        self.assertEqual((1, 2), board.winning_move())
+
+    def test_gameover(self):
+        board = TicTacToeBoard([[1, 1, 1],
+                                [2, 2, 0],
+                                [0, 0, 0]], player=2)
+        self.assertIsNone(board.winning_move())
+
+class TestSymmetry(unittest.TestCase):
+    """Tests for canonical() and the transform helpers."""
+
+    def setUp(self):
+        self.grid = [[1, 2, 0],
+                     [0, 1, 0],
+                     [0, 0, 0]]
+
+    def variants(self, grid):
+        """Return all 8 rotations/reflections of grid."""
+        variants = []
+        for flip in (False, True):
+            g = [row[::-1] for row in grid] if flip else [row[:] for row in grid]
+            for i in range(4):
+                variants.append(g)
+                g = [list(row) for row in zip(*g[::-1])] # rotate 90 clockwise
+        return variants
+
+    def test_variants_share_canonical_form(self):
+        keys = set()
+        for variant in self.variants(self.grid):
+            keys.add(TicTacToeBoard(variant, player=2).canonical_key())
+        self.assertEqual(1, len(keys))
+
+    def test_transform_maps_board_onto_canonical(self):
+        """Does each mark of the board land, via the returned transform, on
+        the same mark of the canonical board?"""
+        for variant in self.variants(self.grid):
+            canonical, transform = TicTacToeBoard(variant).canonical()
+            for row in range(3):
+                for col in range(3):
+                    r, c = transform_move((row, col), transform)
+                    self.assertEqual(variant[row][col],
+                                     canonical.board()[r][c])
+
+    def test_inverse_transform(self):
+        for transform in range(8):
+            for square in range(9):
+                move = (square // 3, square % 3)
+                moved = transform_move(move, transform)
+                self.assertEqual(move, transform_move(
+                    moved, inverse_transform(transform)))
+
+    def test_canonical_keeps_player(self):
+        canonical, transform = TicTacToeBoard(self.grid, player=2).canonical()
+        self.assertEqual(2, canonical.player())
+
 class TestBoard(unittest.TestCase):
     """Tests for the public get_board() method that returns the board to outside
     caller code."""
@@ -1,13 +1,55 @@
+import contextlib
+import io
 import unittest
 
 from tic_tac_toe.commandline import CLIBoard
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.game import Player
 
 class TestInit(unittest.TestCase):
     pass
 
 class TestGetComputerMove(unittest.TestCase):
 
-    pass
+    def test_budget_passed_through(self):
+        """Does computer_move() search within the budget CLIBoard was given
+        and mark the board?"""
+        board = TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        cli = CLIBoard(board, Player(human=False), Player(human=False),
+                       node_budget=30)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.computer_move(None)
+        self.assertEqual(3, sum(mark != 0 for row in board.board()
+                                for mark in row))
+        self.assertLessEqual(cli._tree.nodes_visited(), 31)
+
+    def test_mcts_engine(self):
+        """Does the 'mcts' engine run its playouts and report the rate?"""
+        board = TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        cli = CLIBoard(board, Player(human=False), Player(human=False),
+                       node_budget=100, engine='mcts', seed=0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cli.computer_move(None)
+        self.assertEqual(3, sum(mark != 0 for row in board.board()
+                                for mark in row))
+        self.assertEqual(100, cli._tree.playouts())
+        self.assertIn('playouts/sec', output.getvalue())
+
+    def test_stats(self):
+        """Does computer_move() print the search stats when asked to?"""
+        board = TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        cli = CLIBoard(board, Player(human=False), Player(human=False),
+                       stats=True)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cli.computer_move(None)
+        self.assertIn('nodes:', output.getvalue())
+        self.assertIn('prunes', output.getvalue())
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            CLIBoard(TicTacToeBoard(), Player(), Player(), engine='oracle')
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+"""Tests for the array-backed CompactGameTree storage engine."""
+
+import tracemalloc
+import unittest
+
+from tic_tac_toe.compact_tree import CompactGameTree
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.board import TicTacToeBoard
+
+class TestBuildAndScore(unittest.TestCase):
+    """Does the compact tree hold the same game tree GameTree would?"""
+
+    def setUp(self):
+        self.grid = [
+            [1, 2, 1],
+            [0, 2, 2],
+            [0, 1, 0]
+        ]
+
+    def test_tree_size(self):
+        """Same 10-position subtree as the GameTree build tests."""
+        tree = CompactGameTree()
+        tree._add_root(TicTacToeBoard(self.grid))
+        tree._build_tree()
+        self.assertEqual(10, len(tree))
+
+    def test_optimal_move(self):
+        grids_and_players = [ # each has a single best move
+            (self.grid, 1),
+            ([[0, 2, 1], [0, 2, 2], [0, 1, 1]], 1),
+            ([[1, 2, 0], [0, 1, 0], [0, 0, 0]], 2),
+        ]
+        for grid, player in grids_and_players:
+            self.assertEqual(
+                GameTree().optimal_move(TicTacToeBoard(grid, player)),
+                CompactGameTree().optimal_move(TicTacToeBoard(grid, player)))
+
+    def test_repeated_calls(self):
+        """Can one tree answer several optimal_move() calls in a row?"""
+        tree = CompactGameTree()
+        for grid, player in ((self.grid, 1),
+                             ([[1, 2, 0], [0, 1, 0], [0, 0, 0]], 2),
+                             (self.grid, 1)):
+            self.assertEqual(
+                GameTree().optimal_move(TicTacToeBoard(grid, player)),
+                tree.optimal_move(TicTacToeBoard(grid, player)))
+        self.assertEqual(10, len(tree))
+
+    def test_root_score(self):
+        tree = CompactGameTree()
+        tree.optimal_move(TicTacToeBoard(self.grid))
+        self.assertEqual(0, tree.root().score())
+
+class TestPositionAPI(unittest.TestCase):
+    """Do the Position-based accessors behave like GameTree's?"""
+
+    def setUp(self):
+        self.tree = CompactGameTree()
+        self.tree.optimal_move(TicTacToeBoard([[1, 2, 1],
+                                               [0, 2, 2],
+                                               [0, 1, 0]]))
+
+    def test_parent_child_links(self):
+        root = self.tree.root()
+        self.assertTrue(self.tree.is_root(root))
+        self.assertIsNone(self.tree.parent(root))
+        self.assertIsNone(root.move())
+        children = list(self.tree.children(root))
+        self.assertEqual(3, self.tree.num_children(root))
+        self.assertEqual({(1, 0), (2, 0), (2, 2)},
+                         {child.move() for child in children})
+        for child in children:
+            self.assertEqual(root, self.tree.parent(child))
+            self.assertEqual(1, self.tree.depth(child))
+            grid = child.element().board()
+            self.assertEqual(1, grid[child.move()[0]][child.move()[1]])
+
+    def test_traversals_cover_tree(self):
+        self.assertEqual(len(self.tree), len(list(self.tree.preorder())))
+        self.assertEqual(len(self.tree), len(list(self.tree.breadthfirst())))
+        for position in self.tree.positions():
+            if self.tree.is_leaf(position):
+                self.assertIsNotNone(position.element().winner())
+
+    def test_foreign_position(self):
+        with self.assertRaises(ValueError):
+            self.tree.parent(CompactGameTree.Position(CompactGameTree(), 0))
+
+class TestMemory(unittest.TestCase):
+    """Is memory per node an order of magnitude below GameTree's?"""
+
+    def test_bytes_per_node(self):
+        board = TicTacToeBoard([[0, 0, 0], [0, 1, 0], [0, 0, 0]], player=2)
+        tracemalloc.start()
+        tree = GameTree()
+        tree._add_root(board.copy())
+        tree._build_tree(tree.root())
+        game_tree_per_node = tracemalloc.get_traced_memory()[0] / len(tree)
+        tracemalloc.stop()
+
+        compact = CompactGameTree()
+        compact._add_root(board)
+        compact._build_tree()
+        compact_per_node = compact.memory_usage() / len(compact)
+        self.assertLess(compact_per_node * 10, game_tree_per_node)
+
+if __name__ == '__main__':
+    unittest.main()
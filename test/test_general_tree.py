@@ -3,6 +3,7 @@ more specific to tic tac toe use."""
 
 import unittest
 import random
+import tracemalloc
 
 from tic_tac_toe.general_tree import GeneralTree
 
@@ -182,6 +183,11 @@ class TestDelete(unittest.TestCase):
         for ggc in great_grandchildren: # all greatgrandchildren should have same
                                         #   parent they started with.
             self.assertEqual(ggc._node._parent, grandchild._node)
+        # ...but every promoted node is now one level shallower.
+        self.assertEqual(1, self.tree.depth(grandchild))
+        for position in self.tree._subtree_preorder(grandchild):
+            self.assertEqual(self.tree.depth(position),
+                             self.tree.depth(self.tree.parent(position)) + 1)
 
     def test_delete_node_with_multiple_children(self):
         """Does the _delete method raise ValueError when attempting to delete
@@ -200,6 +206,39 @@ class TestDelete(unittest.TestCase):
         self.assertEqual(self.tree.root(), self.first_child)
         
 
+class TestAttach(unittest.TestCase):
+    """Tests for the _attach internal method."""
+
+    def setUp(self):
+        self.tree, self.positions = twelve_element_test_tree()
+        self.other, self.other_positions = twelve_element_test_tree()
+
+    def test_attach_subtree(self):
+        """Does _attach move every node of the other tree under the given
+        Position, with sizes and depths updated?"""
+        self.tree._attach(self.positions[12], self.other)
+        self.assertEqual(24, len(self.tree))
+        self.assertTrue(self.other.is_empty())
+        attached_root = self.tree._make_position(self.other_positions[1]._node)
+        self.assertEqual(self.positions[12], self.tree.parent(attached_root))
+        self.assertEqual(4, self.tree.depth(attached_root))
+        deepest = self.tree._make_position(self.other_positions[12]._node)
+        self.assertEqual(7, self.tree.depth(deepest))
+        self.assertEqual(7, self.tree.height())
+
+    def test_attached_positions_belong_to_tree(self):
+        """Are Positions cached while the nodes were in the other tree
+        replaced, so they validate against their new container?"""
+        self.tree._attach(self.positions[12], self.other)
+        node = self.other_positions[2]._node
+        self.assertIs(self.tree, self.tree._make_position(node)._container)
+        self.assertEqual(self.positions[12],
+            self.tree.parent(self.tree.parent(self.tree._make_position(node))))
+
+    def test_attach_wrong_type(self):
+        with self.assertRaises(TypeError):
+            self.tree._attach(self.positions[12], [])
+
 class TestRecursivelyDelete(unittest.TestCase):
     """Tests for _recursively_delete."""
 
@@ -512,6 +551,75 @@ children from setUp"
         actual_order_elements = [i._node._element for i in self.tree.breadthfirst()]
         self.assertEqual(actual_order_elements, expected_order_elements)
 
+class TestDeepTree(unittest.TestCase):
+    """Do the traversals and accessors work on a tree far deeper than the
+    interpreter's recursion limit?"""
+
+    def setUp(self):
+        self.depth = 5000
+        self.tree = GeneralTree()
+        position = self.tree._add_root(0)
+        for i in range(1, self.depth + 1): # a single long chain
+            position = self.tree._add_child(position, i)
+        self.tree._add_child(self.tree.parent(position), 'sibling')
+        self.deepest = position
+
+    def test_preorder(self):
+        elements = [p.element() for p in self.tree.preorder()]
+        self.assertEqual(list(range(self.depth + 1)) + ['sibling'], elements)
+
+    def test_postorder(self):
+        elements = [p.element() for p in self.tree.postorder()]
+        self.assertEqual(self.depth, elements[0])
+        self.assertEqual('sibling', elements[1])
+        self.assertEqual(0, elements[-1])
+
+    def test_depth_and_height(self):
+        self.assertEqual(self.depth, self.tree.depth(self.deepest))
+        self.assertEqual(self.depth, self.tree.height())
+
+    def test_parenthesize(self):
+        string = self.tree.parenthesize(self.tree.root())
+        self.assertTrue(string.startswith('0 (1 (2 (3'))
+        self.assertTrue(string.endswith('4999 (5000, sibling' + ')' * self.depth))
+
+class TestPositionCache(unittest.TestCase):
+    """Does the tree hand out one reusable Position per node?"""
+
+    def setUp(self):
+        self.tree, self.positions = twelve_element_test_tree()
+
+    def test_same_position_object(self):
+        node = self.positions[7]._node
+        self.assertIs(self.tree._make_position(node),
+                      self.tree._make_position(node))
+        self.assertIs(self.positions[4], self.tree.parent(self.positions[10]))
+        self.assertEqual(list(self.tree.preorder()),
+                         list(self.tree.preorder()))
+
+    def test_traversal_allocations(self):
+        """Does traversing a large tree a second time allocate far less than
+        the first time, now that its Positions exist?"""
+        tree = GeneralTree()
+        fringe = [tree._add_root(0)]
+        for i in range(1, 20000): # wide tree, 4 children per node
+            fringe.append(tree._add_child(fringe[(i - 1) // 4], i))
+        for node in (p._node for p in fringe):
+            node._position = None # start with no Positions made
+        del fringe
+
+        def traced_size(traversal):
+            tracemalloc.start()
+            positions = list(traversal())
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            self.assertEqual(len(tree), len(positions))
+            return size
+
+        first = traced_size(tree.breadthfirst)
+        second = traced_size(tree.breadthfirst)
+        self.assertLess(second * 4, first)
+
 def twelve_element_test_tree():
     """Helper function to generate the same 12-element, 4-layer test tree in a way
     that's callable by setUp methods throughout this test module.
@@ -0,0 +1,70 @@
+"""Tests for the MCTSTree engine."""
+
+import unittest
+
+from tic_tac_toe.mcts import MCTSTree
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.bitboard import BitBoard
+from tic_tac_toe.mnk_board import MNKBoard
+
+class TestOptimalMove(unittest.TestCase):
+
+    def test_takes_immediate_win(self):
+        board = TicTacToeBoard([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+        tree = MCTSTree(seed=0)
+        self.assertEqual((0, 2), tree.optimal_move(board))
+        self.assertEqual(0, tree.playouts())
+
+    def test_blocks_loss(self):
+        board = TicTacToeBoard([[1, 1, 0], [0, 2, 0], [0, 0, 0]], player=2)
+        move = MCTSTree(seed=0).optimal_move(board, playout_budget=2000)
+        self.assertEqual((0, 2), move)
+
+    def test_board_not_changed(self):
+        for board in (TicTacToeBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]]),
+                      BitBoard([[1, 0, 0], [0, 2, 0], [0, 0, 0]]),
+                      MNKBoard(5, 5, 4)):
+            before = board.board()
+            MCTSTree(seed=0).optimal_move(board, playout_budget=50)
+            self.assertEqual(before, board.board())
+
+    def test_legal_move_on_large_board(self):
+        board = MNKBoard(15, 15, 5)
+        board.mark(7, 7)
+        tree = MCTSTree(seed=1)
+        move = tree.optimal_move(board, time_budget=0.05)
+        self.assertEqual(0, board.board()[move[0]][move[1]])
+        self.assertGreater(tree.playouts(), 0)
+
+    def test_bad_budgets(self):
+        for budgets in ({'time_budget': 0}, {'playout_budget': 0}):
+            with self.assertRaises(ValueError):
+                MCTSTree().optimal_move(TicTacToeBoard(), **budgets)
+
+class TestSeed(unittest.TestCase):
+    """Do searches with the same seed and playout budget repeat exactly?"""
+
+    def test_same_seed_same_search(self):
+        board = MNKBoard(5, 5, 4)
+        board.mark(2, 2)
+        results = []
+        for i in range(2):
+            tree = MCTSTree(seed=42)
+            move = tree.optimal_move(board, playout_budget=300)
+            results.append((move, len(tree),
+                            [(child._move, child._visits, child._wins)
+                             for child in tree._root._children]))
+        self.assertEqual(results[0], results[1])
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_playout_rate(self):
+        tree = MCTSTree(seed=0)
+        self.assertEqual(0.0, tree.playouts_per_second())
+        tree.optimal_move(TicTacToeBoard(), playout_budget=200)
+        self.assertEqual(200, tree.playouts())
+        self.assertGreater(tree.playouts_per_second(), 0)
+        self.assertLessEqual(len(tree), 201)
+
+if __name__ == '__main__':
+    unittest.main()
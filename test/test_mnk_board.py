@@ -0,0 +1,133 @@
+"""Tests for MNKBoard and for searching it with GameTree."""
+
+import random
+import unittest
+
+from tic_tac_toe.mnk_board import MNKBoard, geometry
+from tic_tac_toe.board import TicTacToeBoard, WIN_SCORE, win_score
+from tic_tac_toe.game_tree import GameTree
+
+class TestGeometry(unittest.TestCase):
+    """Are the precomputed line tables the right size?"""
+
+    def test_line_counts(self):
+        self.assertEqual(8, len(geometry(3, 3, 3).masks))
+        self.assertEqual(10, len(geometry(4, 4, 4).masks))
+        self.assertEqual(2 * 15 * 11 + 2 * 11 * 11,
+                         len(geometry(15, 15, 5).masks)) # Gomoku
+
+    def test_masks_through_corner(self):
+        """A corner square is on one row, one column and one diagonal."""
+        self.assertEqual(3, len(geometry(5, 5, 4).masks_through[0]))
+
+    def test_shared_between_boards(self):
+        self.assertIs(MNKBoard(4, 4, 4)._geometry, MNKBoard(4, 4, 4)._geometry)
+
+    def test_line_too_long(self):
+        with self.assertRaises(ValueError):
+            MNKBoard(3, 3, 4)
+
+class TestMatchesTicTacToeBoard(unittest.TestCase):
+    """Does a 3,3,3 MNKBoard behave exactly like a TicTacToeBoard?"""
+
+    def test_random_games(self):
+        random.seed(5)
+        for game in range(100):
+            board = TicTacToeBoard()
+            mnk = MNKBoard()
+            while board.winner() is None:
+                self.assertEqual(board.winning_move(), mnk.winning_move())
+                moves = [(r, c) for r in range(3) for c in range(3)
+                         if board.board()[r][c] == 0]
+                move = random.choice(moves)
+                board.mark(*move)
+                mnk.mark(*move)
+                self.assertEqual(board.winner(), mnk.winner())
+                self.assertEqual(board.board(), mnk.board())
+                self.assertEqual(board.packed(), mnk.packed())
+
+    def test_same_scores(self):
+        grid = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+        tree = GameTree()
+        tree.optimal_move(TicTacToeBoard([row[:] for row in grid]))
+        mnk_tree = GameTree()
+        mnk_tree.optimal_move(MNKBoard(grid=grid))
+        self.assertEqual(tree.root().score(), mnk_tree.root().score())
+
+class TestMark(unittest.TestCase):
+
+    def test_errors(self):
+        board = MNKBoard(4, 5, 4)
+        with self.assertRaises(ValueError):
+            board.mark(4, 0)
+        with self.assertRaises(ValueError):
+            board.mark(0, 5)
+        board.mark(3, 4)
+        with self.assertRaises(ValueError):
+            board.mark(3, 4)
+
+    def test_gomoku_diagonal_win(self):
+        board = MNKBoard(15, 15, 5)
+        for i in range(4):
+            board.mark(7 + i, 3 + i) # X down and to the right
+            board.mark(0, i) # O along the top
+        self.assertIsNone(board.winner())
+        self.assertEqual((6, 2), board.winning_move()) # X can extend either
+        board.mark(14, 14)                             #   end of the line
+        self.assertEqual((0, 4), board.winning_move()) # O's turn
+        board.mark(5, 5)
+        board.mark(11, 7)
+        self.assertEqual(1, board.winner())
+
+    def test_grid_size_checked(self):
+        with self.assertRaises(ValueError):
+            MNKBoard(4, 4, 4, grid=[[0] * 3 for i in range(3)])
+
+class TestGameTreeOnLargerBoards(unittest.TestCase):
+    """Does GameTree search an MNKBoard without any board-size special
+    cases?"""
+
+    def setUp(self):
+        # 4 x 4, four in a row, X to move with 8 squares left. X wins by
+        #   taking (0, 3), threatening both the top row and the diagonal
+        #   up from (3, 0).
+        self.grid = [
+            [1, 1, 0, 0],
+            [0, 0, 1, 2],
+            [2, 0, 0, 2],
+            [1, 0, 0, 2],
+        ]
+
+    def test_searches_agree(self):
+        moves = []
+        for search in ('minimax', 'alphabeta'):
+            tree = GameTree()
+            moves.append(tree.optimal_move(MNKBoard(4, 4, 4, grid=self.grid),
+                                           search=search))
+        self.assertEqual(moves[0], moves[1])
+        self.assertEqual((0, 3), moves[0])
+
+    def test_win_score(self):
+        tree = GameTree()
+        tree.optimal_move(MNKBoard(4, 4, 4, grid=self.grid))
+        self.assertEqual(WIN_SCORE - 3, tree.root().score())
+
+    def test_win_score_scales_with_board(self):
+        """On a board with more squares than WIN_SCORE, does a win as deep
+        as the board allows still outscore a draw?"""
+        self.assertEqual(WIN_SCORE, win_score(9))
+        self.assertEqual(WIN_SCORE, win_score(49))
+        board = MNKBoard(11, 11, 5)
+        for col in range(4):
+            board.mark(0, col)
+            board.mark(10, col)
+        board.mark(0, 4) # X wins
+        tree = GameTree()
+        tree._set_scale(board)
+        beta = tree._win_score + 1
+        score = tree._alphabeta(board, -beta, beta, False, 1, depth=120)
+        self.assertGreater(score, 0)
+        self.assertLess(score, tree._win_score)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for root-parallel search with ParallelSearch."""
+
+import random
+import unittest
+
+from tic_tac_toe.parallel import ParallelSearch, pack, unpack
+from tic_tac_toe.bitboard import BitBoard
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.mnk_board import MNKBoard
+
+class TestPacking(unittest.TestCase):
+
+    def test_round_trip(self):
+        grid = [[1, 0, 2], [0, 1, 0], [0, 0, 0]]
+        for board in (TicTacToeBoard(grid, player=2), BitBoard(grid, player=2)):
+            packed, dimensions = pack(board)
+            self.assertIsInstance(packed, int)
+            copy = unpack(packed, dimensions)
+            self.assertEqual(board.board(), copy.board())
+            self.assertEqual(2, copy.player())
+        board = MNKBoard(5, 4, 3)
+        board.mark(4, 3)
+        board.mark(0, 0)
+        copy = unpack(*pack(board))
+        self.assertEqual(board.board(), copy.board())
+        self.assertEqual(board.dimensions(), copy.dimensions())
+
+class TestMatchesSingleProcess(unittest.TestCase):
+    """Does the merged result equal the single-process alpha-beta move?"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.search = ParallelSearch(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.search.close()
+
+    def test_random_positions(self):
+        rng = random.Random(3)
+        for game in range(20):
+            board = TicTacToeBoard()
+            for i in range(rng.randrange(1, 6)):
+                moves = [(r, c) for r in range(3) for c in range(3)
+                         if board.board()[r][c] == 0]
+                board.mark(*rng.choice(moves))
+                if board.winner() is not None:
+                    break
+            if board.winner() is not None:
+                continue
+            expected = GameTree().optimal_move(board.copy(), search='alphabeta')
+            self.assertEqual(expected, self.search.optimal_move(board.copy()))
+
+    def test_mnk_board(self):
+        board = MNKBoard(4, 4, 4, grid=[[1, 1, 0, 0],
+                                        [0, 0, 1, 2],
+                                        [2, 0, 0, 2],
+                                        [1, 0, 0, 2]])
+        self.assertEqual((0, 3), self.search.optimal_move(board))
+        self.assertGreater(self.search.nodes_visited(), 1)
+
+    def test_shortcut_skips_pool(self):
+        board = TicTacToeBoard([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+        self.assertEqual((0, 2), self.search.optimal_move(board))
+        self.assertEqual(0, self.search.nodes_visited())
+
+class TestWorkers(unittest.TestCase):
+
+    def test_bad_worker_count(self):
+        with self.assertRaises(ValueError):
+            ParallelSearch(workers=0)
+
+if __name__ == '__main__':
+    unittest.main()
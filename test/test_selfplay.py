@@ -0,0 +1,181 @@
+"""Tests for engines and headless self-play."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tic_tac_toe import selfplay, tablebase
+from tic_tac_toe.engines import make_engine, ENGINES
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.mnk_board import MNKBoard
+from tic_tac_toe.selfplay import play_game, run, percentile, Summary
+
+class TestEngines(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, 'tablebase.bin')
+        tablebase.write_tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_every_engine_takes_the_win(self):
+        for name in ENGINES:
+            if name == 'random':
+                continue
+            engine = make_engine(name, node_budget=200,
+                                 tablebase_path=self.path)
+            engine.new_game(0)
+            board = TicTacToeBoard([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+            self.assertEqual((0, 2), engine.move(board), name)
+            self.assertEqual(name, engine.name())
+
+    def test_random_engine_plays_blank_squares(self):
+        engine = make_engine('random')
+        engine.new_game(1)
+        board = TicTacToeBoard([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+        for i in range(20):
+            row, col = engine.move(board)
+            self.assertEqual(0, board.board()[row][col])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            make_engine('oracle')
+
+class TestPlayGame(unittest.TestCase):
+
+    def test_perfect_play_draws(self):
+        engine = make_engine('minimax')
+        record = play_game(engine, engine, seed=4)
+        self.assertEqual(3, record['winner'])
+        self.assertEqual(9, len(record['moves']))
+        self.assertEqual(len(record['moves']), len(record['ms']))
+        self.assertEqual(len(set(record['moves'])), 9)
+
+    def test_minimax_never_loses_to_random(self):
+        for record in run(20, x='random', o='alphabeta', seed=1):
+            self.assertNotEqual(1, record['winner'])
+
+class TestRun(unittest.TestCase):
+
+    def strip_times(self, records):
+        return [{key: value for key, value in record.items() if key != 'ms'}
+                for record in records]
+
+    def test_seeded_games_repeat(self):
+        first = self.strip_times(run(6, x='mcts', o='random', seed=3,
+                                     node_budget=50))
+        second = self.strip_times(run(6, x='mcts', o='random', seed=3,
+                                      node_budget=50))
+        self.assertEqual(first, second)
+        self.assertEqual(list(range(6)), [record['game'] for record in first])
+
+    def test_workers_agree(self):
+        one = self.strip_times(run(10, x='minimax', o='random', seed=5,
+                                   chunk_size=3))
+        two = self.strip_times(run(10, x='minimax', o='random', seed=5,
+                                   workers=2, chunk_size=3))
+        self.assertEqual(one, two)
+
+    def test_mnk_board(self):
+        record, = run(1, x='mcts', o='random', dimensions=(5, 5, 4),
+                      node_budget=20)
+        self.assertTrue(all(0 <= square < 25 for square in record['moves']))
+
+    def test_board_sizes_keep_separate_engines(self):
+        """After 3 x 3 games in this process, do MNK games still play the
+        moves of a fresh engine? Keys of different board sizes collide, so
+        they mustn't share a transposition table."""
+        list(run(10, x='alphabeta', o='alphabeta', seed=7))
+        # Fill the table with the whole 3 x 3 game, whose blank board's key
+        #   is also a 4 x 4 key.
+        selfplay._engine('alphabeta', {}, None)._tree._alphabeta_root(
+            TicTacToeBoard())
+        board = MNKBoard(4, 4, 3, grid=[[1, 0, 0, 0], [0, 0, 0, 0],
+                                        [0, 0, 0, 0], [0, 0, 0, 0]], player=2)
+        self.assertEqual(make_engine('alphabeta').move(board.copy()),
+                         selfplay._engine('alphabeta', {},
+                                          (4, 4, 3)).move(board.copy()))
+        for record in run(3, x='alphabeta', o='alphabeta', seed=7,
+                          dimensions=(4, 4, 3)):
+            board = MNKBoard(4, 4, 3)
+            for square in record['moves']:
+                self.assertEqual(divmod(square, 4),
+                                 make_engine('alphabeta').move(board))
+                board.mark(*divmod(square, 4))
+
+    def test_missing_tablebase(self):
+        """Is a missing tablebase file reported before any worker starts?"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'missing.bin')
+            with self.assertRaises(ValueError):
+                next(run(2, x='tablebase', o='random', workers=2,
+                         tablebase_path=path))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_tablebase_needs_3_by_3(self):
+        with self.assertRaises(ValueError):
+            next(run(1, x='tablebase', o='random', dimensions=(4, 4, 3)))
+
+    def test_stop_early(self):
+        """Can the caller stop partway through a parallel run?"""
+        records = run(40, x='random', o='random', workers=2, chunk_size=2)
+        self.assertEqual(0, next(records)['game'])
+        records.close()
+
+class TestSummary(unittest.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, percentile(values, 0.5))
+        self.assertEqual(99, percentile(values, 0.99))
+        self.assertEqual(100, percentile(values, 1.0))
+        self.assertEqual(0.0, percentile([], 0.5))
+
+    def test_report(self):
+        summary = Summary()
+        summary.add({'winner': 1, 'ms': [1.0, 3.0]})
+        summary.add({'winner': 3, 'ms': [2.0]})
+        report = summary.report()
+        self.assertEqual((2, 1, 0, 1), (report['games'], report['x_wins'],
+                                        report['o_wins'], report['draws']))
+        self.assertEqual(2.0, report['latency_ms']['p50'])
+        self.assertEqual(3.0, report['latency_ms']['max'])
+
+    def test_main_writes_records(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'games.jsonl')
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                selfplay.main(['--games', '3', '--x', 'random', '--o',
+                               'random', '--output', path])
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(3, len(records))
+            self.assertIn('games/sec', output.getvalue())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_main_writes_missing_tablebase(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'tablebase.bin')
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                selfplay.main(['--games', '2', '--x', 'tablebase', '--o',
+                               'random', '--tablebase', path])
+            self.assertTrue(os.path.exists(path))
+            self.assertIn('Writing tablebase', output.getvalue())
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for GameSession, the interface-agnostic game core."""
+
+import unittest
+
+from tic_tac_toe.session import GameSession, Event, TURN, MOVED, INVALID, OVER
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.engines import make_engine
+from tic_tac_toe.game import Player
+
+class ScriptedEngine:
+    """Engine that plays a fixed list of moves."""
+
+    def __init__(self, moves):
+        self.moves = list(moves)
+
+    def move(self, board):
+        return self.moves.pop(0)
+
+class TestHumanMoves(unittest.TestCase):
+
+    def setUp(self):
+        self.x = Player(human=True, marker=1, mover=True)
+        self.o = Player(human=True, marker=2, mover=False)
+        self.session = GameSession(self.x, self.o)
+
+    def test_start(self):
+        self.assertEqual([Event(TURN, mark=1)], self.session.start())
+        self.assertTrue(self.session.needs_input())
+
+    def test_play(self):
+        events = self.session.play(1, 1)
+        self.assertEqual([Event(MOVED, mark=1, move=(1, 1)),
+                          Event(TURN, mark=2)], events)
+        self.assertIs(self.o, self.session.mover())
+        self.assertTrue(self.o.is_turn())
+        self.assertFalse(self.x.is_turn())
+
+    def test_invalid_moves_change_nothing(self):
+        self.session.play(1, 1)
+        for row, col in ((1, 1), (3, 0)):
+            events = self.session.play(row, col)
+            self.assertEqual(1, len(events))
+            self.assertEqual(INVALID, events[0].kind)
+            self.assertEqual((row, col), events[0].move)
+        self.assertIs(self.o, self.session.mover())
+
+    def test_win(self):
+        for move in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            self.session.play(*move)
+        events = self.session.play(0, 2)
+        self.assertEqual(Event(OVER, winner=1), events[-1])
+        self.assertTrue(self.session.is_over())
+        self.assertFalse(self.session.needs_input())
+        self.assertEqual(INVALID, self.session.play(2, 2)[0].kind)
+
+    def test_step_does_nothing_on_human_turn(self):
+        self.assertEqual([], self.session.step())
+
+class TestComputerMoves(unittest.TestCase):
+
+    def test_human_v_computer(self):
+        human = Player(human=True, marker=1, mover=True)
+        computer = Player(human=False, marker=2, mover=False)
+        session = GameSession(human, computer,
+                              engine=ScriptedEngine([(0, 1)]))
+        session.play(0, 0)
+        self.assertFalse(session.needs_input())
+        self.assertEqual(INVALID, session.play(2, 2)[0].kind)
+        events = session.step()
+        self.assertEqual(Event(MOVED, mark=2, move=(0, 1)), events[0])
+        self.assertTrue(session.needs_input())
+
+    def test_computer_v_computer_draws(self):
+        session = GameSession(Player(human=False, marker=1, mover=True),
+                              Player(human=False, marker=2, mover=False),
+                              engine=make_engine('minimax'))
+        moves = 0
+        while not session.is_over():
+            moves += sum(event.kind == MOVED for event in session.step())
+        self.assertEqual(9, moves)
+        self.assertEqual(3, session.winner())
+
+    def test_o_moves_first(self):
+        first = Player(human=True, marker=2, mover=True)
+        second = Player(human=True, marker=1, mover=False)
+        session = GameSession(first, second)
+        self.assertEqual([Event(TURN, mark=2)], session.start())
+        self.assertEqual(2, session.play(1, 1)[0].mark)
+
+    def test_missing_engine(self):
+        session = GameSession(Player(human=False), Player(human=False, marker=2))
+        with self.assertRaises(ValueError):
+            session.step()
+
+class TestManySessions(unittest.TestCase):
+
+    def test_interleaved(self):
+        """Sessions share an engine and advance independently."""
+        engine = make_engine('alphabeta')
+        sessions = [GameSession(Player(human=False, marker=1, mover=True),
+                                Player(human=True, marker=2, mover=False),
+                                engine=engine)
+                    for i in range(50)]
+        for session in sessions:
+            session.step()
+        for i, session in enumerate(sessions):
+            blank = [(row, col) for row in range(3) for col in range(3)
+                     if session.board().board()[row][col] == 0]
+            session.play(*blank[i % len(blank)])
+        for session in sessions:
+            self.assertEqual(MOVED, session.step()[0].kind)
+            self.assertEqual(3, sum(mark != 0 for row in session.board().board()
+                                    for mark in row))
+
+if __name__ == '__main__':
+    unittest.main()
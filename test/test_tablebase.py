@@ -0,0 +1,114 @@
+"""Tests for building, loading and querying the tablebase file."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tic_tac_toe import tablebase
+from tic_tac_toe.tablebase import Tablebase, HEADER
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.mnk_board import MNKBoard
+from tic_tac_toe.game_tree import GameTree
+
+class TestTablebase(unittest.TestCase):
+    """Build one tablebase file for the whole test case and query it."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, 'tablebase.bin')
+        cls.count = tablebase.write_tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_counts_reachable_positions(self):
+        """4520 in-progress positions are reachable with X moving first, and
+        as many again with O moving first."""
+        self.assertEqual(2 * 4520, self.count)
+
+    def test_lookup_agrees_with_search(self):
+        grids = [
+            [[1, 2, 1], [0, 2, 2], [0, 1, 0]],
+            [[0, 2, 1], [0, 2, 2], [0, 1, 1]],
+            [[1, 0, 0], [0, 2, 0], [0, 0, 0]],
+        ]
+        with Tablebase(self.path) as table:
+            for grid in grids:
+                board = TicTacToeBoard(grid)
+                move, score = table.lookup(board)
+                self.assertEqual(GameTree().optimal_move(board), move)
+
+    def test_gameover_board_has_no_entry(self):
+        with Tablebase(self.path) as table:
+            board = TicTacToeBoard([[1, 2, 0], [0, 1, 0], [0, 2, 1]])
+            self.assertIsNone(table.lookup(board))
+
+    def test_game_tree_uses_tablebase(self):
+        """Does optimal_move() answer from the tablebase without
+        searching?"""
+        with Tablebase(self.path) as table:
+            tree = GameTree(tablebase=table)
+            move = tree.optimal_move(TicTacToeBoard([[1, 2, 1],
+                                                     [0, 2, 2],
+                                                     [0, 1, 0]]))
+            self.assertEqual((1, 0), move)
+            self.assertEqual(0, tree.nodes_visited())
+            self.assertTrue(tree.is_empty())
+
+    def test_other_board_sizes_have_no_entry(self):
+        """Only 3 x 3 boards are in the file; a larger MNKBoard's key would
+        index an unrelated record or read past the end."""
+        with Tablebase(self.path) as table:
+            self.assertIsNone(table.lookup(MNKBoard(4, 4, 3)))
+            board = MNKBoard(5, 5, 4)
+            board.mark(4, 4)
+            self.assertIsNone(table.lookup(board))
+            board = MNKBoard(3, 3, 3)
+            board.mark(0, 0)
+            self.assertEqual(table.lookup(TicTacToeBoard([[1, 0, 0],
+                                                          [0, 0, 0],
+                                                          [0, 0, 0]],
+                                                         player=2)),
+                             table.lookup(board))
+
+    def test_game_tree_searches_other_board_sizes(self):
+        """A tree with a tablebase still searches boards that aren't
+        3 x 3."""
+        with Tablebase(self.path) as table:
+            board = MNKBoard(4, 4, 3)
+            for move in ((0, 0), (3, 3), (0, 1)):
+                board.mark(*move)
+            move = GameTree(tablebase=table).optimal_move(board,
+                                                          search='alphabeta')
+            self.assertEqual((0, 2), move)
+
+    def corrupt_copy(self, offset, value):
+        """Return path to a copy of the tablebase with one byte changed."""
+        path = os.path.join(self.directory, 'corrupt.bin')
+        with open(self.path, 'rb') as f:
+            data = bytearray(f.read())
+        data[offset] = value
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_checksum_mismatch(self):
+        path = self.corrupt_copy(HEADER.size + 1234, 0x7F)
+        with self.assertRaises(ValueError):
+            Tablebase(path)
+
+    def test_wrong_version(self):
+        path = self.corrupt_copy(4, tablebase.VERSION + 1)
+        with self.assertRaises(ValueError):
+            Tablebase(path)
+
+    def test_wrong_magic(self):
+        path = self.corrupt_copy(0, ord('X'))
+        with self.assertRaises(ValueError):
+            Tablebase(path)
+
+if __name__ == '__main__':
+    unittest.main()
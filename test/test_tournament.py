@@ -0,0 +1,111 @@
+"""Tests for the round-robin engine tournament."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tic_tac_toe import selfplay, tournament
+from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.engines import make_engine
+from tic_tac_toe.mnk_board import MNKBoard
+from tic_tac_toe.tournament import pairings, run_tournament
+
+class TestPairings(unittest.TestCase):
+
+    def test_both_colors(self):
+        self.assertEqual([('a', 'b'), ('a', 'c'), ('b', 'a'), ('b', 'c'),
+                          ('c', 'a'), ('c', 'b')], pairings(['a', 'b', 'c']))
+
+class TestRunTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.engines = ['alphabeta', 'random', 'mcts']
+
+    def results(self, **arguments):
+        return run_tournament(self.engines, games=3, seed=2, node_budget=100,
+                              **arguments)
+
+    def test_totals(self):
+        results = self.results()
+        self.assertEqual(18, results['games'])
+        for name, standing in results['engines'].items():
+            self.assertEqual(12, standing['games'])
+            self.assertEqual(standing['games'], standing['wins'] +
+                             standing['draws'] + standing['losses'])
+            self.assertGreater(standing['moves'], 0)
+        wins = sum(standing['wins'] for standing in results['engines'].values())
+        losses = sum(standing['losses']
+                     for standing in results['engines'].values())
+        self.assertEqual(wins, losses)
+        self.assertEqual(0, results['engines']['alphabeta']['losses'])
+
+    def test_workers_agree(self):
+        """Every game has its own seed, so results don't depend on which
+        worker plays it."""
+        one = self.results(chunk_size=2)
+        two = self.results(workers=2, chunk_size=2)
+        self.assertEqual(one['pairings'], two['pairings'])
+
+    def test_bad_entries(self):
+        for engines in (['random'], ['random', 'random'], ['random', 'oracle']):
+            with self.assertRaises(ValueError):
+                run_tournament(engines)
+
+    def test_mnk_board_after_3_by_3(self):
+        """Does a tournament on an MNK board play as it would in a fresh
+        process after 3 x 3 games here? Their transposition table keys
+        collide, so the two sizes mustn't share engines."""
+        selfplay._worker_engines.clear()
+        fresh = run_tournament(['alphabeta', 'random'], games=3, seed=3,
+                               dimensions=(4, 4, 3))
+        selfplay._worker_engines.clear()
+        run_tournament(['alphabeta', 'random'], games=3, seed=3)
+        # As after a long run: the whole 3 x 3 game in the table
+        selfplay._engine('alphabeta', {}, None)._tree._alphabeta_root(
+            TicTacToeBoard())
+        after = run_tournament(['alphabeta', 'random'], games=3, seed=3,
+                               dimensions=(4, 4, 3))
+        self.assertEqual(fresh['pairings'], after['pairings'])
+        board = MNKBoard(4, 4, 3, grid=[[1, 0, 0, 0], [0, 0, 0, 0],
+                                        [0, 0, 0, 0], [0, 0, 0, 0]], player=2)
+        self.assertEqual(make_engine('alphabeta').move(board.copy()),
+                         selfplay._engine('alphabeta', {},
+                                          (4, 4, 3)).move(board.copy()))
+
+    def test_missing_tablebase(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with self.assertRaises(ValueError):
+                run_tournament(['tablebase', 'random'], workers=2,
+                               tablebase_path=os.path.join(directory,
+                                                           'missing.bin'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_tablebase_needs_3_by_3(self):
+        with self.assertRaises(ValueError):
+            run_tournament(['tablebase', 'random'], dimensions=(4, 4, 3))
+
+class TestMain(unittest.TestCase):
+
+    def test_results_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'results.json')
+            with contextlib.redirect_stdout(io.StringIO()):
+                tournament.main(['--engines', 'random', 'alphabeta',
+                                 '--games', '2', '--workers', '1',
+                                 '--output', path])
+            with open(path) as f:
+                results = json.load(f)
+            self.assertEqual({'random', 'alphabeta'}, set(results['engines']))
+            self.assertEqual(2, len(results['pairings']))
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for TranspositionTable and GameTree's use of it."""
+
+import unittest
+
+from tic_tac_toe.transposition import TranspositionTable, EXACT, LOWER
+from tic_tac_toe.game_tree import GameTree
+from tic_tac_toe.board import TicTacToeBoard
+
+class TestTable(unittest.TestCase):
+    """Tests for storing, looking up and evicting entries."""
+
+    def test_store_and_get(self):
+        table = TranspositionTable()
+        table.store(5, 1)
+        table.store(6, -1, LOWER)
+        self.assertEqual((1, EXACT), table.get(5))
+        self.assertEqual((-1, LOWER), table.get(6))
+        self.assertIsNone(table.get(7))
+        self.assertEqual(2, table.stats()['hits'])
+        self.assertEqual(1, table.stats()['misses'])
+
+    def test_lru_eviction(self):
+        """Does the LRU policy keep an entry that was looked up recently?"""
+        table = TranspositionTable(max_size=2, policy='lru')
+        table.store(1, 0)
+        table.store(2, 0)
+        table.get(1)
+        table.store(3, 0)
+        self.assertIn(1, table)
+        self.assertNotIn(2, table)
+        self.assertEqual(1, table.stats()['evictions'])
+
+    def test_fifo_eviction(self):
+        """Does the FIFO policy evict the oldest entry regardless of
+        lookups?"""
+        table = TranspositionTable(max_size=2, policy='fifo')
+        table.store(1, 0)
+        table.store(2, 0)
+        table.get(1)
+        table.store(3, 0)
+        self.assertNotIn(1, table)
+        self.assertEqual(2, len(table))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(policy='random')
+        with self.assertRaises(ValueError):
+            TranspositionTable(max_size=0)
+
+class TestGameTreeUsesTable(unittest.TestCase):
+    """Does GameTree skip positions its table has already scored?"""
+
+    def setUp(self):
+        self.grid = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+
+    def test_shared_table_avoids_expansion(self):
+        for search in ('minimax', 'alphabeta'):
+            table = TranspositionTable()
+            first = GameTree(table)
+            move = first.optimal_move(TicTacToeBoard(self.grid), search=search)
+            second = GameTree(table)
+            self.assertEqual(move, second.optimal_move(
+                TicTacToeBoard(self.grid), search=search))
+            self.assertGreater(table.stats()['hits'], 0)
+            self.assertLess(second.nodes_visited(), first.nodes_visited())
+
+    def test_full_tree_expands_each_position_once(self):
+        """Is every non-gameover position below the root, counting all its
+        rotations and reflections as one, expanded at most once?"""
+        tree = GameTree()
+        tree.optimal_move(TicTacToeBoard(self.grid))
+        expanded = set()
+        for position in tree.positions():
+            if not tree.is_leaf(position):
+                key = position.element().canonical_key()
+                self.assertNotIn(key, expanded)
+                expanded.add(key)
+
+    def test_capped_table_still_correct(self):
+        table = TranspositionTable(max_size=10)
+        expected = GameTree().optimal_move(TicTacToeBoard(self.grid),
+                                           search='alphabeta')
+        move = GameTree(table).optimal_move(TicTacToeBoard(self.grid),
+                                            search='alphabeta')
+        self.assertEqual(expected, move)
+        self.assertLessEqual(len(table), 10)
+
+if __name__ == '__main__':
+    unittest.main()
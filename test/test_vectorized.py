@@ -0,0 +1,48 @@
+"""Tests for NumPy winner detection. Skipped if NumPy isn't installed."""
+
+import itertools
+import unittest
+
+from tic_tac_toe import vectorized
+from tic_tac_toe.vectorized import winners, IN_PROGRESS
+from tic_tac_toe.board import TicTacToeBoard
+
+np = vectorized.np
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestWinners(unittest.TestCase):
+    """Does winners() agree with TicTacToeBoard.winner() on every grid of
+    0s, 1s and 2s, legal or not?"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.grids = [list(marks) for marks in itertools.product(range(3),
+                                                                repeat=9)]
+        cls.expected = []
+        for marks in cls.grids:
+            board = TicTacToeBoard([marks[0:3], marks[3:6], marks[6:9]])
+            winner = board.winner()
+            cls.expected.append(IN_PROGRESS if winner is None else winner)
+
+    def test_grids(self):
+        self.assertEqual(self.expected, winners(np.array(self.grids)).tolist())
+
+    def test_three_by_three_grids(self):
+        grids = np.array(self.grids).reshape(-1, 3, 3)
+        self.assertEqual(self.expected, winners(grids).tolist())
+
+    def test_packed(self):
+        packed = [TicTacToeBoard([marks[0:3], marks[3:6],
+                                  marks[6:9]]).packed()
+                  for marks in self.grids]
+        self.assertEqual(self.expected, winners(np.array(packed)).tolist())
+
+@unittest.skipIf(np is not None, 'numpy is installed')
+class TestWithoutNumpy(unittest.TestCase):
+
+    def test_import_error(self):
+        with self.assertRaises(ImportError):
+            winners([[0] * 9])
+
+if __name__ == '__main__':
+    unittest.main()
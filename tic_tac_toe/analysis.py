@@ -0,0 +1,133 @@
+"""
+Batch analysis of many positions: analyze() streams back the best move and
+exact score of each position in an iterable, searching them with alpha-beta
+on one core or across a process pool.
+
+Positions searched in the same process share one size-capped transposition
+table, so positions from the same game, or symmetric to each other, reuse
+each other's work while memory stays bounded however many are analyzed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+
+try:
+    from tic_tac_toe.board import transform_move, inverse_transform
+    from tic_tac_toe.game_tree import GameTree
+    from tic_tac_toe.mnk_board import MNKBoard
+    from tic_tac_toe.parallel import unpack
+    from tic_tac_toe.transposition import TranspositionTable
+except:
+    from board import transform_move, inverse_transform
+    from game_tree import GameTree
+    from mnk_board import MNKBoard
+    from parallel import unpack
+    from transposition import TranspositionTable
+
+DEFAULT_TABLE_SIZE = 200000 # entries in each process's transposition table
+DEFAULT_CHUNK_SIZE = 64 # positions sent to a worker at a time
+
+_worker_tree = None # GameTree in each worker process, set by _start_worker
+
+def to_packed(position, dimensions=None):
+    """Return position as a packed int.
+
+    Args:
+        position: a packed int, as from board.packed(), or a grid (list of
+            rows of 0 / 1 / 2 marks). A grid's player to move is X if both
+            players have as many marks, else O.
+        dimensions (tuple): (m, n, k) for MNKBoard positions, or None for
+            3 x 3 tic tac toe.
+
+    Returns:
+        (int): packed boardstate.
+    """
+    if isinstance(position, int):
+        return position
+    x = sum(row.count(1) for row in position)
+    o = sum(row.count(2) for row in position)
+    player = 1 if x == o else 2
+    m, n, k = dimensions if dimensions is not None else (3, 3, 3)
+    # 3 x 3 MNKBoards and BitBoards pack the same way
+    return MNKBoard(m, n, k, grid=position, player=player).packed()
+
+def analyze_packed(tree, packed, dimensions=None):
+    """Return (best_move, score) for the packed position, searched with
+    tree's alpha-beta on its canonical variant: the move
+    GameTree.optimal_move(board, search='alphabeta') plays, found without
+    its shortcuts, and its score from the mover's point of view. (None, None)
+    if the game is over."""
+    canonical, transform = unpack(packed, dimensions).canonical()
+    move, score = tree._alphabeta_root(canonical)
+    if move is None:
+        return None, None
+    return transform_move(move, inverse_transform(transform)), score
+
+def _start_worker(table_size):
+    """Pool initializer: give the worker process its own GameTree."""
+    global _worker_tree
+    _worker_tree = GameTree(table=TranspositionTable(table_size))
+
+def _analyze_chunk(packed_positions, dimensions):
+    """Worker task: return a list of analyze_packed() results."""
+    return [analyze_packed(_worker_tree, packed, dimensions)
+            for packed in packed_positions]
+
+def analyze(positions, dimensions=None, workers=1,
+            table_size=DEFAULT_TABLE_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate (position, best_move, score) for each position, in input order.
+
+    best_move is a (row, column) tuple and score is from the point of view
+    of the player to move, as for Position.score(); both are None for a
+    position where the game is over.
+
+    Args:
+        positions (iterable): packed ints or grids (see to_packed()). Read
+            lazily, so it can be a generator over a log of any size.
+        dimensions (tuple): (m, n, k) if the positions are MNKBoards, None
+            for 3 x 3 tic tac toe.
+        workers (int): processes to search in. 1 searches in this process.
+        table_size (int): cap on each process's transposition table.
+        chunk_size (int): positions per task sent to a worker.
+
+    Yields:
+        (tuple): (position, best_move, score), position being the input item
+            unchanged.
+    """
+    if workers < 1 or chunk_size < 1:
+        raise ValueError('workers and chunk_size must be positive')
+    positions = iter(positions)
+    if workers == 1:
+        tree = GameTree(table=TranspositionTable(table_size))
+        for position in positions:
+            yield (position,) + analyze_packed(
+                tree, to_packed(position, dimensions), dimensions)
+        return
+    executor = ProcessPoolExecutor(workers, initializer=_start_worker,
+                                   initargs=(table_size,))
+    # At most two chunks per worker in flight, so memory doesn't grow with
+    #   the number of positions; chunks are yielded in order.
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(positions, chunk_size))
+                if not chunk:
+                    break
+                future = executor.submit(
+                    _analyze_chunk,
+                    [to_packed(position, dimensions) for position in chunk],
+                    dimensions)
+                pending.append((chunk, future))
+            if not pending:
+                return
+            chunk, future = pending.popleft()
+            for position, (move, score) in zip(chunk, future.result()):
+                yield position, move, score
+    finally: # also runs if the caller stops iterating early
+        # shutdown(cancel_futures=True) needs Python 3.9, so cancel by hand.
+        for chunk, future in pending:
+            future.cancel()
+        executor.shutdown()
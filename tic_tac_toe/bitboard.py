@@ -0,0 +1,198 @@
+"""
+BitBoard class, an alternative to TicTacToeBoard that packs each player's
+marks into the low 9 bits of an int instead of a 3 x 3 nested list.
+"""
+
+try:
+    from tic_tac_toe.board import TicTacToeBoard, canonicalize
+except:
+    from board import TicTacToeBoard, canonicalize
+
+# Square (row, col) is stored at bit 3 * row + col, so bit 0 is the top left
+#   corner and bit 8 the bottom right.
+FULL_MASK = 0b111111111
+
+WIN_MASKS = (
+    0b000000111, # row 0
+    0b000111000, # row 1
+    0b111000000, # row 2
+    0b001001001, # column 0
+    0b010010010, # column 1
+    0b100100100, # column 2
+    0b100010001, # diagonal
+    0b001010100, # rev diag
+)
+
+def winner_of(packed):
+    """Return what BitBoard.winner() would return for the packed boardstate,
+    without building a BitBoard: 1 or 2 for a win, 3 for a draw, else None."""
+    x = packed & FULL_MASK
+    o = (packed >> 9) & FULL_MASK
+    for mask in WIN_MASKS:
+        if x & mask == mask:
+            return 1
+    for mask in WIN_MASKS:
+        if o & mask == mask:
+            return 2
+    if x | o == FULL_MASK:
+        return 3
+    return None
+
+def winning_square_of(packed):
+    """Return the lowest square index (3 * row + col) where the player to
+    move in the packed boardstate would complete three in a row, or None if
+    there's none or the game is already over."""
+    if winner_of(packed) is not None:
+        return None
+    x = packed & FULL_MASK
+    o = (packed >> 9) & FULL_MASK
+    mine, theirs = (o, x) if packed >> 18 & 1 else (x, o)
+    squares = 0
+    for mask in WIN_MASKS:
+        if not theirs & mask and bin(mine & mask).count('1') == 2:
+            squares |= mask & ~mine # the blank third square
+    if not squares:
+        return None
+    return (squares & -squares).bit_length() - 1 # lowest set bit
+
+class BitBoard:
+    """Tic Tac Toe board storing X's and O's marks as two 9-bit ints.
+
+    Public methods follow the same contracts as TicTacToeBoard's, so a BitBoard
+    can be used anywhere a TicTacToeBoard is expected. Copying one costs two int
+    copies rather than a copy of nested lists, and checking for a win is a
+    handful of mask ANDs.
+    """
+
+    __slots__ = '_x', '_o', '_player'
+
+    def __init__(self, grid=None, player=1):
+        """
+        Args:
+            grid (list): Optional 3 x 3 array of integers 0, 1, or 2 to start
+                from, in the same format TicTacToeBoard accepts.
+            player (int): 1 if X is to move, 2 if O.
+        """
+        self._x = 0
+        self._o = 0
+        if grid is not None:
+            for row in range(3):
+                for col in range(3):
+                    if grid[row][col] == 1:
+                        self._x |= 1 << (3 * row + col)
+                    elif grid[row][col] == 2:
+                        self._o |= 1 << (3 * row + col)
+        self._player = player
+
+    @classmethod
+    def from_packed(cls, packed):
+        """Return a new BitBoard from an int produced by BitBoard.packed().
+
+        Args:
+            packed (int): 19-bit int encoding both players' marks and the mover.
+
+        Returns:
+            (BitBoard): new board object.
+        """
+        board = cls.__new__(cls)
+        board._x = packed & FULL_MASK
+        board._o = (packed >> 9) & FULL_MASK
+        board._player = ((packed >> 18) & 1) + 1
+        return board
+
+    def packed(self) -> int:
+        """Return the whole boardstate as a single int: X's bits in bits 0-8,
+        O's bits in bits 9-17, and bit 18 set if O is to move."""
+        return self._x | (self._o << 9) | ((self._player - 1) << 18)
+
+    def canonical_key(self) -> int:
+        """Return the packed key of this board's canonical symmetric variant.
+        See TicTacToeBoard.canonical_key()."""
+        return canonicalize(self.packed())[0]
+
+    def canonical(self):
+        """Return (BitBoard, transform) for this board's canonical variant.
+        See TicTacToeBoard.canonical()."""
+        key, transform = canonicalize(self.packed())
+        return BitBoard.from_packed(key), transform
+
+    def copy(self):
+        """Return a new, independent BitBoard with the same boardstate."""
+        board = BitBoard.__new__(BitBoard)
+        board._x = self._x
+        board._o = self._o
+        board._player = self._player
+        return board
+
+    def mark(self, row: int, col: int) -> None:
+        """Put the current player's mark at position (row, col) and swap the
+        active player."""
+        if not (0 <= row <= 2 and 0 <= col <= 2):
+            raise ValueError('Invalid board position')
+        bit = 1 << (3 * row + col)
+        if (self._x | self._o) & bit:
+            raise ValueError('Board position occupied')
+        if self.winner() is not None:
+            raise ValueError('Game is already complete')
+        if self._player == 1:
+            self._x |= bit
+            self._player = 2
+        else:
+            self._o |= bit
+            self._player = 1
+
+    def _is_win(self, mark):
+        """Return True if the player with the given mark (1 or 2) has three in
+        a row."""
+        bits = self._x if mark == 1 else self._o
+        for mask in WIN_MASKS:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def winning_move(self):
+        """Return the (row, col) square where the player to move would
+        complete three in a row, the first in row-major order if there are
+        several, or None if there's no such square or the game is over."""
+        square = winning_square_of(self.packed())
+        return None if square is None else divmod(square, 3)
+
+    def line_counts(self):
+        """Return a list of (X's marks, O's marks) on each line in
+        WIN_MASKS."""
+        return [(bin(self._x & mask).count('1'), bin(self._o & mask).count('1'))
+                for mask in WIN_MASKS]
+
+    def winner(self):
+        """Return mark of winning player, 3 to indicate a tie, None to if
+        game in progress."""
+        for mark in (1, 2):
+            if self._is_win(mark):
+                return mark
+        if self._x | self._o == FULL_MASK:
+            return 3
+        return None
+
+    def board(self) -> list:
+        """Return the current board state as a new 3 x 3 array in 0 / 1 / 2
+        notation. Changes to the returned list don't affect the board."""
+        grid = [[0] * 3 for j in range(3)]
+        for square in range(9):
+            bit = 1 << square
+            if self._x & bit:
+                grid[square // 3][square % 3] = 1
+            elif self._o & bit:
+                grid[square // 3][square % 3] = 2
+        return grid
+
+    def player(self):
+        """Return 1 if it's X's turn to move, 2 if O's."""
+        return self._player
+
+    def opponent(self):
+        """Return 1 if non-mover player is 'X', 2 if 'O'."""
+        return 2 if self._player == 1 else 1
+
+    def __str__(self):
+        """Return string representation of the board in its current state."""
+        return str(TicTacToeBoard(self.board(), self._player))
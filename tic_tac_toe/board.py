@@ -1,3 +1,121 @@
+# The 8 ways to get three in a row--3 rows, 3 columns, 2 diagonals--as
+#   tuples of (row, col) squares.
+LINES = (
+    ((0, 0), (0, 1), (0, 2)),   # row 0
+    ((1, 0), (1, 1), (1, 2)),   # row 1
+    ((2, 0), (2, 1), (2, 2)),   # row 2
+    ((0, 0), (1, 0), (2, 0)),   # column 0
+    ((0, 1), (1, 1), (2, 1)),   # column 1
+    ((0, 2), (1, 2), (2, 2)),   # column 2
+    ((0, 0), (1, 1), (2, 2)),   # diagonal
+    ((0, 2), (1, 1), (2, 0)),   # rev diag
+)
+
+# Scores encode how far away the result is: a win d moves below the position
+#   being scored is worth WIN_SCORE - d to the winner and -(WIN_SCORE - d) to
+#   the loser, so the fastest win and the slowest loss score best. The win
+#   score has to exceed the deepest search, which is the number of squares,
+#   so that any win still outscores a draw (0). WIN_SCORE is the win score
+#   for boards up to 49 squares, including every 3 x 3 board, and is small
+#   enough to fit the tablebase's signed byte; bigger MNKBoards use
+#   win_score().
+WIN_SCORE = 100
+
+def win_score(squares):
+    """Return the score of a win on the spot on a board of squares squares:
+    WIN_SCORE, or 2 * squares + 2 if that's more, so a win as deep as the
+    board allows still scores more than squares."""
+    return max(WIN_SCORE, 2 * squares + 2)
+
+def shift_score(score, plies):
+    """Return score as seen from plies moves further away from the result:
+    a win or loss's magnitude grows by plies (shrinks if plies is negative),
+    a draw stays 0."""
+    if score > 0:
+        return score + plies
+    if score < 0:
+        return score - plies
+    return 0
+
+# LINES_THROUGH[row][col] holds the indexes into LINES of every line passing
+#   through that square: 3 for a corner, 2 for an edge, 4 for the center.
+LINES_THROUGH = tuple(
+    tuple(tuple(i for i, line in enumerate(LINES) if (row, col) in line)
+          for col in range(3))
+    for row in range(3))
+
+# The 8 symmetries of the board: clockwise rotations by 0, 90, 180 and 270
+#   degrees, then the same four applied after a left-right flip. Each maps a
+#   (row, col) square to the square it moves to.
+_SYMMETRIES = (
+    lambda r, c: (r, c),            # identity
+    lambda r, c: (c, 2 - r),        # rotate 90
+    lambda r, c: (2 - r, 2 - c),    # rotate 180
+    lambda r, c: (2 - c, r),        # rotate 270
+    lambda r, c: (r, 2 - c),        # flip
+    lambda r, c: (2 - c, 2 - r),    # flip, rotate 90
+    lambda r, c: (2 - r, c),        # flip, rotate 180
+    lambda r, c: (c, r),            # flip, rotate 270
+)
+
+# SQUARE_MAPS[t][square] is where transform t sends square (3 * row + col).
+SQUARE_MAPS = tuple(
+    tuple(3 * f(square // 3, square % 3)[0] + f(square // 3, square % 3)[1]
+          for square in range(9))
+    for f in _SYMMETRIES)
+
+# INVERSE_TRANSFORMS[t] is the transform that undoes transform t.
+INVERSE_TRANSFORMS = tuple(
+    next(u for u in range(8)
+         if all(SQUARE_MAPS[u][SQUARE_MAPS[t][square]] == square
+                for square in range(9)))
+    for t in range(8))
+
+# SYMMETRY_TABLES[t][bits] applies transform t to one player's 9 bits of a
+#   packed board, so transforming a whole board is two lookups.
+SYMMETRY_TABLES = tuple(
+    tuple(sum(1 << SQUARE_MAPS[t][square]
+              for square in range(9) if bits >> square & 1)
+          for bits in range(512))
+    for t in range(8))
+
+def canonicalize(key):
+    """Return the canonical representative of a packed board (see
+    TicTacToeBoard.packed()) among its 8 symmetric variants, and the transform
+    that produces it.
+
+    Args:
+        key (int): packed boardstate.
+
+    Returns:
+        (tuple): (canonical_key, transform) where canonical_key is the smallest
+            packed key of the 8 variants and transform the index of the
+            symmetry that maps key onto it.
+    """
+    x = key & 511
+    o = (key >> 9) & 511
+    rest = key & ~0x3FFFF # the player-to-move bit
+    best_key = key
+    best_transform = 0
+    for transform in range(1, 8):
+        table = SYMMETRY_TABLES[transform]
+        variant = table[x] | (table[o] << 9) | rest
+        if variant < best_key:
+            best_key = variant
+            best_transform = transform
+    return best_key, best_transform
+
+def transform_move(move, transform):
+    """Return where transform sends the (row, col) square move."""
+    if transform == 0: # the identity, the only transform for other board sizes
+        return move
+    square = SQUARE_MAPS[transform][3 * move[0] + move[1]]
+    return (square // 3, square % 3)
+
+def inverse_transform(transform):
+    """Return the transform that undoes transform."""
+    return INVERSE_TRANSFORMS[transform]
+
 class TicTacToeBoard:
     """Management of a Tic Tac Toe game (doesn't have a computer-player that
     does strategy against a human player).
@@ -22,19 +140,129 @@ class TicTacToeBoard:
         self._player = player
         # todo validate that player is either 1 or 2, fail immediately if player is e.g. 7
 
+    # The grid is read through a property so that assigning a whole new grid
+    #   (as the unit tests do to set up boardstates) throws away the
+    #   incremental line counts. Marks must go through mark() to keep the
+    #   counts in sync; editing the list returned by board() won't.
+
+    @property
+    def _grid(self):
+        return self._cells
+
+    @_grid.setter
+    def _grid(self, grid):
+        self._cells = grid
+        self._line_counts = None # recounted lazily by _count_lines()
+
+    def _count_lines(self):
+        """Rebuild the incremental win-detection state from scratch by scanning
+        the grid once.
+
+        _line_counts[mark][i] is the number of mark's marks on LINES[i], _empty
+        is the number of blank squares, and _winner caches what winner()
+        returns.
+        """
+        counts = [None, [0] * len(LINES), [0] * len(LINES)]
+        empty = 0
+        for row in range(3):
+            for col in range(3):
+                mark = self._cells[row][col]
+                if mark == 0:
+                    empty += 1
+                else:
+                    for line in LINES_THROUGH[row][col]:
+                        counts[mark][line] += 1
+        self._line_counts = counts
+        self._empty = empty
+        if 3 in counts[1]:
+            self._winner = 1
+        elif 3 in counts[2]:
+            self._winner = 2
+        elif empty == 0:
+            self._winner = 3
+        else:
+            self._winner = None
+
+    def copy(self):
+        """Return a new TicTacToeBoard with its own copy of this board's grid
+        and the same active player."""
+        board = TicTacToeBoard(grid=[row[:] for row in self._cells],
+                               player=self._player)
+        if self._line_counts is not None: # carry the counts over, no rescan
+            board._line_counts = [None, self._line_counts[1][:],
+                                  self._line_counts[2][:]]
+            board._empty = self._empty
+            board._winner = self._winner
+        return board
+
+    def packed(self) -> int:
+        """Return the whole boardstate as a single int, laid out the same way
+        as BitBoard.packed() so the two board classes share keys: X's marks in
+        bits 0-8, O's in bits 9-17 (square (row, col) at bit 3 * row + col),
+        and bit 18 set if O is to move."""
+        key = 0
+        bit = 1
+        for row in self._cells:
+            for mark in row:
+                if mark == 1:
+                    key |= bit
+                elif mark == 2:
+                    key |= bit << 9
+                bit <<= 1
+        return key | ((self._player - 1) << 18)
+
+    @classmethod
+    def from_packed(cls, key):
+        """Return a new TicTacToeBoard from an int produced by packed()."""
+        grid = [[0] * 3 for j in range(3)]
+        for square in range(9):
+            if key >> square & 1:
+                grid[square // 3][square % 3] = 1
+            elif key >> (square + 9) & 1:
+                grid[square // 3][square % 3] = 2
+        return cls(grid=grid, player=((key >> 18) & 1) + 1)
+
+    def canonical_key(self) -> int:
+        """Return the packed key of this board's canonical symmetric variant,
+        shared by all 8 rotations and reflections of the board."""
+        return canonicalize(self.packed())[0]
+
+    def canonical(self):
+        """Return the canonical variant of this board among its 8 rotations
+        and reflections, and the transform that maps this board onto it.
+
+        A move (row, col) on the canonical board corresponds to
+        transform_move((row, col), inverse_transform(transform)) on this one.
+
+        Returns:
+            (tuple): (TicTacToeBoard, int) new canonical board, transform.
+        """
+        key, transform = canonicalize(self.packed())
+        return type(self).from_packed(key), transform
+
     def mark(self, row: int, col: int) -> None:
         """Put set value to 1 or 2 at position (row, col) for next player's turn.
 
+        Updates the line counts for only the 2 to 4 lines through that square.
         """
         # todo support callers passing a tuple
         if not (0 <= row <= 2 and 0 <= col <= 2):
             raise ValueError('Invalid board position')
-        if self._grid[row][col] != 0: # if there's already a mark at that square
+        if self._cells[row][col] != 0: # if there's already a mark at that square
             raise ValueError('Board position occupied')
         if self.winner() is not None:
             raise ValueError('Game is already complete')
-        self._grid[row][col] = self._player
-        if self._player == 1: # swap the active player
+        player = self._player
+        self._cells[row][col] = player
+        counts = self._line_counts[player]
+        for line in LINES_THROUGH[row][col]:
+            counts[line] += 1
+            if counts[line] == 3:
+                self._winner = player
+        self._empty -= 1
+        if self._empty == 0 and self._winner is None:
+            self._winner = 3
+        if player == 1: # swap the active player
             self._player = 2
         else:
             self._player = 1
@@ -50,36 +278,45 @@ class TicTacToeBoard:
             (bool): True if current game board state is a win for the
                 current player, else False.
         """
+        if self._line_counts is None:
+            self._count_lines()
+        return 3 in self._line_counts[mark]
+
+    def winning_move(self):
+        """Return the (row, col) square where the player to move would
+        complete three in a row, the first in row-major order if there are
+        several, or None if there's no such square or the game is over."""
+        if self.winner() is not None:
+            return None
+        mine = self._line_counts[self._player]
+        theirs = self._line_counts[self.opponent()]
+        best = None
+        for i, line in enumerate(LINES):
+            if mine[i] == 2 and theirs[i] == 0: # the third square is blank
+                for row, col in line:
+                    if self._cells[row][col] == 0 and \
+                            (best is None or (row, col) < best):
+                        best = (row, col)
+        return best
 
-        board = self._grid # local variable for code compactness here
-        # (authors are manually checking all 8 of the possible ways you could
-        #   get three in a row--2 diagonals + 3 full-row + 3 full-column = 8.
-        return (mark == board[0][0] == board[0][1] == board[0][2] or    # row 0
-                mark == board[1][0] == board[1][1] == board[1][2] or    # row 1
-                mark == board[2][0] == board[2][1] == board[2][2] or    # row 2
-                mark == board[0][0] == board[1][0] == board[2][0] or    # column 0
-                mark == board[0][1] == board[1][1] == board[2][1] or    # column 1
-                mark == board[0][2] == board[1][2] == board[2][2] or    # column 2
-                mark == board[0][0] == board[1][1] == board[2][2] or    # diagonal
-                mark == board[0][2] == board[1][1] == board[2][0])      # rev diag
+    def line_counts(self):
+        """Return a list of (X's marks, O's marks) on each line in LINES."""
+        if self._line_counts is None:
+            self._count_lines()
+        return list(zip(self._line_counts[1], self._line_counts[2]))
 
     def winner(self):
         """Return mark of winning player, 3 to indicate a tie, None to if
-        game in progress."""
-        for mark in [1, 2]:
-            if self._is_win(mark):
-                return mark
-        if 0 not in self._grid[0]: # If no blank squares
-            if 0 not in self._grid[1]: # Don't check more rows if already found a blank square
-                if 0 not in self._grid[2]:
-                    return 3
-        return None
+        game in progress. O(1) once the line counts exist."""
+        if self._line_counts is None:
+            self._count_lines()
+        return self._winner
 
     def __str__(self):
         """Return string representation of the board in its current state."""
         rows = []
         for r in range(3):
-            row = self._grid[r].copy()
+            row = self._cells[r].copy()
             for i in range(3):
                 if row[i] == 1:
                     row[i] = "X"
@@ -104,11 +341,16 @@ class TicTacToeBoard:
     def board(self) -> list:
         """Public method to return the current board state as a 3 x 3 array.
 
+        The array is the board's own, not a copy, and is read-only: make
+        moves with mark(). winner() and winning_move() read line counts kept
+        up to date by mark(), so editing the array in place leaves them
+        stale. To set up a boardstate, construct a new board from a grid.
+
         Returns:
             (list): 3 x 3 array representing current state of the tic tac toe board in
                 0 / 1 / 2 notation convention.
         """
-        return self._grid
+        return self._cells
 
     def player(self):
         """Public method to return the current player (whose turn it is).
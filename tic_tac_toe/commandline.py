@@ -3,30 +3,73 @@ import time
 try:
     from tic_tac_toe.board import TicTacToeBoard  # unittest defaults want it this way
     from tic_tac_toe.game_tree import GameTree
+    from tic_tac_toe.instrumentation import SearchStats
+    from tic_tac_toe.mcts import MCTSTree
+    from tic_tac_toe.session import GameSession, INVALID, OVER
 except:
     from board import TicTacToeBoard
     from game_tree import GameTree
+    from instrumentation import SearchStats
+    from mcts import MCTSTree
+    from session import GameSession, INVALID, OVER
     # to run the script from windows system command line
 
-class CLIBoard:
-    """Implements command line interface for the tic tac toe game."""
+ENGINES = ('minimax', 'alphabeta', 'mcts') # choices for the computer player
 
-    def __init__(self, board, player1, player2):
+class CLIBoard:
+    """Command line frontend for a GameSession: prints the board, reads
+    human moves, and runs the computer player's search."""
 
+    def __init__(self, board, player1, player2, time_budget=None,
+                 node_budget=None, engine='minimax', seed=None, stats=False):
+        """
+        Args:
+            board (TicTacToeBoard): board to play on.
+            player1 (Player): first-moving player.
+            player2 (Player): second-moving player.
+            time_budget (float): If given, seconds the computer may spend on
+                each move (see GameTree.optimal_move()).
+            node_budget (int): If given, most boardstates the computer may
+                examine for each move; for the 'mcts' engine, the number of
+                playouts.
+            engine (str): Computer player: 'minimax' or 'alphabeta' search
+                with GameTree, or 'mcts' for MCTSTree.
+            seed (int): Seed for the 'mcts' engine's random playouts.
+            stats (bool): If True, print GameTree's SearchStats after each
+                computer move instead of just the time it took.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
         self._player1 = player1
         self._player2 = player2
         self._board = board
+        self._engine = engine
+        if engine == 'mcts':
+            self._tree = MCTSTree(seed=seed)
+        else:
+            # kept for the whole game so each computer move can reuse the
+            #   subtree from the last
+            self._tree = GameTree(stats=SearchStats() if stats else None)
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._session = GameSession(player1, player2, board, engine=self)
+
+    def move(self, board):
+        """Return the computer's move on board; CLIBoard is its session's
+        engine."""
+        if self._engine == 'mcts':
+            return self._tree.optimal_move(board,
+                                           time_budget=self._time_budget,
+                                           playout_budget=self._node_budget)
+        return self._tree.optimal_move(board, search=self._engine,
+                                       time_budget=self._time_budget,
+                                       node_budget=self._node_budget)
 
     def refresh_board(self):
         """Output the current boardstate to command line in a format that's
         useful for a human player."""
         print(self._board)
-        mover = None
-        if self._player1.is_turn():
-            mover = self._player1
-        elif self._player2.is_turn():
-            mover = self._player2
-        print(f"\n    {mover.marker()}'s turn\n")
+        print(f"\n    {self._session.mover().marker()}'s turn\n")
 
     def get_mark_input(self):
         """Get player input of a location at which to place a new mark on the
@@ -41,13 +84,12 @@ class CLIBoard:
         return raw
 
     def human_move(self, player):
-        # While loop that continually prompts player for input until input is acceptable
-        #   to Board.mark() method's validators
-        row = None
-        col = None
-        valid_move = False
-        while valid_move == False:
+        """Prompt until the human enters a move the session accepts, and
+        return the session's events."""
+        while True:
             raw = self.get_mark_input()
+            row = None
+            col = None
             for char in raw:
                 if 48 <= ord(char) <= 50: # ascii for digit chars 0, 1, 2
                     if row is None:
@@ -56,36 +98,33 @@ class CLIBoard:
                         col = ord(char) - 48
             # if the input is two ints, try submitting them
             if row is not None and col is not None:
-                try:
-                    self._board.mark(row, col)
-                    valid_move = True
-                except ValueError:
-                    print("Invalid move position.")
-                    row = None
-                    col = None
+                events = self._session.play(row, col)
+                if events[0].kind != INVALID:
+                    return events
+                print("Invalid move position.")
 
     def computer_move(self, player):
+        """Let the session's computer player move, print how long it took,
+        and return the session's events."""
         # todo option to toggle whether to output the AI's move-computation time
         start = time.time()
-        tree = GameTree()
-        move = tree.optimal_move(self._board)
-        self._board.mark(move[0], move[1])
+        events = self._session.step()
         end = time.time()
         ms = (end - start) * 1000
-        print(f"AI computed move in {ms} ms:\n")
-
-    def _swap_players(self):
-        """Swap which player is mover.""" # todo centralize control of both Player and Board in Game
-        self._player1.toggle_mover()
-        self._player2.toggle_mover()
-        assert self._player1.is_turn() != self._player2.is_turn(),\
-            f"Error in CLIBoard._swap_players() method."
+        if self._engine != 'mcts' and self._tree.stats() is not None:
+            print(f"AI computed move in {self._tree.stats()}\n")
+        else:
+            print(f"AI computed move in {ms} ms:\n")
+        if self._engine == 'mcts':
+            print(f"    {self._tree.playouts()} playouts, "
+                  f"{self._tree.playouts_per_second():.0f} playouts/sec\n")
+        return events
 
     def handle_outcome(self) -> str:
         """Output appropriate visual for win result.
 
-        Args:
-            outcome (int): 0 for draw, 1 for X win, 2 for O win.
+        Returns:
+            (str): the message printed.
         """
         if self._board.winner() == 1:
             message = "X wins!"
@@ -98,51 +137,17 @@ class CLIBoard:
         print(f"    {message}")
         return message # for unittest expediency
 
-    def player_v_player(self):
-        """Main loop for a human vs. human game."""
-        while self._board.winner() is None:
-            self.refresh_board()
-            self.human_move(self._player1)
-            self.refresh_board()
-            self._swap_players()
-            if self._board.winner() is None:
-                self.human_move(self._player2)
-                self._swap_players()
-        self.handle_outcome()
-
-    def player_v_computer(self):
-        """Main loop for a human vs. computer game."""
-        while self._board.winner() is None:
-            self.refresh_board()
-            self.human_move(self._player1)
-            self._swap_players()
-            self.refresh_board()
-            if self._board.winner() is None: # Don't call computer_move() if human just ended the game.
-                self.computer_move(self._player2) # todo abstract to get player1_move() and get player2_move()
-                self._swap_players()
-        self.handle_outcome()
-
-    def computer_v_player(self):
-        while self._board.winner() is None:
-            self.refresh_board()
-            self.computer_move(self._player1)
-            self._swap_players()
-            self.refresh_board()
-            if self._board.winner() is None:
-                self.human_move(self._player2)
-                self._swap_players()
-        self.handle_outcome()
-
-    def computer_v_computer(self):
-        """Main loop for a computer vs. computer game."""
-        while self._board.winner() is None:
-            self.refresh_board()
-            self.computer_move(self._player1)
+    def play(self):
+        """Main loop: show the board, get the next move from whichever
+        player is to move, until the session reports the game over."""
+        events = self._session.start()
+        while not any(event.kind == OVER for event in events):
             self.refresh_board()
-            self._swap_players()
-            if self._board.winner() is None:
-                self.computer_move(self._player2)
-                self._swap_players()
+            mover = self._session.mover()
+            if mover.is_human():
+                events = self.human_move(mover)
+            else:
+                events = self.computer_move(mover)
         self.handle_outcome()
 
     def main(self):
@@ -150,15 +155,11 @@ class CLIBoard:
         if self._player1.is_human() and self._player2.is_human():
             print(f"Starting human vs. human game ({self._player1.marker()} "
                   f"moves first)")
-            self.player_v_player()
         elif self._player1.is_human() and not self._player2.is_human():
             print(f"starting human vs. computer game (human moves first)")
-            self.player_v_computer()
         elif self._player2.is_human() and not self._player1.is_human():
             print(f"Starting computer vs. human game (computer moves first)")
-            self.computer_v_player()
-        elif not self._player1.is_human() and not self._player2.is_human():
-            self.computer_v_computer()
+        self.play()
 
 if __name__ == '__main__':
     CLIBoard.main()
@@ -0,0 +1,275 @@
+"""
+CompactGameTree class, an alternative storage engine for the game tree that
+keeps nodes in parallel typed arrays instead of one Python object per node.
+"""
+
+from array import array
+
+try:
+    from tic_tac_toe.bitboard import BitBoard, FULL_MASK, winner_of, \
+        winning_square_of
+    from tic_tac_toe.board import WIN_SCORE
+except:
+    from bitboard import BitBoard, FULL_MASK, winner_of, winning_square_of
+    from board import WIN_SCORE
+
+UNSCORED = -128 # stored in _scores until a node is scored
+NO_MOVE = -1 # stored in _moves for the root
+
+class CompactGameTree:
+    """Tree of possible tic tac toe game states, stored as parallel arrays
+    indexed by node number.
+
+    For node i:
+        _boards[i]       packed boardstate (see BitBoard.packed())
+        _parents[i]      parent's node number, -1 for the root
+        _first_child[i]  node number of its first child
+        _child_count[i]  number of children, which are numbered consecutively
+        _moves[i]        square (3 * row + col) of the move that produced it
+        _scores[i]       minimax score from the root player's point of view,
+                         as for GameTree Position.score()
+
+    That is 15 bytes per node, against several hundred for a GameTree _Node
+    holding a TicTacToeBoard. Nodes are numbered in breadth-first order, so
+    every child has a higher number than its parent.
+
+    Offers the same Position-based accessors as GameTree, except that
+    Position.element() returns a new BitBoard each call: changing it doesn't
+    change the tree.
+    """
+
+    class Position:
+        """Abstraction representing the location of a single node."""
+
+        __slots__ = '_container', '_index'
+
+        def __init__(self, container, index):
+            """Constructor not meant to be invoked by external user."""
+            self._container = container
+            self._index = index
+
+        def element(self):
+            """Return a BitBoard of the boardstate stored at this Position."""
+            return BitBoard.from_packed(self._container._boards[self._index])
+
+        def move(self):
+            """Return the (row, column) move that produced this Position's
+            boardstate, or None for the root."""
+            square = self._container._moves[self._index]
+            return None if square == NO_MOVE else divmod(square, 3)
+
+        def score(self):
+            """Return this Position's minimax score, or None if unscored."""
+            score = self._container._scores[self._index]
+            return None if score == UNSCORED else score
+
+        def __eq__(self, other):
+            """Return True if other is a Position for the same node of the
+            same tree."""
+            return type(other) is type(self) and \
+                other._container is self._container and \
+                other._index == self._index
+
+    def __init__(self):
+        """Create an initially empty tree."""
+        self._clear()
+
+    # ------------------------- nonpublic utilities ----------------------------
+
+    def _clear(self):
+        """Discard every node, leaving an empty tree."""
+        self._boards = array('I')
+        self._parents = array('i')
+        self._first_child = array('i')
+        self._child_count = array('B')
+        self._moves = array('b')
+        self._scores = array('b')
+
+    def _validate(self, p):
+        """Return the node number for Position p if it belongs to this tree."""
+        if not isinstance(p, self.Position):
+            raise TypeError("'p' arg must be proper Position type")
+        if p._container is not self:
+            raise ValueError("'p' arg does not belong to this container")
+        return p._index
+
+    def _make_position(self, index):
+        """Return Position for node number index (or None if index is -1)."""
+        return self.Position(self, index) if index >= 0 else None
+
+    def _add_node(self, packed, parent, move):
+        """Append a node and return its node number."""
+        self._boards.append(packed)
+        self._parents.append(parent)
+        self._first_child.append(0)
+        self._child_count.append(0)
+        self._moves.append(move)
+        self._scores.append(UNSCORED)
+        return len(self._boards) - 1
+
+    def _add_root(self, board):
+        """Place board's boardstate at the root of an empty tree and return
+        the new Position. Raise ValueError if tree nonempty."""
+        if not self.is_empty():
+            raise ValueError('Root exists')
+        return self._make_position(self._add_node(board.packed(), -1, NO_MOVE))
+
+    def _build_tree(self):
+        """Add every boardstate reachable from the root, breadth first, so
+        each node's children get consecutive node numbers. Where the mover
+        can win immediately, only that move is added."""
+        boards = self._boards
+        index = 0
+        while index < len(boards):
+            packed = boards[index]
+            if winner_of(packed) is None:
+                win = winning_square_of(packed)
+                if win is not None: # nothing scores better than winning now
+                    squares = (win,)
+                else:
+                    squares = range(9)
+                occupied = (packed | (packed >> 9)) & FULL_MASK
+                shift = 9 if packed >> 18 & 1 else 0 # O's bits sit 9 higher
+                self._first_child[index] = len(boards)
+                count = 0
+                for square in squares:
+                    bit = 1 << square
+                    if not occupied & bit:
+                        # Set the mover's bit and flip the player-to-move bit.
+                        child = (packed | (bit << shift)) ^ (1 << 18)
+                        self._add_node(child, index, square)
+                        count += 1
+                self._child_count[index] = count
+            index += 1
+
+    def _score_tree(self):
+        """Score every node in one pass from the highest node number down,
+        which reaches every child before its parent."""
+        boards = self._boards
+        scores = self._scores
+        first_child = self._first_child
+        child_count = self._child_count
+        root_player = (boards[0] >> 18 & 1) + 1
+        root_marks = bin(boards[0] & 0x3FFFF).count('1')
+        for index in range(len(boards) - 1, -1, -1):
+            count = child_count[index]
+            if count == 0:
+                winner = winner_of(boards[index])
+                # a win is worth less the more moves below the root it is
+                win_score = WIN_SCORE - (bin(boards[index] & 0x3FFFF).count('1')
+                                         - root_marks)
+                if winner == root_player:
+                    scores[index] = win_score
+                elif winner == 3:
+                    scores[index] = 0
+                else:
+                    scores[index] = -win_score
+            else:
+                first = first_child[index]
+                child_scores = scores[first:first + count]
+                if (boards[index] >> 18 & 1) + 1 == root_player:
+                    scores[index] = max(child_scores)
+                else:
+                    scores[index] = min(child_scores)
+
+    # ------------------------- public methods --------------------------------
+
+    def optimal_move(self, board):
+        """
+        Return the optimal next move for board's active player, as a
+        two-element (row, column) tuple, by building and scoring the full tree
+        below board. Ties go to the first move in row-major order, and the
+        fastest win is preferred.
+
+        Args:
+            board (TicTacToeBoard): TicTacToeBoard or BitBoard object.
+
+        Returns:
+            (tuple): (row, column) coordinates of the optimal move.
+        """
+        self._clear() # each call searches from scratch, as GameTree's does
+        self._add_root(board)
+        self._build_tree()
+        self._score_tree()
+        best_move = None
+        max_score = -WIN_SCORE - 1 # Must be below any real score
+        for child in self.children(self.root()):
+            if child.score() > max_score:
+                max_score = child.score()
+                best_move = child.move()
+        return best_move
+
+    def memory_usage(self):
+        """Return the number of bytes held by the node arrays."""
+        return sum(a.itemsize * len(a) for a in (
+            self._boards, self._parents, self._first_child,
+            self._child_count, self._moves, self._scores))
+
+    def root(self):
+        """Return Position representing the tree's root (or None if empty)."""
+        return None if self.is_empty() else self._make_position(0)
+
+    def is_root(self, position):
+        """Return True if position is the root of the tree."""
+        return self._validate(position) == 0
+
+    def parent(self, position):
+        """Return position's parent Position, or None for the root."""
+        return self._make_position(self._parents[self._validate(position)])
+
+    def num_children(self, position):
+        """Return the number of children of position."""
+        return self._child_count[self._validate(position)]
+
+    def is_leaf(self, position):
+        """Return True if position has no children."""
+        return self.num_children(position) == 0
+
+    def children(self, position):
+        """Generate the Positions of position's children."""
+        index = self._validate(position)
+        first = self._first_child[index]
+        for child in range(first, first + self._child_count[index]):
+            yield self._make_position(child)
+
+    def depth(self, position):
+        """Return the number of levels separating position from the root,
+        which is the number of marks made since the root's boardstate."""
+        index = self._validate(position)
+        return bin(self._boards[index] & 0x3FFFF).count('1') - \
+            bin(self._boards[0] & 0x3FFFF).count('1')
+
+    def __len__(self):
+        """Return the total number of Positions in the tree."""
+        return len(self._boards)
+
+    def is_empty(self):
+        """Return True if tree is empty, else False."""
+        return len(self) == 0
+
+    def breadthfirst(self):
+        """Generate a breadth-first iteration of all positions in the tree,
+        which is simply node-number order."""
+        for index in range(len(self)):
+            yield self._make_position(index)
+
+    def preorder(self):
+        """Generate a preorder iteration of all positions in the tree."""
+        if self.is_empty():
+            return
+        stack = [0]
+        while stack:
+            index = stack.pop()
+            yield self._make_position(index)
+            first = self._first_child[index]
+            stack.extend(range(first + self._child_count[index] - 1,
+                               first - 1, -1)) # so first child pops next
+
+    def positions(self):
+        """Generate an iteration of all Positions of the tree, in preorder."""
+        return self.preorder()
+
+    def __iter__(self):
+        """Generate an iteration of the tree's elements, as BitBoards."""
+        for position in self.positions():
+            yield position.element()
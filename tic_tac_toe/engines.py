@@ -0,0 +1,134 @@
+"""
+Engines: a common interface over the ways the computer can pick a move, so
+that self-play and tournaments can pit any of them against any other.
+
+Each engine is created once and can play many games; new_game() starts the
+next one with its own seed, so a game played with the same engines and seed
+is the same game whichever process plays it.
+"""
+
+import random
+
+try:
+    from tic_tac_toe.game_tree import GameTree
+    from tic_tac_toe.mcts import MCTSTree
+    from tic_tac_toe.tablebase import Tablebase, DEFAULT_PATH
+    from tic_tac_toe.transposition import TranspositionTable
+except:
+    from game_tree import GameTree
+    from mcts import MCTSTree
+    from tablebase import Tablebase, DEFAULT_PATH
+    from transposition import TranspositionTable
+
+ENGINES = ('minimax', 'alphabeta', 'mcts', 'tablebase', 'random')
+
+class Engine:
+    """Base class for engines. Subclasses override move() and, if they keep
+    per-game state, new_game()."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        """Return the engine's name, one of ENGINES for the built-in ones."""
+        return self._name
+
+    def new_game(self, seed=None):
+        """Start a new game, seeding any random choices the engine makes."""
+        pass
+
+    def move(self, board):
+        """Return the (row, column) move to play on board, without marking
+        it."""
+        raise NotImplementedError
+
+class GameTreeEngine(Engine):
+    """GameTree search, 'minimax' or 'alphabeta', optionally budgeted. One
+    tree per game, so minimax reuses its subtree between moves, and one
+    transposition table for every game, so later games reuse earlier ones'
+    scores."""
+
+    def __init__(self, search='minimax', time_budget=None, node_budget=None,
+                 tablebase=None, name=None):
+        """
+        Args:
+            search (str): search mode passed to GameTree.optimal_move().
+            time_budget (float): seconds per move, or None.
+            node_budget (int): boardstates per move, or None.
+            tablebase (Tablebase): if given, moves come from it.
+            name (str): engine name, defaulting to search.
+        """
+        super().__init__(name or search)
+        self._search = search
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._tablebase = tablebase
+        self._table = TranspositionTable()
+        self._tree = None
+        self.new_game()
+
+    def new_game(self, seed=None):
+        self._tree = GameTree(table=self._table, tablebase=self._tablebase,
+                              seed=seed)
+
+    def move(self, board):
+        return self._tree.optimal_move(board, search=self._search,
+                                       time_budget=self._time_budget,
+                                       node_budget=self._node_budget)
+
+class MCTSEngine(Engine):
+    """MCTSTree with a fixed playout or time budget per move."""
+
+    def __init__(self, playout_budget=None, time_budget=None):
+        super().__init__('mcts')
+        self._playout_budget = playout_budget
+        self._time_budget = time_budget
+        self._tree = MCTSTree()
+
+    def new_game(self, seed=None):
+        self._tree = MCTSTree(seed=seed)
+
+    def move(self, board):
+        return self._tree.optimal_move(board, time_budget=self._time_budget,
+                                       playout_budget=self._playout_budget)
+
+class RandomEngine(Engine):
+    """Plays a uniformly random blank square."""
+
+    def __init__(self):
+        super().__init__('random')
+        self._random = random.Random()
+
+    def new_game(self, seed=None):
+        self._random = random.Random(seed)
+
+    def move(self, board):
+        return self._random.choice(
+            [(row, col) for row, line in enumerate(board.board())
+             for col, mark in enumerate(line) if mark == 0])
+
+def make_engine(name, time_budget=None, node_budget=None,
+                tablebase_path=DEFAULT_PATH):
+    """Return a new engine by name.
+
+    Args:
+        name (str): one of ENGINES.
+        time_budget (float): seconds per move for the searching engines.
+        node_budget (int): boardstates per move for 'minimax' and
+            'alphabeta', playouts for 'mcts'.
+        tablebase_path (str): tablebase file for 'tablebase', which plays 3 x
+            3 boards only. Write it with `python -m tic_tac_toe.tablebase`.
+
+    Returns:
+        (Engine): the engine.
+    """
+    if name in ('minimax', 'alphabeta'):
+        return GameTreeEngine(name, time_budget, node_budget)
+    if name == 'mcts':
+        return MCTSEngine(node_budget, time_budget)
+    if name == 'tablebase':
+        return GameTreeEngine('alphabeta', tablebase=Tablebase(tablebase_path),
+                              name='tablebase')
+    if name == 'random':
+        return RandomEngine()
+    raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
@@ -1,12 +1,9 @@
 """Main game controller script."""
 
-# Todo: Resolve serious spaghettification between this module and commandline.py.
-#   This game.py module should either be interface-agnostic (so that it could be
-#   the API for a hypothetical future GUI), or else integrated with
-#   commandline.py. Right now, it's both inherently entangled with implementation
-#   details of CLI, and also a separate module from the module that's supposed
-#   to own the commandline and be centrally responsible for interfacing between
-#   CLI and non-visual game logic--spaghetti.
+# The rules and turn order live in session.GameSession, which has no
+#   terminal I/O and can back any interface. This module only asks the
+#   command line user for the game options (Game) and defines Player; the
+#   command line frontend itself is commandline.CLIBoard.
 
 try:
     from tic_tac_toe.board import TicTacToeBoard
@@ -19,16 +16,29 @@ class Game:
     """Attributes and methods for running a game of Tic Tac Toe."""
 
     def __init__(self, player1=None, player2=None,
-                 interface="commandline"):
+                 interface="commandline", time_budget=None, node_budget=None,
+                 engine='minimax', seed=None, stats=False):
         """
 
         Args:
             players (tuple): Two-element tuple of Player objects.
             interface (str): Interface type for the game.
+            time_budget (float): Seconds the computer may spend per move, or
+                None to search to the end of the game.
+            node_budget (int): Boardstates the computer may examine per move,
+                or None for no limit. Playouts per move for the 'mcts' engine.
+            engine (str): Computer player, one of commandline.ENGINES.
+            seed (int): Seed for the 'mcts' engine's random playouts.
+            stats (bool): Print search stats after each computer move.
         """
         self._player1 = Player(mover=True) # Internal convention that player1
         self._player2 = Player(mover=False) # moves first by definition.
         self._interface = interface
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._engine = engine
+        self._seed = seed
+        self._stats = stats
         if self._interface != "commandline":
             raise NotImplementedError
 
@@ -124,7 +134,10 @@ class Game:
         if self._interface == "commandline":
             self._set_commandline_options()
         board = TicTacToeBoard(player=self._player1.int_marker())
-        CLIBoard(board, self._player1, self._player2).main()
+        CLIBoard(board, self._player1, self._player2,
+                 time_budget=self._time_budget,
+                 node_budget=self._node_budget, engine=self._engine,
+                 seed=self._seed, stats=self._stats).main()
 
 class Player:
 
@@ -1,8 +1,22 @@
-from tic_tac_toe.general_tree import GeneralTree, LinkedQueue
-from tic_tac_toe.board import TicTacToeBoard
+from tic_tac_toe.general_tree import GeneralTree, ArrayQueue
+from tic_tac_toe.board import TicTacToeBoard, transform_move, \
+    inverse_transform, WIN_SCORE, shift_score, win_score
+from tic_tac_toe.transposition import TranspositionTable, EXACT, LOWER, UPPER
 
-import copy
 import random
+import time
+
+def heuristic_limit(squares):
+    """Return the bound that heuristic scores at a depth-limited search's
+    cutoff stay strictly inside on a board of squares squares: one below the
+    score of a win as deep as the board allows, so a forced result always
+    outranks a guess, however many moves away it is."""
+    return win_score(squares) - squares - 1
+
+class _BudgetExhausted(Exception):
+    """Raised inside a budgeted search to unwind it when its time or node
+    budget runs out."""
+    pass
 
 class GameTree(GeneralTree):
     """Tree of possible tic tac toe game states."""
@@ -34,6 +48,8 @@ class GameTree(GeneralTree):
         """Extensions to inherited Position nested-class to support accessor
         methods for Node._move and Node._score."""
 
+        __slots__ = ()
+
         def __init__(self, container, node): # No changes. Move and score are
                                             #   encapsulated within object that's
                                             #   passed as node arg.
@@ -53,24 +69,62 @@ class GameTree(GeneralTree):
 
         def score(self):
             """Return the minimax score of the boardstate stored at this
-            Position.
+            Position, from the root player's point of view.
 
             Returns:
-                (int): -1, 0, or 1.
+                (int): W - d for a win d moves below the root, -(W - d)
+                    for a loss, 0 for a draw, W being the board's win score
+                    (WIN_SCORE on boards up to 49 squares; see
+                    board.win_score()).
             """
             return self._node._score
 
+    def __init__(self, table=None, tablebase=None, stats=None, seed=None):
+        """Create an initially empty game tree.
+
+        Args:
+            table (TranspositionTable): Table of already-scored positions to
+                consult and fill in. Pass the same table to several trees to
+                share results between them. Defaults to a new, uncapped table.
+            tablebase (Tablebase): Precomputed solutions (see tablebase.py).
+                If given, optimal_move() answers from it without searching.
+            stats (SearchStats): If given, filled in with counters and
+                timings after every optimal_move() call (see
+                instrumentation.py).
+            seed (int): Seed for the random choice of corner on a blank
+                board, so that games can be replayed exactly.
+        """
+        super().__init__()
+        self._tablebase = tablebase
+        self._nodes_visited = 0 # boardstates examined by the last search
+        self._nodes_scored = 0 # nodes scored by the last _score_subtree()
+        self._table = table if table is not None else TranspositionTable()
+        self._transpositions = {} # packed board -> first _Node built for it
+        self._deadline = None # perf_counter() time a budgeted search must stop
+        self._node_limit = None # most nodes a budgeted search may visit
+        self._stats = stats
+        self._random = random.Random(seed)
+        self._hooks = [] # SearchHooks run around each optimal_move() call
+        self._win_score = WIN_SCORE # for the size of board being searched
+        self._heuristic_limit = heuristic_limit(9)
+        # Per-call counters, reported through stats
+        self._nodes_created = 0
+        self._max_depth = 0
+        self._prunes = 0
+        self._build_time = 0.0
+
     def _add_root(self, element, move=None, score=None):
         """Override of inherited method to support adding move and score in addition
         to element."""
         if self._root is not None:
             raise ValueError('Root exists')
         self._size = 1
-        self._root = self._Node(element, move, score)
+        self._root = self._Node(element, move=move, score=score)
         return self._make_position(self._root)
 
 
-    def optimal_move(self, board):
+    def optimal_move(self, board, search='minimax', time_budget=None,
+                     node_budget=None):
         # External calls to this method should be completely unaffected by future
         #   fixes to the tree-building and storage implementation.
         """
@@ -79,15 +133,130 @@ class GameTree(GeneralTree):
 
         Args:
             board (TicTacToeBoard): TicTacToeBoard object.
+            search (str): 'minimax' to build and score the full tree below
+                board, or 'alphabeta' for a depth-first minimax with
+                alpha-beta cutoffs that never adds nodes to the tree. Both
+                return the same move.
+            time_budget (float): If given, seconds the search may take.
+            node_budget (int): If given, most boardstates the search may
+                visit.
+
+        With either budget, search is ignored: the move comes from iterative
+        deepening alpha-beta that scores positions at the depth limit with
+        a heuristic and returns the best move of the deepest search that
+        finished in budget (see _deepening_optimal_move). This is the way to
+        search boards too big to search to the end.
+
+        Both searches run on the canonical rotation/reflection of board (see
+        TicTacToeBoard.canonical()) and key the transposition table by
+        canonical form, so symmetric variants of a position are searched
+        once. The chosen move is mapped back onto board's orientation. If
+        the tree was given a tablebase, the move is looked up there instead.
 
         Returns:
             (tuple): (row, column) coordinates of optimal move for board's
                 active player.
         """
-        # todo it may have no mechanism for valuing faster wins more than
-        #   slower wins--appeared to pass on a chance to win in one move in a
-        #   game where its eventual win was guaranteed either way.
+        self._nodes_visited = 0
+        self._nodes_created = 0
+        self._nodes_scored = 0
+        self._max_depth = 0
+        self._prunes = 0
+        self._build_time = 0.0
+        if self._stats is None and not self._hooks:
+            return self._optimal_move(board, search, time_budget, node_budget)
+        table_stats = self._table.stats()
+        for hook in self._hooks:
+            hook.start(board)
+        move = None
+        start = time.perf_counter()
+        try:
+            move = self._optimal_move(board, search, time_budget, node_budget)
+        finally:
+            elapsed = time.perf_counter() - start
+            for hook in reversed(self._hooks):
+                hook.stop(board, move)
+        if self._stats is not None:
+            self._record_stats(table_stats, elapsed)
+        return move
+
+    def _optimal_move(self, board, search, time_budget, node_budget):
+        """optimal_move() without the per-call bookkeeping."""
+        if search not in ('minimax', 'alphabeta'):
+            raise ValueError(f"Unknown search mode '{search}'")
+        if (time_budget is not None and time_budget <= 0) or \
+                (node_budget is not None and node_budget < 1):
+            raise ValueError('Search budgets must be positive')
+
+        move = self._shortcut_move(board)
+        if move is not None:
+            return move
+
+        self._set_scale(board)
+        canonical, transform = board.canonical()
+        if time_budget is not None or node_budget is not None:
+            move = self._deepening_optimal_move(canonical, time_budget,
+                                                node_budget)
+            return transform_move(move, inverse_transform(transform))
+        if search == 'alphabeta':
+            move = self._alphabeta_optimal_move(canonical)
+            return transform_move(move, inverse_transform(transform))
+        # Reuse the subtree already built for this boardstate by an earlier
+        #   call (typically the grandchild reached after our move and the
+        #   opponent's reply), else start a fresh tree from the canonical board.
+        node = self._transpositions.get(canonical.packed())
+        if node is not None:
+            self._reroot(node)
+        else:
+            self._clear()
+            self._add_root(canonical) # Make board the root of the tree
+        move = self._subtree_optimal_move(self.root()) # Internal methods can
+                                                        # handle it from there
+        # The root's board is a rotation/reflection of board, not necessarily
+        #   the canonical one, so go through the canonical orientation.
+        move = transform_move(move, self.root().element().canonical()[1])
+        return transform_move(move, inverse_transform(transform))
+
+    def _set_scale(self, board):
+        """Set the win score and heuristic limit for searching boards the
+        size of board (see board.win_score() and heuristic_limit())."""
+        grid = board.board()
+        squares = len(grid) * len(grid[0])
+        self._win_score = win_score(squares)
+        self._heuristic_limit = heuristic_limit(squares)
+
+    def _record_stats(self, table_stats, elapsed):
+        """Fill in the SearchStats from this call's counters.
 
+        Args:
+            table_stats (dict): the table's stats() before the call.
+            elapsed (float): seconds the call took.
+        """
+        stats = self._stats
+        after = self._table.stats()
+        stats.nodes_created = self._nodes_created
+        stats.nodes_visited = self._nodes_visited
+        stats.nodes_scored = self._nodes_scored
+        stats.max_depth = self._max_depth
+        stats.cache_hits = after['hits'] - table_stats['hits']
+        stats.cache_misses = after['misses'] - table_stats['misses']
+        stats.prunes = self._prunes
+        stats.build_time = self._build_time
+        stats.score_time = max(0.0, elapsed - self._build_time)
+
+    def _shortcut_move(self, board):
+        """
+        Return a move for board found without searching, or None if board
+        needs a search: a random corner on a blank 3 x 3 board, the
+        tablebase's move, an immediate win, or the center after a first move
+        into a corner.
+
+        Args:
+            board (TicTacToeBoard): board whose active player is to move.
+
+        Returns:
+            (tuple): (row, column) tuple, or None.
+        """
         # Bypass the ultra-slow full-tree build until algorithm fixed.
         #   If it's a blank board, randomly return one of the corners in
         #   O(1) time.
@@ -97,20 +266,111 @@ class GameTree(GeneralTree):
             [0,0,0]
         ]:
             return self._random_corner()
+        if self._tablebase is not None:
+            entry = self._tablebase.lookup(board)
+            if entry is not None:
+                self._nodes_visited = 0
+                return entry[0]
+        win = board.winning_move()
+        if win is not None: # nothing beats winning now, so don't search
+            self._nodes_visited = 0
+            return win
         # Todo Return center square in O(1) time if opponent moved first into a corner.
         #   Don't want it to auto-pick a corner any time any corner is free.
 
-        if self._first_move_in_corner(board.board()):
+        grid = board.board()
+        if len(grid) == 3 and len(grid[0]) == 3 and \
+                self._first_move_in_corner(grid): # 3 x 3 boards only
             return (1, 1)
+        return None
+
+    def _clear(self):
+        """Discard every node, leaving an empty tree."""
+        self._root = None
+        self._size = 0
+        self._transpositions = {}
 
-        self._add_root(board) # Make board the root of the tree
-        return self._subtree_optimal_move(self.root()) # Internal methods can handle 
-                                                        # it from there
+    def _reroot(self, node):
+        """
+        Make node the root of the tree, keeping its subtree's nodes and scores
+        and releasing everything else.
+
+        The old root and each node on the path down to node are marked
+        deprecated and have their children lists emptied, so the sibling
+        subtrees hanging off that path can be garbage collected.
+
+        Args:
+            node (_Node): node somewhere in this tree.
+        """
+        if node is self._root:
+            return
+        old_player = self._root._element.player()
+        ancestor = node._parent
+        node._parent = None
+        while ancestor is not None:
+            parent = ancestor._parent
+            ancestor._children = []
+            ancestor._parent = ancestor # convention for deprecated nodes
+            ancestor = parent
+        self._root = node
+        # Scores are from the root player's point of view, so they flip if
+        #   the new root is an odd number of moves below the old one, and
+        #   every result is now shift moves closer to the root.
+        flip = node._element.player() != old_player
+        shift = node._depth
+        self._size = 0
+        self._transpositions = {}
+        for position in self._subtree_preorder(self.root()):
+            kept = position._node
+            self._size += 1
+            kept._depth -= shift
+            if kept._score is not None:
+                kept._score = shift_score(
+                    -kept._score if flip else kept._score, shift)
+            if kept._children: # expanded, so reusable by the next call
+                self._transpositions[kept._element.canonical_key()] = kept
+        if not node._children: # reached a leaf that still has to be expanded
+            node._score = None
+
+    def table(self):
+        """Return the TranspositionTable this tree consults."""
+        return self._table
+
+    def nodes_visited(self):
+        """Return the number of boardstates the most recent optimal_move()
+        call examined: every node it added to the tree for 'minimax' (none if
+        it reused a subtree built by an earlier call), only the nodes not
+        pruned away for 'alphabeta'."""
+        return self._nodes_visited
+
+    def nodes_scored(self):
+        """Return the number of nodes the most recent _score_subtree() call
+        scored, 0 if the most recent optimal_move() call didn't make one.
+        Each node is scored at most once, so this never exceeds the size of
+        the subtree."""
+        return self._nodes_scored
+
+    def stats(self):
+        """Return the SearchStats this tree fills in, or None."""
+        return self._stats
+
+    def add_hook(self, hook):
+        """Run hook's start() and stop() around each optimal_move() call,
+        inside any hooks added earlier.
+
+        Args:
+            hook (SearchHook): e.g. instrumentation.ProfileHook().
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Stop running a hook added with add_hook()."""
+        self._hooks.remove(hook)
 
     def _random_corner(self):
         """Return tuple corresponding to coordinates for randomly chosen corner
         of the board."""
-        r = random.random()
+        r = self._random.random()
         if r < (1/4):
             return (0,0)
         elif r < (1/2):
@@ -152,6 +412,8 @@ class GameTree(GeneralTree):
             elif grid[2][2] != 0:
                 for i in range(2):
                     if grid[2][i] != 0: return False
+        else: # no corner is marked
+            return False
         return True
 
 
@@ -167,14 +429,10 @@ class GameTree(GeneralTree):
         Returns:
             (Position): Position object for the new child node.
         """
-        # Make a deepcopy of the underlying 3x3 grid:
-        grid_copy = copy.deepcopy(position.element().board())
-        # Use that copy to make a new TicTacToeBoard object that starts with
-        #   same values in its grid, and with its player set to parent
-        #   position's player:
-        board_copy = TicTacToeBoard(grid=grid_copy,
-                                    player=position.element().player())
-                                    # player shouldn't be flipped yet because it flips when .mark() is called
+        # Each board class knows the cheapest way to copy itself (a fresh
+        #   grid for TicTacToeBoard, two ints for BitBoard). Player shouldn't
+        #   be flipped yet because it flips when .mark() is called.
+        board_copy = position.element().copy()
         return self._add_child(position, board_copy)
 
     def _add_marked_child(self, position, move: tuple):
@@ -191,9 +449,17 @@ class GameTree(GeneralTree):
                 (Position): Position object for the new child node.
 
         """
-        child = self._add_unmarked_child(position) # todo prob will be able to collapse later
-        child.element().mark(move[0], move[1])
-        child._node._move = move
+        return self._make_position(
+            self._add_marked_child_node(self._validate(position), move))
+
+    def _add_marked_child_node(self, node, move):
+        """Unchecked fast path of _add_marked_child() for a _Node already
+        known to belong to this tree. Return the new child _Node."""
+        # Each board class knows the cheapest way to copy itself. Player
+        #   flips when .mark() is called.
+        child = self._add_child_node(node, node._element.copy())
+        child._element.mark(move[0], move[1])
+        child._move = move
         return child
 
     def _possible_moves(self, position) -> list:
@@ -205,13 +471,16 @@ class GameTree(GeneralTree):
             position (Position): Position in this tree with TicTacToeBoard
                 object as its element.
 
-            moves_queue (LinkedQueue): LinkedQueue to put possible moves in.
-
         Returns:
-            (LinkedQueue): LinkedQueue of (row, column) tuples
+            (list): list of (row, column) tuples
         """
+        return self._board_moves(position.element())
+
+    def _board_moves(self, board) -> list:
+        """Return a list of (row, column) tuples for the blank squares of
+        board, in row-major order."""
         moves = []
-        grid = position.element().board()
+        grid = board.board()
         for row in range(len(grid)): # iterate over all squares in the grid:
             for col in range(len(grid[row])):
                 if grid[row][col] == 0:
@@ -220,8 +489,7 @@ class GameTree(GeneralTree):
 
     def _enqueue_moves(self, moves_list, moves_queue):
         """Helper method to add each move in a moves_list to a moves_queue."""
-        for move in moves_list:
-            moves_queue.enqueue(move)
+        moves_queue.enqueue_many(moves_list)
 
 # Todo: Make a separate movesqueue object with method MovesQueue._possible_moves(Position) ?
 
@@ -239,15 +507,37 @@ class GameTree(GeneralTree):
         """
         if position.element().winner() is not None: # Don't waste time adding
             return                                  # children to gameover board
-        moves_queue = LinkedQueue()
+        if position.score() is not None: # already scored from the table
+            return
+        key = position.element().canonical_key()
+        if self._transpositions.setdefault(key, position._node) is not position._node:
+            # This boardstate (or a rotation/reflection of it) was reached by
+            #   another move order and expanded there. Leave this node a leaf;
+            #   _score_subtree copies the other node's score.
+            return
+        node = self._validate(position) # validate once, then work on _Nodes
+        win = node._element.winning_move()
+        if win is not None: # Nothing scores better than winning right away,
+            moves = [win]   #   so don't expand the other moves.
+            self._prunes += 1
+        else:
+            moves = self._possible_moves(position)
+        moves_queue = ArrayQueue(9)
         # a move leaves the moves queue, becomes a child, and enters the child queue
-        self._enqueue_moves(self._possible_moves(position), moves_queue)
+        self._enqueue_moves(moves, moves_queue)
+        new_children = []
         while not moves_queue.is_empty():
             move = moves_queue.dequeue()
-            new_child = self._add_marked_child(position, move)
-            children_queue.enqueue(new_child)
-             # add the new child's possible moves to the queue.
-
+            child = self._add_marked_child_node(node, move)
+            new_child = self._make_position(child)
+            board = child._element
+            if board.winner() is None:
+                entry = self._table.get(board.canonical_key())
+                if entry is not None and entry[1] == EXACT:
+                    # Scored by an earlier search, so it won't be expanded.
+                    child._score = self._from_mover_value(new_child, entry[0])
+            new_children.append(new_child)
+        children_queue.enqueue_many(new_children) # all at once
 
     def _build_tree(self, position): # todo collapse into or only call from __init__
         """
@@ -258,11 +548,15 @@ class GameTree(GeneralTree):
             position (Position): Position in this tree with TicTacToeBoard
                 as its element. Defaults to root.
         """
-        children_queue = LinkedQueue()
+        self._transpositions = {}
+        children_queue = ArrayQueue()
         self._build_children(position, children_queue) # enqueues some children
+        child = position
         while not children_queue.is_empty():
             child = children_queue.dequeue()
             self._build_children(child, children_queue)
+        # Breadth-first, so the last node built is as deep as any
+        self._max_depth = child._node._depth - position._node._depth
 
     def _score_leaf(self, position):
         if not self.is_leaf(position):
@@ -270,13 +564,14 @@ class GameTree(GeneralTree):
         player = self.root().element().player() # want the top-level player, not necessarily this node's player
         opponent = self.root().element().opponent() # todo recompress for conciseness
         winner = position.element().winner() # want this position's winner though, not root's (root has no winner by definition)
+        depth = position._node._depth # a win is worth less the longer it takes
 
         if winner == player:
-            score = 1
+            score = self._win_score - depth
             position._node._score = score
             return score
         elif winner == opponent:
-            score = -1
+            score = -(self._win_score - depth)
             position._node._score = score
             return score
         elif winner == 3:
@@ -286,41 +581,81 @@ class GameTree(GeneralTree):
 
     def _score_subtree(self, position):
         """
-        Recursively update the score attribute for the node at each Position in the
-        subtree rooted at Position.
+        Update the score attribute for the node at each Position in the
+        subtree rooted at Position, in a single iterative post-order pass that
+        scores every unscored node exactly once.
+
+        A leaf left unexpanded because its boardstate was expanded elsewhere
+        in the tree (see _build_children) takes the score of that other node,
+        which is scored first if it hasn't been yet. Both are at the same
+        depth, so their scores mean the same thing.
 
         Args:
             position (Position): Position in this tree with TicTacToeBoard
                 as its element, with full set of subtrees all eventually
                 terminating in a gameover-leaf.
         Returns:
-            None
+            (int): position's score.
         """
-        if self.is_leaf(position):
-            return self._score_leaf(position)
-        # Base case: All leaves are scored, so can score the full tree:
-        else:
-            child_scores = []
-            children_scored = True # todo how is there not a more concise listcomp way to check if all children are scored?
-            for child in self.children(position): # todo store it as an instance variable of each Position?
-                if child.score() is None:
-                    children_scored = False
-                else:
-                    child_scores.append(child.score())
-            if children_scored == True:
-                child_scores = [c.score() for c in self.children(position)]
-                if self.depth(position) % 2 == 0: # Take the max at even depths
+        top = self._validate(position)
+        self._nodes_scored = 0
+        stack = [(top, self._scoring_dependencies(top))]
+        while stack:
+            node, dependencies = stack[-1]
+            dependency = next(dependencies, None)
+            if dependency is not None:
+                if dependency._score is None: # score it before node
+                    stack.append((dependency,
+                                  self._scoring_dependencies(dependency)))
+                continue
+            stack.pop() # everything node's score depends on is scored
+            self._nodes_scored += 1
+            if node._children:
+                child_scores = [child._score for child in node._children]
+                if node._depth % 2 == 0: # Take the max at even depths
                     score = max(child_scores)
-                    position._node._score = score
-                    return score
                 else: # Take the min at odd depths
                     score = min(child_scores)
-                    position._node._score = score
-                    return score
-        # Recursive case: internal node with unscored children:
-        for child in self.children(position):
-            self._score_subtree(child)
-        return self._score_subtree(position) # re-call after scoring all children
+                node._score = score
+                self._table.store(node._element.canonical_key(),
+                                  self._to_mover_value(
+                                      self._make_position(node), score))
+            elif node._element.winner() is not None:
+                self._score_leaf(self._make_position(node))
+            elif node._score is None: # an unexpanded transposition leaf
+                original = self._transpositions.get(
+                    node._element.canonical_key())
+                if original is not None and original is not node:
+                    node._score = original._score
+        return top._score
+
+    def _scoring_dependencies(self, node):
+        """Return an iterator over the nodes whose scores node's score is
+        computed from: its children, or for an unexpanded transposition leaf,
+        the node where its boardstate was expanded."""
+        if node._children:
+            return iter(node._children)
+        if node._element.winner() is None and node._score is None:
+            original = self._transpositions.get(node._element.canonical_key())
+            if original is not None and original is not node:
+                return iter((original,))
+        return iter(())
+
+    def _to_mover_value(self, position, score):
+        """Convert a score from the root player's point of view into one from
+        the point of view of the player to move at position, counting
+        distance to the result from position rather than from the root. This
+        is the form the table stores, so it doesn't depend on the root."""
+        if position.element().player() != self.root().element().player():
+            score = -score
+        return shift_score(score, position._node._depth)
+
+    def _from_mover_value(self, position, value):
+        """Inverse of _to_mover_value()."""
+        score = shift_score(value, -position._node._depth)
+        if position.element().player() != self.root().element().player():
+            score = -score
+        return score
 
     def _subtree_optimal_move(self, position):
         """
@@ -334,12 +669,223 @@ class GameTree(GeneralTree):
         Returns:
               (tuple): (row, column) tuple representing the optimal move.
         """
-        self._build_tree(position) # Build the tree...
-        self._score_subtree(position) # ...and score it.
-        max_score = -10 # Must be < -1
+        if self.is_leaf(position): # not already built by an earlier call
+            size = len(self)
+            start = time.perf_counter()
+            self._build_tree(position) # Build the tree...
+            self._build_time = time.perf_counter() - start
+            self._nodes_created = len(self) - size
+            self._score_subtree(position) # ...and score it.
+            self._nodes_visited = len(self)
+        else:
+            self._nodes_visited = 0
+        max_score = -self._win_score - 1 # Must be below any real score
         best_move = None
         for child in self.children(position):
             if child.score() > max_score:
                 max_score = child.score()
                 best_move = child._node._move
-        return best_move
\ No newline at end of file
+        return best_move
+
+    def _alphabeta_optimal_move(self, board):
+        """
+        Return the optimal move for board's active player using depth-first
+        minimax with alpha-beta cutoffs. Works on copies of board and never
+        adds nodes to the tree.
+
+        Ties go to the first move in row-major order, same as
+        _subtree_optimal_move, so the two searches agree.
+
+        Args:
+            board (TicTacToeBoard): board whose active player is to move.
+
+        Returns:
+            (tuple): (row, column) tuple representing the optimal move.
+        """
+        return self._alphabeta_root(board)[0]
+
+    def _alphabeta_root(self, board):
+        """
+        Return (move, score) for board's active player: the move
+        _alphabeta_optimal_move() picks and its exact score, as for
+        Position.score() with board as the root. (None, None) if board is
+        game over.
+        """
+        self._nodes_visited = 1 # the root
+        self._set_scale(board)
+        if board.winner() is not None:
+            return None, None
+        player = board.player()
+        beta = self._win_score + 1 # Must be above any real score
+        alpha = -beta
+        best_move = None
+        for move in self._board_moves(board):
+            child = board.copy()
+            child.mark(move[0], move[1])
+            score = self._alphabeta(child, alpha, beta, False, player)
+            if score > alpha: # a later move has to be strictly better
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def _deepening_optimal_move(self, board, time_budget=None,
+                                node_budget=None):
+        """
+        Return the best move for board's active player found by iterative
+        deepening: alpha-beta searches limited to 1, 2, 3... moves deep, each
+        starting with the previous search's best move, until the time or
+        node budget runs out, a win or loss is proven, or the search reaches
+        the end of the game.
+
+        Whenever the budget runs out there is a move to return: the first
+        legal move before any search finishes, else the best move of the
+        deepest search, or a move that beat it in the unfinished one.
+
+        Args:
+            board (TicTacToeBoard): board whose active player is to move.
+            time_budget (float): seconds allowed, or None for no limit.
+            node_budget (int): boardstates allowed, or None for no limit.
+
+        Returns:
+            (tuple): (row, column) tuple representing the best move found.
+        """
+        self._nodes_visited = 1 # the root
+        if time_budget is not None:
+            self._deadline = time.perf_counter() + time_budget
+        self._node_limit = node_budget
+        player = board.player()
+        moves = self._board_moves(board)
+        best_move = moves[0] if moves else None
+        beta = self._win_score + 1 # Must be above any real score
+        try:
+            for horizon in range(1, len(moves) + 1):
+                alpha = -beta
+                for move in [best_move] + [m for m in moves if m != best_move]:
+                    child = board.copy()
+                    child.mark(move[0], move[1])
+                    score = self._alphabeta(child, alpha, beta, False, player,
+                                            1, horizon)
+                    if score > alpha: # best so far at this depth, so it's
+                        alpha = score #   better than last depth's best
+                        best_move = move
+                # A proven result can't change in deeper searches.
+                if abs(alpha) > self._heuristic_limit:
+                    break
+        except _BudgetExhausted:
+            pass
+        finally:
+            self._deadline = None
+            self._node_limit = None
+        return best_move
+
+    def _evaluate(self, board, player):
+        """
+        Return a heuristic score for board from player's point of view,
+        strictly inside +/-heuristic_limit() for the size of board being
+        searched, for depth-limited searches to use where they stop. Counts
+        the lines each player could still complete, weighting each by the
+        square of the marks already on it.
+
+        Args:
+            board (TicTacToeBoard): in-progress boardstate.
+            player (int): mark of the player at the root of the search.
+
+        Returns:
+            (int): heuristic score.
+        """
+        ours = 0
+        theirs = 0
+        for x, o in board.line_counts():
+            mine, others = (x, o) if player == 1 else (o, x)
+            if others == 0:
+                ours += mine * mine
+            elif mine == 0:
+                theirs += others * others
+        # int() truncates toward 0, so swapping players just flips the sign
+        return int(self._heuristic_limit * (ours - theirs)
+                   / (ours + theirs + 1))
+
+    def _alphabeta(self, board, alpha, beta, maximizing, player, depth=1,
+                   horizon=None):
+        """
+        Return the minimax score of board from player's point of view, or a
+        bound on it if the true score falls outside (alpha, beta).
+
+        Args:
+            board (TicTacToeBoard): boardstate to score.
+            alpha (int): score player is already guaranteed elsewhere.
+            beta (int): score the opponent is already guaranteed elsewhere.
+            maximizing (bool): True if it's player's move on board.
+            player (int): mark of the player at the root of the search.
+            depth (int): number of moves board is below the root.
+            horizon (int): depth at which to stop and return _evaluate()'s
+                heuristic score, or None to search to the end of the game.
+
+        Returns:
+            (int): score as for Position.score() (fail-hard, so clamped to
+                [alpha, beta]).
+        """
+        self._nodes_visited += 1
+        if depth > self._max_depth:
+            self._max_depth = depth
+        if self._node_limit is not None and \
+                self._nodes_visited > self._node_limit:
+            raise _BudgetExhausted
+        if self._deadline is not None and self._nodes_visited % 16 == 0 and \
+                time.perf_counter() > self._deadline:
+            raise _BudgetExhausted
+        winner = board.winner()
+        if winner is not None:
+            if winner == player:
+                return self._win_score - depth
+            elif winner == 3:
+                return 0
+            return -(self._win_score - depth)
+        if board.winning_move() is not None: # the mover wins next move
+            self._prunes += 1
+            score = self._win_score - depth - 1
+            score = score if maximizing else -score
+            return max(alpha, min(beta, score))
+        if horizon is not None and depth >= horizon:
+            return max(alpha, min(beta, self._evaluate(board, player)))
+        # The table holds scores for the player to move, who is the
+        #   minimizing player's opponent, so flip sign and bound direction,
+        #   and counts distance to the result from board, not the root.
+        sign = 1 if maximizing else -1
+        key = board.canonical_key()
+        entry = self._table.get(key)
+        if entry is not None:
+            score = sign * shift_score(entry[0], -depth)
+            flag = entry[1]
+            if flag == EXACT:
+                return max(alpha, min(beta, score))
+            if (flag == LOWER) == maximizing: # a lower bound on our score
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                self._prunes += 1
+                return alpha if maximizing else beta
+        original_alpha, original_beta = alpha, beta
+        for move in self._board_moves(board):
+            child = board.copy()
+            child.mark(move[0], move[1])
+            score = self._alphabeta(child, alpha, beta, not maximizing, player,
+                                    depth + 1, horizon)
+            if maximizing:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta: # the other player won't allow this line
+                self._prunes += 1
+                break
+        score = alpha if maximizing else beta
+        if score <= original_alpha: # true score is no higher than this
+            flag = UPPER if maximizing else LOWER
+        elif score >= original_beta: # true score is no lower than this
+            flag = LOWER if maximizing else UPPER
+        else:
+            flag = EXACT
+        if horizon is None: # a heuristic score isn't safe to reuse
+            self._table.store(key, shift_score(sign * score, depth), flag)
+        return score
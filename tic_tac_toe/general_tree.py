@@ -1,6 +1,6 @@
 """
-GeneralTree class and a LinkedQueue class used for GeneralTree's breadth-first
-traversal.
+GeneralTree class and an ArrayQueue class used for GeneralTree's
+breadth-first traversal.
 """
 
 class GeneralTree:
@@ -17,7 +17,8 @@ class GeneralTree:
         children. So children are ordered, but the class isn't meant to
         implement an ordered tree per se.
         """
-        __slots__ = '_element', '_parent', '_children' # to make lighter in memory
+        __slots__ = '_element', '_parent', '_children', '_depth', \
+                    '_position' # to make lighter in memory
 
         def __init__(self, element, parent=None, children=None):
             """
@@ -33,6 +34,10 @@ class GeneralTree:
             self._element = element
             self._parent = parent
             self._children = children if children is not None else []
+            # Levels below the root, recorded on insertion so depth() is O(1).
+            #   Tree methods that move subtrees (_delete, _attach) update it.
+            self._depth = parent._depth + 1 if parent is not None else 0
+            self._position = None # this node's Position, made on first request
 
     # ----------------------- nested Postiion class --------------------------
 
@@ -40,7 +45,14 @@ class GeneralTree:
     #   the ADT. 
 
     class Position:
-        """Abstraction representing the location of a single element."""
+        """Abstraction representing the location of a single element.
+
+        The tree hands out one Position per node and reuses it (see
+        _make_position()), so Positions for the same node are usually the
+        same object, but always compare with ==.
+        """
+
+        __slots__ = '_container', '_node'
 
         def __init__(self, container, node):
             """Constructor not meant to be invoked by external user."""
@@ -83,27 +95,50 @@ class GeneralTree:
         """
         Return Position instance for given node (or None if no node).
 
+        The Position is created the first time it's asked for and cached on
+        the node, so traversals that revisit nodes don't allocate.
+
         Args:
             node (_Node): _Node object
 
         Returns:
-            (Position): New Position instance with node as the value of its
-                _node instance variable.
+            (Position): Position instance with node as the value of its _node
+                instance variable.
         """
-        return self.Position(self, node) if node is not None else None
+        if node is None:
+            return None
+        position = node._position
+        if position is None:
+            position = node._position = self.Position(self, node)
+        return position
 
     def _height_func(self, p):
         """Return the height of the subtree rooted at Position p.
+
+        Walks the subtree in postorder with an explicit stack rather than
+        recursing, so deep trees can't hit the interpreter's recursion limit.
+
         Args:
             p (Position): position in the tree
 
         Returns:
             (int): height of the relevant subtree
         """
-        if self.is_leaf(p):
-            return 0 # base case
-        else:
-            return 1 + max(self._height_func(c) for c in self.children(p))
+        node = self._validate(p)
+        # Each stack frame is [node, iterator over its children, greatest
+        #   height seen so far among its finished children + 1].
+        stack = [[node, iter(node._children), 0]]
+        while True:
+            frame = stack[-1]
+            child = next(frame[1], None)
+            if child is not None:
+                stack.append([child, iter(child._children), 0])
+                continue
+            stack.pop() # all of frame's children are done
+            if not stack:
+                return frame[2]
+            if frame[2] + 1 > stack[-1][2]:
+                stack[-1][2] = frame[2] + 1
 
     # ----------------------- general tree constructor ----------------------
     def __init__(self):
@@ -138,19 +173,56 @@ class GeneralTree:
             (Position): Position of the new Node.
         """
         node = self._validate(p)
+        return self._make_position(self._add_child_node(node, e))
+
+    def _add_child_node(self, node, e):
+        """Unchecked fast path of _add_child() for internal callers that
+        already hold a valid _Node: create and return the new child _Node
+        without validating or making a Position."""
         self._size += 1
         new_node = self._Node(element=e, parent=node) # new child _Node object
         node._children.append(new_node) # add it to parent node's children list
-        return self._make_position(new_node) # make a position object
+        return new_node
 
-    # todo implement _replace and _attach
+    # todo implement _replace
 
     def _replace(self, p, e):
         raise NotImplementedError
 
     def _attach(self, p: Position, other_tree) -> None:
-        """Attach tree other_tree as a child-subtree of Position p."""
-        raise NotImplementedError
+        """Attach tree other_tree as a child-subtree of Position p, leaving
+        other_tree empty. Raise TypeError if other_tree is not the same type
+        of tree as this one.
+
+        Args:
+            p (Position): Position object in this tree.
+            other_tree (GeneralTree): tree whose nodes move into this tree.
+        """
+        node = self._validate(p)
+        if type(other_tree) is not type(self):
+            raise TypeError("Tree types must match")
+        if other_tree.is_empty():
+            return
+        subtree_root = other_tree._root
+        subtree_root._parent = node
+        node._children.append(subtree_root)
+        stack = [subtree_root]
+        while stack: # fix depths, and drop Positions cached for other_tree
+            current = stack.pop()
+            current._depth += node._depth + 1
+            current._position = None
+            stack.extend(current._children)
+        self._size += other_tree._size
+        other_tree._root = None # other_tree's Positions are now invalid there
+        other_tree._size = 0
+
+    def _shift_depths(self, node, delta):
+        """Add delta to the stored depth of node and every node below it."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current._depth += delta
+            stack.extend(current._children)
     
     def _delete(self, p):
         """
@@ -168,6 +240,7 @@ class GeneralTree:
             child = node._children[0] # better for time or space to list.pop()?
         if child is not None:
             child._parent = node._parent # child's grandparent becomes parent
+            self._shift_depths(child, -1) # child's subtree moves up a level
         if node is self._root:
             self._root = child # child becomes root
         else:
@@ -302,10 +375,8 @@ class GeneralTree:
         Returns:
             (int): int indicating position's height
         """
-        if self.is_root(position):
-            return 0
-        else:
-            return 1 + self.depth(self.parent(position))
+        return self._validate(position)._depth # O(1), kept up to date by
+                                                # the nonpublic updaters
 
     def preorder(self):
         """Generate a preorder-traversal iteration of all positions in the tree.
@@ -338,14 +409,13 @@ class GeneralTree:
             (Position): The next position reached by a breadth-first traversal.
         """
         if not self.is_empty():
-            fringe = LinkedQueue() # Enqueue positions that are known but not yet
-            fringe.enqueue(self.root()) #   visited.
+            fringe = ArrayQueue() # Enqueue nodes that are known but not yet
+            fringe.enqueue(self._root) #   visited.
             while not fringe.is_empty():
-                position = fringe.dequeue() # remove from front of queue
-                yield position
-                for child in self.children(position):
-                    fringe.enqueue(child) # Add each child of the newly visited
-                                            #  position to the queue
+                node = fringe.dequeue() # remove from front of queue
+                yield self._make_position(node)
+                fringe.enqueue_many(node._children) # internal, so no need to
+                                                    #   validate each child
 
     def children(self, position):
         """Generate an iteration of Positions representing the children nodes
@@ -391,23 +461,34 @@ class GeneralTree:
 
     # --------------------- nonpublic traversal methods ----------------------
 
+    # Both traversals keep an explicit stack instead of nesting one generator
+    #   per level, so yielding a position costs O(1) amortized rather than
+    #   O(depth), and deep trees can't hit the interpreter's recursion limit.
+
     def _subtree_preorder(self, p):
         """Generate a preorder iteration of positions in subtree rooted at
         Position p."""
-        yield p # yielding p to the caller (other method in this class)
-                #   implements performing the "visit".
-        for c in self.children(p):
-           for other in self._subtree_preorder(c): # recursively do preorder on
-                                                    #   c's subtree
-               yield other # ...and yield each to the caller
-        
+        stack = [self._validate(p)]
+        while stack:
+            node = stack.pop()
+            yield self._make_position(node) # yielding to the caller (other
+                                            #   method in this class)
+                                            #   implements performing the "visit".
+            stack.extend(reversed(node._children)) # so first child pops next
+
     def _subtree_postorder(self, p):
         """Generate a postorder iteration of positions in subtree rooted at
         Position p."""
-        for c in self.children(p): # for each child c
-            for other in self._subtree_postorder(c): # do postorder of child's
-                yield other         # subtrees, yielding each subtree to caller
-        yield p # perform visit action "post" recursing over all children
+        node = self._validate(p)
+        stack = [(node, iter(node._children))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is not None: # descend into the next child first...
+                stack.append((child, iter(child._children)))
+            else:
+                stack.pop()
+                yield self._make_position(node) # ...visit "post" all children
 
     # ------------------------- visual output methods --------------------------
     def parenthesize(self, position):
@@ -417,38 +498,43 @@ class GeneralTree:
         Returns:
             (str): String representation of the tree.
         """
-        characters = []
-        characters.append(str(position.element()))
-        if not self.is_leaf(position):
-            first_time = True
-            for c in self.children(position):
-                sep = ' (' if first_time else ', '
-                characters.append(sep)
-                first_time = False # any future passes won't be first
-                characters.append(self.parenthesize(c)) # recurse
-            characters.append(')')
+        node = self._validate(position)
+        characters = [str(node._element)]
+        # Each stack frame is [node, iterator over its children, True until
+        #   the first child has been written].
+        stack = [[node, iter(node._children), True]]
+        while stack:
+            frame = stack[-1]
+            child = next(frame[1], None)
+            if child is not None:
+                characters.append(' (' if frame[2] else ', ')
+                frame[2] = False # any future passes won't be first
+                characters.append(str(child._element))
+                stack.append([child, iter(child._children), True])
+            else:
+                stack.pop()
+                if not frame[2]: # had at least one child
+                    characters.append(')')
         return ''.join(characters)
 
-class LinkedQueue:
-    """FIFO queue implementation using a singly linked list for storage."""
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
 
-    class _Node:
+class ArrayQueue:
+    """FIFO queue implementation using a circular Python list (ring buffer)
+    for storage. Slots are allocated in blocks, doubling when full, so
+    enqueueing doesn't allocate per element."""
 
-        __slots__ = '_element', '_next'
-                                        
-        def __init__(self, element, next):
-            """
-            Args:
-                _next (_Node): another _Node object.
-                _element (object): object of whatever type is stored in the LL stack.
-            """
-            self._element = element # reference to user's element
-            self._next = next # reference to next node
+    DEFAULT_CAPACITY = 64 # initial length of the underlying list
 
-    def __init__(self):
-        """Create an empty queue."""
-        self._head = None
-        self._tail = None
+    __slots__ = '_data', '_front', '_size'
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """Create an empty queue with room for capacity elements before it
+        has to grow."""
+        self._data = [None] * max(capacity, 1)
+        self._front = 0 # index of the first element in _data
         self._size = 0 # number of queue elements
 
     def __len__(self):
@@ -461,30 +547,55 @@ class LinkedQueue:
 
     def first(self):
         """Return (but don't remove) the element at the front of the queue."""
-        if self.is_empty():
+        if self._size == 0:
             raise Empty('Queue is empty')
-        return self._head._element # front aligned with head of list
+        return self._data[self._front]
 
     def dequeue(self):
         """Remove and return the first element of the queue (i.e. FIFO). Raise Empty
         exception if the queue is empty.
         """
-        if self.is_empty():
+        if self._size == 0:
             raise Empty('Queue is empty')
-        answer = self._head._element
-        self._head = self._head._next
+        data = self._data
+        front = self._front
+        answer = data[front]
+        data[front] = None # help garbage collection
+        self._front = (front + 1) % len(data)
         self._size -= 1
-        if self.is_empty(): # If completion of this dequeue emptied the queue
-            self._tail = None # Removed head had been the tail.
         return answer
 
     def enqueue(self, e):
         """Add an element to the back of the queue."""
-        newest = self._Node(e, None) # node will be new tail node bc it's
-                                    #       going in at end
-        if self.is_empty():
-            self._head = newest
-        else:
-            self._tail._next = newest
-        self._tail = newest # update reference to tail node
-        self._size += 1    
+        if self._size == len(self._data):
+            self._resize(2 * len(self._data)) # double the underlying list
+        data = self._data
+        data[(self._front + self._size) % len(data)] = e
+        self._size += 1
+
+    def enqueue_many(self, elements):
+        """Add each element of the sequence elements to the back of the
+        queue, in order, growing the storage at most once."""
+        count = len(elements)
+        if count == 0:
+            return
+        capacity = len(self._data)
+        if self._size + count > capacity:
+            while self._size + count > capacity:
+                capacity *= 2
+            self._resize(capacity)
+        data = self._data
+        back = (self._front + self._size) % capacity
+        split = min(count, capacity - back) # room before wrapping around
+        data[back:back + split] = elements[:split]
+        if split < count:
+            data[:count - split] = elements[split:]
+        self._size += count
+
+    def _resize(self, capacity):
+        """Move the elements, front first, into a new list of length
+        capacity."""
+        old = self._data
+        front = self._front
+        self._data = old[front:] + old[:front] + [None] * (capacity - len(old))
+        self._front = 0
@@ -0,0 +1,105 @@
+"""
+Opt-in instrumentation for GameTree searches: SearchStats, a record of what
+one optimal_move() call did, and SearchHook, for running code such as a
+profiler around each optimal_move() call.
+"""
+
+import cProfile
+
+class SearchStats:
+    """Counters and timings for the most recent optimal_move() call of the
+    GameTree it was given to. Filled in after each call; read the attributes
+    directly.
+
+    Attributes:
+        nodes_created (int): nodes added to the tree; 0 for the alpha-beta
+            searches, which don't build one.
+        nodes_visited (int): boardstates examined (GameTree.nodes_visited()).
+        nodes_scored (int): tree nodes given a minimax score.
+        max_depth (int): deepest boardstate examined, in moves below the
+            board searched.
+        cache_hits (int): transposition table lookups that found an entry.
+        cache_misses (int): transposition table lookups that didn't.
+        prunes (int): alpha-beta cutoffs, plus positions where an immediate
+            win meant the other moves weren't searched.
+        build_time (float): seconds spent building the tree.
+        score_time (float): seconds spent on everything else, which is
+            mostly scoring: the whole search for alpha-beta.
+    """
+
+    __slots__ = 'nodes_created', 'nodes_visited', 'nodes_scored', \
+                'max_depth', 'cache_hits', 'cache_misses', 'prunes', \
+                'build_time', 'score_time'
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Set every counter and timing to 0."""
+        self.nodes_created = 0
+        self.nodes_visited = 0
+        self.nodes_scored = 0
+        self.max_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.prunes = 0
+        self.build_time = 0.0
+        self.score_time = 0.0
+
+    def as_dict(self):
+        """Return the stats as a dict of attribute name -> value."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        """Return the stats as a short report for the command line."""
+        total = (self.build_time + self.score_time) * 1000
+        return (f"{total:.1f} ms (build {self.build_time * 1000:.1f} ms, "
+                f"score {self.score_time * 1000:.1f} ms)\n"
+                f"    nodes: {self.nodes_visited} visited, "
+                f"{self.nodes_created} created, {self.nodes_scored} scored, "
+                f"max depth {self.max_depth}\n"
+                f"    cache: {self.cache_hits} hits, {self.cache_misses} "
+                f"misses; {self.prunes} prunes")
+
+class SearchHook:
+    """Base class for code to run around each optimal_move() call of a
+    GameTree (see GameTree.add_hook()). Override either method."""
+
+    def start(self, board):
+        """Called before the search starts.
+
+        Args:
+            board (TicTacToeBoard): board about to be searched.
+        """
+        pass
+
+    def stop(self, board, move):
+        """Called after the search, even if it raised an exception.
+
+        Args:
+            board (TicTacToeBoard): board that was searched.
+            move (tuple): move found, or None if the search raised.
+        """
+        pass
+
+class ProfileHook(SearchHook):
+    """Profile every optimal_move() call with cProfile, accumulating into
+    one profile."""
+
+    def __init__(self, profile=None):
+        """
+        Args:
+            profile (cProfile.Profile): profile to collect into, defaulting
+                to a new one.
+        """
+        self._profile = profile if profile is not None else cProfile.Profile()
+
+    def profile(self):
+        """Return the cProfile.Profile, e.g. for pstats.Stats(hook.profile())."""
+        return self._profile
+
+    def start(self, board):
+        self._profile.enable()
+
+    def stop(self, board, move):
+        self._profile.disable()
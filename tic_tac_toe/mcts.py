@@ -0,0 +1,206 @@
+"""
+MCTSTree class, a Monte Carlo Tree Search (UCT) engine: an alternative to
+GameTree's minimax for boards too big to search exhaustively.
+"""
+
+import math
+import random
+import time
+
+try:
+    from tic_tac_toe.board import TicTacToeBoard
+    from tic_tac_toe.bitboard import BitBoard
+except:
+    from board import TicTacToeBoard
+    from bitboard import BitBoard
+
+DEFAULT_PLAYOUTS = 2000 # playouts per move if no budget is given
+EXPLORATION = math.sqrt(2) # UCT exploration constant
+
+class MCTSTree:
+    """Tree of boardstates grown one node per playout, guided by UCT.
+
+    Each search starts a new tree at the board it's given. Every iteration
+    walks down the tree picking the child with the best upper confidence
+    bound, adds one untried move as a new node, plays random moves from
+    there to the end of the game, and credits the result to every node on
+    the path. The move played is the root's most visited child.
+
+    Searches run on a copy of the board in a compact form: a BitBoard for a
+    3 x 3 TicTacToeBoard, else the board's own copy() (MNKBoard is already
+    bit-packed).
+    """
+
+    class _Node:
+        """Lightweight, nonpublic class for storing a tree node."""
+
+        __slots__ = '_move', '_parent', '_children', '_untried', '_visits', \
+                    '_wins', '_mover'
+
+        def __init__(self, move, parent, mover, untried):
+            """
+            Args:
+                move (tuple): (row, column) move that produced this node.
+                parent (_Node): parent node, None for the root.
+                mover (int): mark of the player who made move.
+                untried (list): moves from this node not yet expanded.
+            """
+            self._move = move
+            self._parent = parent
+            self._children = []
+            self._untried = untried
+            self._visits = 0
+            self._wins = 0.0 # mover's wins, plus half a win for each draw
+            self._mover = mover
+
+    def __init__(self, seed=None, exploration=EXPLORATION):
+        """Create an engine.
+
+        Args:
+            seed (int): Seed for the engine's own random number generator,
+                so that searches with the same budget are repeatable. Time
+                budgets stop after however many playouts fit, so only
+                playout budgets are fully deterministic.
+            exploration (float): UCT exploration constant; higher explores
+                less-visited moves more.
+        """
+        self._random = random.Random(seed)
+        self._exploration = exploration
+        self._root = None
+        self._size = 0
+        self._playouts = 0 # playouts run by the last search
+        self._seconds = 0.0 # time the last search took
+
+    def __len__(self):
+        """Return the number of nodes in the last search's tree."""
+        return self._size
+
+    def playouts(self):
+        """Return the number of playouts the most recent optimal_move() call
+        ran."""
+        return self._playouts
+
+    def nodes_visited(self):
+        """Return the number of nodes the most recent optimal_move() call
+        added to its tree (one per playout, less those that ended at a
+        gameover node already in the tree)."""
+        return self._size
+
+    def playouts_per_second(self):
+        """Return the playout rate of the most recent optimal_move() call, or
+        0.0 if it ran none."""
+        if self._seconds <= 0:
+            return 0.0
+        return self._playouts / self._seconds
+
+    def optimal_move(self, board, time_budget=None, playout_budget=None):
+        """
+        Return the move for board's active player with the most visits after
+        searching, as a two-element (row, column) tuple.
+
+        Args:
+            board (TicTacToeBoard): TicTacToeBoard, BitBoard or MNKBoard.
+            time_budget (float): If given, seconds to search for.
+            playout_budget (int): If given, number of playouts to run. If
+                neither budget is given, DEFAULT_PLAYOUTS.
+
+        Returns:
+            (tuple): (row, column) coordinates of the chosen move.
+        """
+        if (time_budget is not None and time_budget <= 0) or \
+                (playout_budget is not None and playout_budget < 1):
+            raise ValueError('Search budgets must be positive')
+        if time_budget is None and playout_budget is None:
+            playout_budget = DEFAULT_PLAYOUTS
+        if isinstance(board, TicTacToeBoard):
+            board = BitBoard(board.board(), board.player())
+        else:
+            board = board.copy()
+        self._playouts = 0
+        self._seconds = 0.0
+        win = board.winning_move()
+        if win is not None: # no need to search
+            self._root = None
+            self._size = 0
+            return win
+        empties = [(row, col) for row, line in enumerate(board.board())
+                   for col, mark in enumerate(line) if mark == 0]
+        self._root = self._Node(None, None, board.opponent(),
+                                self._shuffled(empties))
+        self._size = 1
+        start = time.perf_counter()
+        deadline = None if time_budget is None else start + time_budget
+        while True:
+            if playout_budget is not None and self._playouts >= playout_budget:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(board, empties)
+        self._seconds = time.perf_counter() - start
+        best = max(self._root._children, key=lambda child: child._visits,
+                   default=None)
+        return best._move if best is not None else None
+
+    def _shuffled(self, moves):
+        """Return a shuffled copy of moves, so nodes expand in random
+        order."""
+        moves = moves[:]
+        self._random.shuffle(moves)
+        return moves
+
+    def _iterate(self, root_board, root_empties):
+        """Run one select, expand, play out and back up iteration."""
+        board = root_board.copy()
+        empties = root_empties[:]
+        node = self._root
+        # Select: descend through fully expanded nodes by UCT.
+        while not node._untried and node._children:
+            node = self._select_child(node)
+            board.mark(*node._move)
+            empties.remove(node._move)
+        # Expand: add one untried move, unless the game is already over.
+        if node._untried and board.winner() is None:
+            move = node._untried.pop()
+            mover = board.player()
+            board.mark(*move)
+            empties.remove(move)
+            child = self._Node(move, node, mover, self._shuffled(empties)
+                               if board.winner() is None else [])
+            node._children.append(child)
+            self._size += 1
+            node = child
+        winner = self._playout(board, empties)
+        self._playouts += 1
+        # Back up: credit the result to the player who moved into each node.
+        while node is not None:
+            node._visits += 1
+            if winner == node._mover:
+                node._wins += 1.0
+            elif winner == 3:
+                node._wins += 0.5
+            node = node._parent
+
+    def _select_child(self, node):
+        """Return node's child with the highest upper confidence bound."""
+        log_visits = math.log(node._visits)
+        exploration = self._exploration
+        best = None
+        best_bound = -1.0
+        for child in node._children:
+            bound = child._wins / child._visits + \
+                exploration * math.sqrt(log_visits / child._visits)
+            if bound > best_bound:
+                best_bound = bound
+                best = child
+        return best
+
+    def _playout(self, board, empties):
+        """Play uniformly random moves on board until the game ends and
+        return the winner (1, 2, or 3 for a draw). Changes board and
+        empties."""
+        choice = self._random.randrange
+        while board.winner() is None:
+            index = choice(len(empties))
+            empties[index], empties[-1] = empties[-1], empties[index]
+            board.mark(*empties.pop())
+        return board.winner()
@@ -0,0 +1,254 @@
+"""
+MNKBoard class, a generalization of TicTacToeBoard to an m x n grid where k
+marks in a row win: (3, 3, 3) is tic tac toe, (4, 4, 4) and (5, 5, 4) larger
+variants, (15, 15, 5) Gomoku.
+"""
+
+# Directions a line can run in, as (row step, column step): across, down, down
+#   and to the right, down and to the left.
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+class _Geometry:
+    """Precomputed line tables shared by every board with the same m, n
+    and k.
+
+    Square (row, col) is bit n * row + col. masks is a bitmask for every line
+    of k squares, and masks_through[square] the masks of the lines passing
+    through square, so a mark only has to check those lines for a win.
+    """
+
+    __slots__ = 'm', 'n', 'k', 'squares', 'full', 'masks', 'masks_through'
+
+    def __init__(self, m, n, k):
+        self.m = m
+        self.n = n
+        self.k = k
+        self.squares = m * n
+        self.full = (1 << self.squares) - 1
+        masks = []
+        for row in range(m):
+            for col in range(n):
+                for row_step, col_step in _DIRECTIONS:
+                    end_row = row + row_step * (k - 1)
+                    end_col = col + col_step * (k - 1)
+                    if 0 <= end_row < m and 0 <= end_col < n:
+                        mask = 0
+                        for i in range(k):
+                            mask |= 1 << (n * (row + row_step * i)
+                                          + col + col_step * i)
+                        masks.append(mask)
+        self.masks = tuple(masks)
+        self.masks_through = tuple(
+            tuple(mask for mask in masks if mask >> square & 1)
+            for square in range(self.squares))
+
+_GEOMETRIES = {} # (m, n, k) -> _Geometry, built once per board size
+
+def geometry(m, n, k):
+    """Return the shared _Geometry for m x n boards with k in a row to win,
+    building it the first time it's asked for. Raise ValueError if k can't
+    fit on the board."""
+    key = (m, n, k)
+    if key not in _GEOMETRIES:
+        if m < 1 or n < 1 or k < 1 or k > max(m, n):
+            raise ValueError(f'No line of {k} fits on a {m} x {n} board')
+        _GEOMETRIES[key] = _Geometry(m, n, k)
+    return _GEOMETRIES[key]
+
+class MNKBoard:
+    """Board for an m,n,k-game, storing X's and O's marks as two m * n bit
+    ints.
+
+    Public methods follow the same contracts as TicTacToeBoard's, so GameTree
+    can search an MNKBoard the same way. Marks are 0 for a blank square, 1 for
+    X and 2 for O. The winner is worked out incrementally by mark(), which
+    only checks the lines through the marked square.
+
+    The board isn't reduced by symmetry: canonical() returns an unchanged
+    copy with the identity transform, and canonical_key() equals packed().
+    Keys of boards of different sizes can collide, so don't share one
+    TranspositionTable between sizes.
+    """
+
+    __slots__ = '_geometry', '_x', '_o', '_player', '_winner'
+
+    def __init__(self, m=3, n=3, k=3, grid=None, player=1):
+        """
+        Args:
+            m (int): number of rows.
+            n (int): number of columns.
+            k (int): number of marks in a row that wins.
+            grid (list): Optional m x n array of integers 0, 1, or 2 to start
+                from.
+            player (int): 1 if X is to move, 2 if O.
+        """
+        self._geometry = geometry(m, n, k)
+        self._x = 0
+        self._o = 0
+        self._player = player
+        if grid is not None:
+            if len(grid) != m or any(len(row) != n for row in grid):
+                raise ValueError(f'Grid must be {m} x {n}')
+            bit = 1
+            for row in grid:
+                for mark in row:
+                    if mark == 1:
+                        self._x |= bit
+                    elif mark == 2:
+                        self._o |= bit
+                    bit <<= 1
+        self._winner = self._find_winner()
+
+    def _find_winner(self):
+        """Return what winner() should return, checking every line."""
+        for mask in self._geometry.masks:
+            if self._x & mask == mask:
+                return 1
+            if self._o & mask == mask:
+                return 2
+        if self._x | self._o == self._geometry.full:
+            return 3
+        return None
+
+    @classmethod
+    def from_packed(cls, packed, m=3, n=3, k=3):
+        """Return a new MNKBoard from an int produced by packed() on an
+        m x n board with k in a row to win."""
+        board = cls.__new__(cls)
+        board._geometry = geometry(m, n, k)
+        squares = board._geometry.squares
+        board._x = packed & board._geometry.full
+        board._o = (packed >> squares) & board._geometry.full
+        board._player = ((packed >> (2 * squares)) & 1) + 1
+        board._winner = board._find_winner()
+        return board
+
+    def dimensions(self):
+        """Return (m, n, k): rows, columns, and marks in a row to win."""
+        return self._geometry.m, self._geometry.n, self._geometry.k
+
+    def packed(self) -> int:
+        """Return the whole boardstate as a single int: X's marks in the low
+        m * n bits, O's in the next m * n, then a bit set if O is to move."""
+        squares = self._geometry.squares
+        return self._x | (self._o << squares) | \
+            ((self._player - 1) << (2 * squares))
+
+    def canonical_key(self) -> int:
+        """Return packed(); MNKBoards aren't reduced by symmetry."""
+        return self.packed()
+
+    def canonical(self):
+        """Return a copy of this board and transform 0, the identity, which
+        GameTree treats like a real symmetry transform."""
+        return self.copy(), 0
+
+    def copy(self):
+        """Return a new, independent MNKBoard with the same boardstate."""
+        board = MNKBoard.__new__(MNKBoard)
+        board._geometry = self._geometry
+        board._x = self._x
+        board._o = self._o
+        board._player = self._player
+        board._winner = self._winner
+        return board
+
+    def mark(self, row: int, col: int) -> None:
+        """Put the current player's mark at position (row, col) and swap the
+        active player, checking only the lines through that square for a
+        win."""
+        geometry = self._geometry
+        if not (0 <= row < geometry.m and 0 <= col < geometry.n):
+            raise ValueError('Invalid board position')
+        square = geometry.n * row + col
+        bit = 1 << square
+        if (self._x | self._o) & bit:
+            raise ValueError('Board position occupied')
+        if self._winner is not None:
+            raise ValueError('Game is already complete')
+        mover = self._player
+        if mover == 1:
+            self._x |= bit
+            bits = self._x
+            self._player = 2
+        else:
+            self._o |= bit
+            bits = self._o
+            self._player = 1
+        for mask in geometry.masks_through[square]:
+            if bits & mask == mask:
+                self._winner = mover
+                return
+        if self._x | self._o == geometry.full:
+            self._winner = 3
+
+    def _is_win(self, mark):
+        """Return True if the player with the given mark (1 or 2) has k in
+        a row."""
+        bits = self._x if mark == 1 else self._o
+        for mask in self._geometry.masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def line_counts(self):
+        """Return a list of (X's marks, O's marks) on each line of k
+        squares."""
+        x, o = self._x, self._o
+        return [(bin(x & mask).count('1'), bin(o & mask).count('1'))
+                for mask in self._geometry.masks]
+
+    def winner(self):
+        """Return mark of winning player, 3 to indicate a tie, None to if
+        game in progress. O(1)."""
+        return self._winner
+
+    def winning_move(self):
+        """Return the (row, col) square where the player to move would
+        complete k in a row, the first in row-major order if there are
+        several, or None if there's no such square or the game is over."""
+        if self._winner is not None:
+            return None
+        if self._player == 1:
+            mine, theirs = self._x, self._o
+        else:
+            mine, theirs = self._o, self._x
+        need = self._geometry.k - 1
+        squares = 0
+        for mask in self._geometry.masks:
+            if not theirs & mask and bin(mine & mask).count('1') == need:
+                squares |= mask & ~mine # the one blank square on the line
+        if not squares:
+            return None
+        return divmod((squares & -squares).bit_length() - 1, self._geometry.n)
+
+    def board(self) -> list:
+        """Return the current board state as a new m x n array in 0 / 1 / 2
+        notation. Changes to the returned list don't affect the board."""
+        m, n = self._geometry.m, self._geometry.n
+        grid = [[0] * n for j in range(m)]
+        for square in range(m * n):
+            bit = 1 << square
+            if self._x & bit:
+                grid[square // n][square % n] = 1
+            elif self._o & bit:
+                grid[square // n][square % n] = 2
+        return grid
+
+    def player(self):
+        """Return 1 if it's X's turn to move, 2 if O's."""
+        return self._player
+
+    def opponent(self):
+        """Return 1 if non-mover player is 'X', 2 if 'O'."""
+        return 2 if self._player == 1 else 1
+
+    def __str__(self):
+        """Return string representation of the board in its current state,
+        in the same style as TicTacToeBoard's."""
+        colwidth = 5
+        rows = []
+        for row in self.board():
+            rows.append('|'.join(
+                f"{' XO'[mark].strip():^{colwidth}}" for mark in row))
+        return ('\n' + '-' * (6 * self._geometry.n) + '\n').join(rows)
@@ -0,0 +1,156 @@
+"""
+ParallelSearch class, root-parallel alpha-beta search: the moves from the
+root are searched in worker processes and their scores merged into the move
+GameTree.optimal_move(board, search='alphabeta') picks on one core.
+
+Boards cross the process boundary as packed ints plus the board's (m, n, k)
+dimensions, not as pickled board objects. Each worker process keeps one
+GameTree, and so one transposition table, per board size for as long as the
+pool lives, so later searches reuse earlier ones' results.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import os
+
+try:
+    from tic_tac_toe.bitboard import BitBoard
+    from tic_tac_toe.board import TicTacToeBoard, transform_move, \
+        inverse_transform
+    from tic_tac_toe.game_tree import GameTree
+    from tic_tac_toe.mnk_board import MNKBoard
+except:
+    from bitboard import BitBoard
+    from board import TicTacToeBoard, transform_move, inverse_transform
+    from game_tree import GameTree
+    from mnk_board import MNKBoard
+
+_worker_trees = {} # dimensions -> GameTree, in each worker process
+
+def pack(board):
+    """Return (packed, dimensions) for sending board to another process:
+    dimensions is None for a 3 x 3 TicTacToeBoard or BitBoard, else the
+    MNKBoard's (m, n, k)."""
+    if isinstance(board, MNKBoard):
+        return board.packed(), board.dimensions()
+    return board.packed(), None
+
+def unpack(packed, dimensions):
+    """Return a board rebuilt from pack()'s output: a BitBoard if
+    dimensions is None, else an MNKBoard."""
+    if dimensions is None:
+        return BitBoard.from_packed(packed)
+    return MNKBoard.from_packed(packed, *dimensions)
+
+def _search_move(packed, dimensions, move, alpha):
+    """Worker task: return (score, nodes visited) for the player to move on
+    the packed board playing move, as GameTree._alphabeta() scores it with
+    the given lower bound."""
+    tree = _worker_trees.get(dimensions)
+    if tree is None:
+        tree = _worker_trees[dimensions] = GameTree()
+    board = unpack(packed, dimensions)
+    tree._set_scale(board)
+    player = board.player()
+    board.mark(move[0], move[1])
+    tree._nodes_visited = 0
+    score = tree._alphabeta(board, alpha, tree._win_score + 1, False, player)
+    return score, tree._nodes_visited
+
+class ParallelSearch:
+    """Alpha-beta search with the root's moves split across a process
+    pool."""
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int): number of worker processes, defaulting to the
+                number of CPUs.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError('workers must be positive')
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = None # started by the first search that needs it
+        self._tree = GameTree() # for the shortcuts and move generation
+        self._nodes_visited = 0
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def nodes_visited(self):
+        """Return the number of boardstates the most recent optimal_move()
+        call examined, summed over all workers."""
+        return self._nodes_visited
+
+    def optimal_move(self, board):
+        """
+        Return the optimal next move for board's active player, the same
+        move GameTree().optimal_move(board, search='alphabeta') returns.
+
+        The first move is searched on its own to get a lower bound on the
+        root's score. The rest are then handed out in row-major order, one
+        per worker at a time, each with the best score of the
+        earlier moves finished so far as its alpha bound. Bounds only ever
+        come from earlier moves, so a later move still has to score strictly
+        better to be chosen, and ties go to the first move as they do in
+        one process.
+
+        Args:
+            board (TicTacToeBoard): TicTacToeBoard, BitBoard or MNKBoard.
+
+        Returns:
+            (tuple): (row, column) coordinates of optimal move for board's
+                active player.
+        """
+        self._nodes_visited = 0
+        move = self._tree._shortcut_move(board)
+        if move is not None:
+            return move
+        canonical, transform = board.canonical()
+        moves = self._tree._board_moves(canonical)
+        if not moves:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers)
+        packed, dimensions = pack(canonical)
+        self._tree._set_scale(canonical)
+        alpha = -self._tree._win_score - 1 # Must be below any real score
+        scores = {}
+        index = 0
+        pending = {}
+        while index < len(moves) or pending:
+            # Keep the pool busy, except while the first move establishes
+            #   the first bound.
+            while index < len(moves) and \
+                    len(pending) < (self._workers if index else 1):
+                future = self._executor.submit(_search_move, packed,
+                                               dimensions, moves[index],
+                                               self._bound(scores, index))
+                pending[future] = index
+                index += 1
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                score, nodes = future.result()
+                scores[pending.pop(future)] = score
+                self._nodes_visited += nodes
+        best_move = None
+        for i, move in enumerate(moves):
+            if scores[i] > alpha: # a later move has to be strictly better
+                alpha = scores[i]
+                best_move = move
+        self._nodes_visited += 1 # the root
+        return transform_move(best_move, inverse_transform(transform))
+
+    def _bound(self, scores, index):
+        """Return the alpha bound for searching moves[index]: the best score
+        among the finished moves before it."""
+        return max((score for i, score in scores.items() if i < index),
+                   default=-self._tree._win_score - 1)
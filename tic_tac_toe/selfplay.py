@@ -0,0 +1,282 @@
+"""
+Headless self-play: play many computer vs. computer games across a process
+pool with no terminal I/O, streaming a compact record of each game, and
+report throughput and per-move latency. Doubles as a soak and load test of
+the engines.
+
+    $ python -m tic_tac_toe.selfplay --games 1000 --x minimax --o mcts \\
+          --workers 4 --output games.jsonl
+
+Each output line is one game as JSON: its index and seed, the engines, the
+moves as square indices (3 * row + col on a 3 x 3 board), the winner (1, 2,
+or 3 for a draw) and each move's latency in milliseconds.
+"""
+
+import argparse
+import array
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from tic_tac_toe.board import TicTacToeBoard
+    from tic_tac_toe.engines import ENGINES, make_engine
+    from tic_tac_toe.mnk_board import MNKBoard
+    from tic_tac_toe.tablebase import DEFAULT_PATH, write_tablebase
+except:
+    from board import TicTacToeBoard
+    from engines import ENGINES, make_engine
+    from mnk_board import MNKBoard
+    from tablebase import DEFAULT_PATH, write_tablebase
+
+DEFAULT_CHUNK_SIZE = 16 # games sent to a worker at a time
+
+_worker_engines = {} # (name, dimensions, options) -> Engine, in each process
+
+def _engine(name, options, dimensions):
+    """Return this process's engine for name and options on boards of
+    dimensions, creating it the first time, so a worker's engines (and their
+    tables) last across games. Each board size gets its own engine, since
+    keys of boards of different sizes collide in a transposition table."""
+    key = (name, dimensions and tuple(dimensions),
+           tuple(sorted(options.items())))
+    engine = _worker_engines.get(key)
+    if engine is None:
+        engine = _worker_engines[key] = make_engine(name, **options)
+    return engine
+
+def check_dimensions(engines, dimensions):
+    """Raise ValueError if an engine in engines can't play on boards of
+    dimensions: the 'tablebase' engine knows 3 x 3 boards only."""
+    if 'tablebase' in engines and dimensions is not None and \
+            tuple(dimensions) != (3, 3, 3):
+        raise ValueError('The tablebase engine plays 3 x 3 boards only')
+
+def check_tablebase(engines, tablebase_path=DEFAULT_PATH):
+    """Raise ValueError if the 'tablebase' engine is in engines but its file
+    is missing, so the error comes before any worker starts rather than from
+    inside one."""
+    if 'tablebase' in engines and not os.path.exists(tablebase_path):
+        raise ValueError(f'No tablebase at {tablebase_path}; write it with '
+                         f'`python -m tic_tac_toe.tablebase`')
+
+def new_board(dimensions=None):
+    """Return a blank board: a TicTacToeBoard, or an MNKBoard if dimensions
+    (m, n, k) are given."""
+    if dimensions is None:
+        return TicTacToeBoard()
+    return MNKBoard(*dimensions)
+
+def play_game(engine_x, engine_o, seed, dimensions=None):
+    """
+    Play one game between two engines and return its record.
+
+    Args:
+        engine_x (Engine): plays X, moving first.
+        engine_o (Engine): plays O. May be the same object as engine_x.
+        seed (int): seed for both engines' random choices; O's is seed + 1
+            so the two don't mirror each other.
+        dimensions (tuple): (m, n, k), or None for 3 x 3.
+
+    Returns:
+        (dict): game record; see the module docstring.
+    """
+    board = new_board(dimensions)
+    columns = len(board.board()[0])
+    engine_x.new_game(seed)
+    if engine_o is not engine_x:
+        engine_o.new_game(seed + 1)
+    moves = []
+    latencies = []
+    while board.winner() is None:
+        engine = engine_x if board.player() == 1 else engine_o
+        start = time.perf_counter()
+        row, col = engine.move(board)
+        latencies.append(round((time.perf_counter() - start) * 1000, 3))
+        board.mark(row, col)
+        moves.append(row * columns + col)
+    return {'seed': seed, 'x': engine_x.name(), 'o': engine_o.name(),
+            'moves': moves, 'winner': board.winner(), 'ms': latencies}
+
+def play_chunk(x, o, options, seeds, dimensions=None):
+    """
+    Play one game per seed with this process's engines and return their
+    records. This is the task run() and tournament.run_tournament() send to
+    worker processes.
+
+    Args:
+        x (str): engine for X, one of engines.ENGINES.
+        o (str): engine for O.
+        options (dict): time_budget, node_budget or tablebase_path for
+            engines.make_engine().
+        seeds (list): one seed per game; see play_game().
+        dimensions (tuple): (m, n, k), or None for 3 x 3.
+
+    Returns:
+        (list): game records, one per seed.
+    """
+    engine_x = _engine(x, options, dimensions)
+    engine_o = engine_x if o == x else _engine(o, options, dimensions)
+    return [play_game(engine_x, engine_o, seed, dimensions) for seed in seeds]
+
+def run(games, x='minimax', o='minimax', workers=1, seed=0, dimensions=None,
+        chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Generate the records of games self-play games, in order, game i played
+    with seed seed + 2 * i. Records also get a 'game' index.
+
+    Args:
+        games (int): number of games.
+        x (str): engine for X, one of engines.ENGINES.
+        o (str): engine for O.
+        workers (int): processes to play in. 1 plays in this process.
+        seed (int): base seed.
+        dimensions (tuple): (m, n, k), or None for 3 x 3.
+        chunk_size (int): games per task sent to a worker.
+        **options: time_budget, node_budget or tablebase_path for
+            engines.make_engine().
+
+    Yields:
+        (dict): game records.
+    """
+    if workers < 1 or chunk_size < 1:
+        raise ValueError('workers and chunk_size must be positive')
+    check_dimensions((x, o), dimensions)
+    check_tablebase((x, o), options.get('tablebase_path', DEFAULT_PATH))
+    chunks = ([seed + 2 * i for i in range(first, min(first + chunk_size,
+                                                     games))]
+              for first in range(0, games, chunk_size))
+    index = 0
+    if workers == 1:
+        for chunk in chunks:
+            for record in play_chunk(x, o, options, chunk, dimensions):
+                yield dict(game=index, **record)
+                index += 1
+        return
+    executor = ProcessPoolExecutor(workers)
+    pending = deque() # at most two chunks per worker in flight
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(executor.submit(play_chunk, x, o, options,
+                                               chunk, dimensions))
+            if not pending:
+                return
+            for record in pending.popleft().result():
+                yield dict(game=index, **record)
+                index += 1
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9, so cancel by hand.
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+def percentile(ordered, fraction):
+    """Return the nearest-rank percentile of an ascending list, e.g. fraction
+    0.99 for the 99th percentile; 0.0 for an empty list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(len(ordered) * fraction))
+    return ordered[rank - 1]
+
+class Summary:
+    """Running totals over a stream of game records."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._games = 0
+        self._results = {1: 0, 2: 0, 3: 0}
+        self._latencies = array.array('d') # 8 bytes a move, for long runs
+
+    def add(self, record):
+        """Count one game record."""
+        self._games += 1
+        self._results[record['winner']] += 1
+        self._latencies.extend(record['ms'])
+
+    def report(self):
+        """Return a dict of games, X wins, O wins, draws, games/sec, and
+        per-move latency percentiles in milliseconds."""
+        seconds = time.perf_counter() - self._start
+        ordered = sorted(self._latencies)
+        return {
+            'games': self._games,
+            'x_wins': self._results[1],
+            'o_wins': self._results[2],
+            'draws': self._results[3],
+            'seconds': seconds,
+            'games_per_sec': self._games / seconds if seconds > 0 else 0.0,
+            'moves': len(ordered),
+            'latency_ms': {name: percentile(ordered, fraction)
+                           for name, fraction in (('p50', 0.5), ('p90', 0.9),
+                                                  ('p99', 0.99),
+                                                  ('max', 1.0))},
+        }
+
+def parse_dimensions(text):
+    """Return (m, n, k) from 'm,n,k' text."""
+    m, n, k = (int(part) for part in text.split(','))
+    return m, n, k
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Play computer vs. computer games without a terminal UI.')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--x', choices=ENGINES, default='minimax',
+                        help='engine playing X (default minimax)')
+    parser.add_argument('--o', choices=ENGINES, default='minimax',
+                        help='engine playing O (default minimax)')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--board', type=parse_dimensions, default=None,
+                        metavar='M,N,K', help='play an m,n,k-game instead of '
+                                              '3 x 3 tic tac toe')
+    parser.add_argument('--time', type=float, default=None, metavar='SECONDS',
+                        help='time budget per move')
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='node budget per move (playouts for mcts)')
+    parser.add_argument('--tablebase', default=DEFAULT_PATH,
+                        help='tablebase file, written first if missing')
+    parser.add_argument('--output', help='write game records to this file as '
+                                         'JSON lines')
+    args = parser.parse_args(argv)
+    if args.games < 1 or args.workers < 1:
+        parser.error('--games and --workers must be positive')
+    try:
+        check_dimensions((args.x, args.o), args.board)
+    except ValueError as error:
+        parser.error(str(error))
+    if 'tablebase' in (args.x, args.o) and not os.path.exists(args.tablebase):
+        print(f'Writing tablebase to {args.tablebase}')
+        write_tablebase(args.tablebase)
+    summary = Summary()
+    output = open(args.output, 'w') if args.output else None
+    try:
+        for record in run(args.games, args.x, args.o, args.workers, args.seed,
+                          args.board, time_budget=args.time,
+                          node_budget=args.nodes,
+                          tablebase_path=args.tablebase):
+            summary.add(record)
+            if output is not None:
+                output.write(json.dumps(record, separators=(',', ':')) + '\n')
+    finally:
+        if output is not None:
+            output.close()
+    report = summary.report()
+    latency = report['latency_ms']
+    print(f"{report['games']} games in {report['seconds']:.2f} s "
+          f"({report['games_per_sec']:.1f} games/sec): X {report['x_wins']}, "
+          f"O {report['o_wins']}, draws {report['draws']}")
+    print(f"move latency ms: p50 {latency['p50']} p90 {latency['p90']} "
+          f"p99 {latency['p99']} max {latency['max']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
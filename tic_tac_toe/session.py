@@ -0,0 +1,141 @@
+"""
+GameSession, the rules and turn order of one game with no terminal I/O.
+
+A session never waits for input. A frontend gives it a human's move with
+play(), or lets the computer move with step(), and gets back a list of
+Events describing what happened, which it can render however it likes. A
+session is just a board and two Players, so one process can keep thousands
+of them, each advanced only when its player has something to do.
+commandline.CLIBoard is one such frontend.
+"""
+
+from collections import namedtuple
+
+try:
+    from tic_tac_toe.board import TicTacToeBoard
+except:
+    from board import TicTacToeBoard
+
+# Event kinds
+TURN = 'turn' # mark: the player now to move
+MOVED = 'moved' # mark, move: a move was made
+INVALID = 'invalid' # move, reason: a move was refused; nothing changed
+OVER = 'over' # winner: 1 or 2, or 3 for a draw
+
+Event = namedtuple('Event', ['kind', 'mark', 'move', 'winner', 'reason'],
+                   defaults=(None, None, None, None))
+Event.__doc__ = """Something that happened in a GameSession. Only the fields
+listed for its kind are set; the rest are None."""
+
+class GameSession:
+    """One game between two Players, human or computer."""
+
+    def __init__(self, player1, player2, board=None, engine=None):
+        """
+        Args:
+            player1 (Player): first-moving player.
+            player2 (Player): second-moving player.
+            board (TicTacToeBoard): board to play on, marked in place.
+                Defaults to a blank TicTacToeBoard with player1 to move. Any
+                board class with the same interface works.
+            engine: object whose move(board) returns the computer's (row,
+                column) move without marking it, such as an
+                engines.Engine. Needed only if a player is a computer. Calls
+                come only from step(), so sessions advanced one at a time can
+                share an engine.
+        """
+        self._player1 = player1
+        self._player2 = player2
+        if board is None:
+            board = TicTacToeBoard(player=player1.int_marker())
+        self._board = board
+        self._engine = engine
+        self._sync_movers()
+
+    def board(self):
+        """Return the board being played on. Make moves through play() and
+        step(), not by marking it directly."""
+        return self._board
+
+    def winner(self):
+        """Return the board's winner(): 1 or 2, 3 for a draw, None while the
+        game is in progress."""
+        return self._board.winner()
+
+    def is_over(self):
+        """Return True if the game has finished."""
+        return self._board.winner() is not None
+
+    def mover(self):
+        """Return the Player whose turn it is."""
+        if self._player1.int_marker() == self._board.player():
+            return self._player1
+        return self._player2
+
+    def needs_input(self):
+        """Return True if the game is waiting for a human's move."""
+        return not self.is_over() and self.mover().is_human()
+
+    def start(self):
+        """Return the events describing the game's state before any more
+        moves: whose turn it is, or the result if the board's game is already
+        over."""
+        if self.is_over():
+            return [Event(OVER, winner=self._board.winner())]
+        return [Event(TURN, mark=self._board.player())]
+
+    def play(self, row, col):
+        """
+        Make a human player's move.
+
+        Args:
+            row (int): row to mark.
+            col (int): column to mark.
+
+        Returns:
+            (list): Events. A single INVALID event if it isn't a human's turn
+                or the square can't be marked.
+        """
+        if self.is_over():
+            return [Event(INVALID, move=(row, col), reason='Game is over')]
+        if not self.mover().is_human():
+            return [Event(INVALID, move=(row, col),
+                          reason="It's the computer's turn")]
+        return self._mark(row, col)
+
+    def step(self):
+        """
+        Make the computer's move if it's a computer player's turn. This is
+        the only method that searches, so a host decides when to spend the
+        time.
+
+        Returns:
+            (list): Events, empty if it isn't a computer's turn.
+        """
+        if self.is_over() or self.mover().is_human():
+            return []
+        if self._engine is None:
+            raise ValueError('A computer player needs an engine')
+        row, col = self._engine.move(self._board)
+        return self._mark(row, col)
+
+    def _mark(self, row, col):
+        """Mark the square for the player to move and return the events."""
+        mark = self._board.player()
+        try:
+            self._board.mark(row, col)
+        except ValueError as error:
+            return [Event(INVALID, move=(row, col), reason=str(error))]
+        self._sync_movers()
+        events = [Event(MOVED, mark=mark, move=(row, col))]
+        if self.is_over():
+            events.append(Event(OVER, winner=self._board.winner()))
+        else:
+            events.append(Event(TURN, mark=self._board.player()))
+        return events
+
+    def _sync_movers(self):
+        """Set each Player's is_turn() to match the board."""
+        mover = self.mover()
+        self._player1.set_mover(self._player1 is mover)
+        self._player2.set_mover(self._player2 is mover)
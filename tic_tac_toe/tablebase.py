@@ -0,0 +1,191 @@
+"""
+Precomputed solution table ("tablebase") for every reachable tic tac toe
+position, written once to a compact binary file and memory-mapped read-only
+for O(1) move lookups.
+
+Build the table with:
+
+    $ python -m tic_tac_toe.tablebase [path]
+
+File format (little-endian):
+    header: 4-byte magic b'TTTB', uint16 format version, uint16 record size,
+        uint32 record count, uint32 CRC-32 of everything after the header.
+    body: one 2-byte record for every packed board key (see
+        TicTacToeBoard.packed()), indexed directly by key. Byte 0 is the best
+        move's square (3 * row + col), or NO_MOVE if the key isn't a reachable
+        in-progress position. Byte 1 is the position's minimax score as a
+        signed byte, from the point of view of the player to move: WIN_SCORE
+        - d for a win d moves away, -(WIN_SCORE - d) for a loss, 0 for a draw
+        (see board.py).
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import zlib
+
+try:
+    from tic_tac_toe.bitboard import BitBoard
+    from tic_tac_toe.board import WIN_SCORE, shift_score
+except:
+    from bitboard import BitBoard
+    from board import WIN_SCORE, shift_score
+
+MAGIC = b'TTTB'
+VERSION = 3 # 2: scores count moves to the result, 3: WIN_SCORE 100
+HEADER = struct.Struct('<4sHHII')
+RECORD = struct.Struct('<Bb')
+RECORD_COUNT = 1 << 19 # every possible packed key
+NO_MOVE = 0xFF
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'tablebase.bin')
+
+def solve():
+    """Exhaustively solve every in-progress position reachable from a blank
+    board, with either X or O moving first.
+
+    Returns:
+        (dict): packed board key -> (square, score) where square is the best
+            move's square index and score is the minimax score from the point
+            of view of the player to move, preferring the fastest win. Ties go
+            to the lowest square, i.e. the first in row-major order.
+    """
+    solutions = {}
+
+    def negamax(board):
+        key = board.packed()
+        if key in solutions:
+            return solutions[key][1]
+        winner = board.winner()
+        if winner is not None: # the player who just moved won, or a draw
+            return 0 if winner == 3 else -WIN_SCORE
+        best_square = None
+        best_score = -WIN_SCORE - 1 # Must be below any real score
+        for square in range(9):
+            row, col = divmod(square, 3)
+            child = board.copy()
+            try:
+                child.mark(row, col)
+            except ValueError: # occupied
+                continue
+            score = shift_score(-negamax(child), -1) # one move further away
+            if score > best_score:
+                best_score = score
+                best_square = square
+        solutions[key] = (best_square, best_score)
+        return best_score
+
+    negamax(BitBoard(player=1))
+    negamax(BitBoard(player=2))
+    return solutions
+
+def write_tablebase(path=DEFAULT_PATH, solutions=None):
+    """Write a tablebase file to path, replacing any existing file only once
+    the new one is completely written.
+
+    Args:
+        path (str): destination file path.
+        solutions (dict): output of solve(); computed if not given.
+
+    Returns:
+        (int): number of positions written.
+    """
+    if solutions is None:
+        solutions = solve()
+    body = bytearray(RECORD.pack(NO_MOVE, 0) * RECORD_COUNT)
+    for key, (square, score) in solutions.items():
+        RECORD.pack_into(body, key * RECORD.size, square, score)
+    header = HEADER.pack(MAGIC, VERSION, RECORD.size, RECORD_COUNT,
+                         zlib.crc32(body))
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temp_path, path)
+    return len(solutions)
+
+class Tablebase:
+    """Read-only, memory-mapped view of a tablebase file."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """Open and memory-map the file at path, verifying its header and
+        checksum. Raise ValueError if the file isn't a valid tablebase of the
+        current format version.
+
+        Args:
+            path (str): path to a file written by write_tablebase().
+        """
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._verify()
+        except ValueError:
+            self.close()
+            raise
+
+    def _verify(self):
+        """Check the header fields and the body's CRC-32."""
+        if len(self._map) < HEADER.size:
+            raise ValueError('Tablebase file is truncated')
+        magic, version, record_size, count, checksum = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a tablebase file')
+        if version != VERSION:
+            raise ValueError(f'Tablebase format version {version} is not '
+                             f'supported (expected {VERSION})')
+        if record_size != RECORD.size or count != RECORD_COUNT or \
+                len(self._map) != HEADER.size + record_size * count:
+            raise ValueError('Tablebase file has the wrong size')
+        with memoryview(self._map) as view:
+            if zlib.crc32(view[HEADER.size:]) != checksum:
+                raise ValueError('Tablebase checksum mismatch')
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lookup(self, board):
+        """Return (move, score) for board's player to move, or None if board
+        is game over, not a reachable position, or not a 3 x 3 board.
+
+        Args:
+            board (TicTacToeBoard): TicTacToeBoard, BitBoard, or a 3, 3, 3
+                MNKBoard, whose packed() key has the same layout. Other
+                MNKBoards aren't in the file and always give None.
+
+        Returns:
+            (tuple): ((row, column), score) with score from the mover's point
+                of view, or None.
+        """
+        dimensions = getattr(board, 'dimensions', None)
+        if dimensions is not None and dimensions() != (3, 3, 3):
+            return None
+        packed = board.packed()
+        if packed >= RECORD_COUNT:
+            return None
+        square, score = RECORD.unpack_from(
+            self._map, HEADER.size + packed * RECORD.size)
+        if square == NO_MOVE:
+            return None
+        return divmod(square, 3), score
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Solve every tic tac toe position and write the tablebase.')
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH,
+                        help=f'output file (default {DEFAULT_PATH})')
+    args = parser.parse_args()
+    count = write_tablebase(args.path)
+    print(f"Wrote {count} positions to {args.path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Engine tournament: a round robin in which every pair of engines plays the
+same number of games with each engine as X (the first-moving player) and as
+O, with the matches spread over worker processes. Writes the results, per
+engine and per pairing, as JSON:
+
+    $ python -m tic_tac_toe.tournament --games 20 --workers 4 \\
+          --output results.json
+
+Each engine's entry has its wins, draws, losses and points (1 a win, half a
+draw), and the latency of its moves in milliseconds, so engines can be
+compared on strength against speed.
+"""
+
+import argparse
+import array
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+try:
+    from tic_tac_toe.engines import ENGINES
+    from tic_tac_toe.selfplay import play_chunk, check_dimensions, \
+        check_tablebase, percentile, DEFAULT_CHUNK_SIZE
+    from tic_tac_toe.tablebase import DEFAULT_PATH, write_tablebase
+except:
+    from engines import ENGINES
+    from selfplay import play_chunk, check_dimensions, check_tablebase, \
+        percentile, DEFAULT_CHUNK_SIZE
+    from tablebase import DEFAULT_PATH, write_tablebase
+
+def pairings(engines):
+    """Return every (X engine, O engine) pairing of two different engines,
+    each pair of engines once each way round."""
+    return list(itertools.permutations(engines, 2))
+
+class _Standings:
+    """Results so far for one engine."""
+
+    def __init__(self):
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.latencies = array.array('d')
+
+    def report(self):
+        """Return the engine's results as a dict."""
+        games = self.wins + self.draws + self.losses
+        ordered = sorted(self.latencies)
+        total = sum(ordered)
+        return {
+            'games': games,
+            'wins': self.wins,
+            'draws': self.draws,
+            'losses': self.losses,
+            'points': self.wins + self.draws / 2,
+            'moves': len(ordered),
+            'moves_per_sec': len(ordered) / total * 1000 if total > 0 else 0.0,
+            'latency_ms': {
+                'mean': total / len(ordered) if ordered else 0.0,
+                'p50': percentile(ordered, 0.5),
+                'p90': percentile(ordered, 0.9),
+                'p99': percentile(ordered, 0.99),
+                'max': percentile(ordered, 1.0),
+            },
+        }
+
+def run_tournament(engines=ENGINES, games=10, workers=1, seed=0,
+                   dimensions=None, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Play a round robin and return its results.
+
+    Args:
+        engines (iterable): engine names from engines.ENGINES, at least two.
+        games (int): games per pairing, so each pair of engines plays
+            2 * games games.
+        workers (int): processes to play in. 1 plays in this process.
+        seed (int): base seed. Every game has its own seed, so results don't
+            depend on how the games are split between workers.
+        dimensions (tuple): (m, n, k), or None for 3 x 3 tic tac toe.
+        chunk_size (int): games per task sent to a worker.
+        **options: time_budget, node_budget or tablebase_path for
+            engines.make_engine().
+
+    Returns:
+        (dict): 'engines' maps each engine to its standings (see
+            _Standings.report()), 'pairings' lists X wins, O wins and draws
+            for each pairing, and the rest describes the run.
+    """
+    engines = list(engines)
+    if len(engines) < 2 or len(set(engines)) != len(engines):
+        raise ValueError('A tournament needs at least two different engines')
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown engines: {', '.join(unknown)}")
+    if games < 1 or workers < 1 or chunk_size < 1:
+        raise ValueError('games, workers and chunk_size must be positive')
+    check_dimensions(engines, dimensions)
+    check_tablebase(engines, options.get('tablebase_path', DEFAULT_PATH))
+    standings = {name: _Standings() for name in engines}
+    matches = {pairing: [0, 0, 0] for pairing in pairings(engines)}
+    tasks = []
+    for number, (x, o) in enumerate(matches):
+        first_seed = seed + 2 * games * number # two seeds per game
+        for first in range(0, games, chunk_size):
+            tasks.append((x, o, options,
+                          [first_seed + 2 * i
+                           for i in range(first, min(first + chunk_size,
+                                                     games))],
+                          dimensions))
+
+    def record_result(record):
+        x, o = record['x'], record['o']
+        matches[(x, o)][record['winner'] - 1] += 1
+        if record['winner'] == 3:
+            standings[x].draws += 1
+            standings[o].draws += 1
+        else:
+            winner, loser = (x, o) if record['winner'] == 1 else (o, x)
+            standings[winner].wins += 1
+            standings[loser].losses += 1
+        standings[x].latencies.extend(record['ms'][0::2]) # X moves first
+        standings[o].latencies.extend(record['ms'][1::2])
+
+    start = time.perf_counter()
+    if workers == 1:
+        for task in tasks:
+            for record in play_chunk(*task):
+                record_result(record)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            pending = set()
+            tasks = iter(tasks)
+            while True:
+                for task in itertools.islice(tasks, 2 * workers - len(pending)):
+                    pending.add(executor.submit(play_chunk, *task))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for record in future.result():
+                        record_result(record)
+    seconds = time.perf_counter() - start
+    total = games * len(matches)
+    return {
+        'games_per_pairing': games,
+        'games': total,
+        'seed': seed,
+        'board': list(dimensions) if dimensions is not None else [3, 3, 3],
+        'options': options,
+        'seconds': seconds,
+        'games_per_sec': total / seconds if seconds > 0 else 0.0,
+        'engines': {name: standings[name].report() for name in engines},
+        'pairings': [{'x': x, 'o': o, 'x_wins': result[0],
+                      'o_wins': result[1], 'draws': result[2]}
+                     for (x, o), result in matches.items()],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Play a round-robin tournament between engines.')
+    parser.add_argument('--engines', nargs='+', choices=ENGINES,
+                        default=list(ENGINES),
+                        help='engines to enter (default: all)')
+    parser.add_argument('--games', type=int, default=10,
+                        help='games per pairing (default 10)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--time', type=float, default=None, metavar='SECONDS',
+                        help='time budget per move')
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='node budget per move (playouts for mcts)')
+    parser.add_argument('--tablebase', default=DEFAULT_PATH,
+                        help='tablebase file, written first if missing')
+    parser.add_argument('--output', default='tournament.json',
+                        help='results file (default tournament.json)')
+    args = parser.parse_args(argv)
+    if 'tablebase' in args.engines and not os.path.exists(args.tablebase):
+        print(f'Writing tablebase to {args.tablebase}')
+        write_tablebase(args.tablebase)
+    try:
+        results = run_tournament(args.engines, args.games, args.workers,
+                                 args.seed, time_budget=args.time,
+                                 node_budget=args.nodes,
+                                 tablebase_path=args.tablebase)
+    except ValueError as error:
+        parser.error(str(error))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"{'engine':<10} {'points':>7} {'W':>5} {'D':>5} {'L':>5} "
+          f"{'mean ms':>9} {'p99 ms':>9}")
+    ranked = sorted(results['engines'].items(),
+                    key=lambda item: -item[1]['points'])
+    for name, standing in ranked:
+        latency = standing['latency_ms']
+        print(f"{name:<10} {standing['points']:>7} {standing['wins']:>5} "
+              f"{standing['draws']:>5} {standing['losses']:>5} "
+              f"{latency['mean']:>9.3f} {latency['p99']:>9.3f}")
+    print(f"{results['games']} games in {results['seconds']:.2f} s; "
+          f"results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+TranspositionTable class, a size-capped cache of search results keyed by
+packed boardstates, so that GameTree never searches the same position twice.
+"""
+
+from collections import OrderedDict
+
+# Flags describing what a stored score means. Alpha-beta search often only
+#   learns that a position's true score is at least (LOWER) or at most (UPPER)
+#   some value.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+class TranspositionTable:
+    """Map from packed board keys (see TicTacToeBoard.packed()) to
+    (value, flag) tuples, where value is the position's score from the point
+    of view of the player to move there.
+
+    Keeps hit, miss and eviction counters that stats() reports.
+    """
+
+    def __init__(self, max_size=None, policy='lru'):
+        """
+        Args:
+            max_size (int): Maximum number of entries to hold, or None for no
+                cap.
+            policy (str): Which entry to evict when the table is full. 'lru'
+                evicts the least recently stored or looked-up entry, 'fifo'
+                the least recently stored one.
+        """
+        if policy not in ('lru', 'fifo'):
+            raise ValueError(f"Unknown eviction policy '{policy}'")
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._entries = OrderedDict() # oldest entry first
+        self._max_size = max_size
+        self._policy = policy
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """Return the number of entries in the table."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Return True if key has an entry. Doesn't count as a hit or miss."""
+        return key in self._entries
+
+    def get(self, key):
+        """Return the (value, flag) tuple stored for key, or None if there
+        isn't one."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        if self._policy == 'lru':
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, value, flag=EXACT):
+        """Store value for key, replacing any existing entry, and evict one
+        entry if that puts the table over its cap.
+
+        Args:
+            key (int): packed boardstate.
+            value (int): score from the point of view of the player to move.
+            flag (int): EXACT, LOWER or UPPER.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, flag)
+        if self._max_size is not None and len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Remove every entry. Counters are left as they are."""
+        self._entries.clear()
+
+    def stats(self):
+        """Return a dict of the table's counters and current size."""
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'size': len(self._entries),
+            'max_size': self._max_size,
+        }
@@ -0,0 +1,54 @@
+"""
+Winner detection for many tic tac toe boards at once with NumPy, for bulk
+analysis and self-play where calling TicTacToeBoard.winner() board by board
+is the bottleneck.
+
+NumPy is optional: the rest of the package doesn't need it, and winners()
+raises ImportError if it isn't installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from tic_tac_toe.bitboard import FULL_MASK, WIN_MASKS
+except:
+    from bitboard import FULL_MASK, WIN_MASKS
+
+IN_PROGRESS = 0 # winners() result for a game still in progress
+
+def winners(boards):
+    """
+    Return the result of every board as an array of ints: 1 or 2 for a win
+    by X or O, 3 for a draw, IN_PROGRESS (0) for a game still in progress.
+    Agrees with TicTacToeBoard.winner(), with IN_PROGRESS in place of None,
+    including its checking X's lines before O's.
+
+    Args:
+        boards (array_like): either an (N, 9) or (N, 3, 3) array of 0 / 1 /
+            2 marks in row-major order, or a length N array of packed
+            boardstates as from TicTacToeBoard.packed().
+
+    Returns:
+        (numpy.ndarray): length N array of int8 results.
+    """
+    if np is None:
+        raise ImportError('winners() requires numpy')
+    boards = np.asarray(boards)
+    if boards.ndim == 1: # packed ints
+        packed = boards.astype(np.int64)
+        x = packed & FULL_MASK
+        o = (packed >> 9) & FULL_MASK
+    else:
+        grid = boards.reshape(len(boards), 9)
+        bits = np.int64(1) << np.arange(9, dtype=np.int64)
+        x = (grid == 1).astype(np.int64) @ bits
+        o = (grid == 2).astype(np.int64) @ bits
+    masks = np.array(WIN_MASKS, dtype=np.int64)
+    x_wins = ((x[:, None] & masks) == masks).any(axis=1)
+    o_wins = ((o[:, None] & masks) == masks).any(axis=1)
+    full = (x | o) == FULL_MASK
+    return np.select([x_wins, o_wins, full], [1, 2, 3],
+                     IN_PROGRESS).astype(np.int8)
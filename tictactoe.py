@@ -2,10 +2,45 @@
 
 """Starts a command line game."""
 
+import argparse
+
 from tic_tac_toe import game
+from tic_tac_toe.commandline import ENGINES
+
+def parse_args(argv=None):
+    """Parse the command line options.
+
+    Args:
+        argv (list): arguments to parse, defaulting to sys.argv[1:].
+
+    Returns:
+        (argparse.Namespace): parsed options.
+    """
+    parser = argparse.ArgumentParser(description='Play tic tac toe.')
+    parser.add_argument('--time', type=float, default=None, metavar='SECONDS',
+                        help='time the computer may spend on each move '
+                             '(default: search to the end of the game)')
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='most boardstates the computer may examine for '
+                             'each move, or playouts for mcts (default: no '
+                             'limit)')
+    parser.add_argument('--engine', choices=ENGINES, default='minimax',
+                        help='computer player (default: minimax)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed for the mcts engine')
+    parser.add_argument('--stats', action='store_true',
+                        help='print search stats after each computer move')
+    args = parser.parse_args(argv)
+    if args.time is not None and args.time <= 0:
+        parser.error('--time must be positive')
+    if args.nodes is not None and args.nodes < 1:
+        parser.error('--nodes must be positive')
+    return args
 
 def main():
-    game.Game().main()
+    args = parse_args()
+    game.Game(time_budget=args.time, node_budget=args.nodes,
+              engine=args.engine, seed=args.seed, stats=args.stats).main()
 
 if __name__ == '__main__':
     main()